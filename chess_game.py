@@ -91,6 +91,7 @@ class ChessGame:
         # Initialize Pygame (even in headless mode, for internal timing)
         pygame.init()
         self.clock = pygame.time.Clock()
+        self.quit_requested = False # Set when the window is closed while an AI search is running
         # Enable logging
         self.logging_enabled = self.game_config_data.get('monitoring', {}).get('enable_logging', True) # Adjusted path
         self.show_thoughts = self.game_config_data.get('monitoring', {}).get('show_thinking', True) # Adjusted path
@@ -199,6 +200,10 @@ class ChessGame:
 
     def _initialize_ai_engines(self):
         """Initializes or re-initializes AI engines based on config."""
+        # Replaced Viper engines must release their Lazy SMP helper processes and shared transposition table
+        for engine in (getattr(self, 'white_engine', None), getattr(self, 'black_engine', None)):
+            if isinstance(engine, ViperEvaluationEngine):
+                engine.close()
         # Stockfish specific settings from stockfish_handler.yaml
         stockfish_path = self.stockfish_config_data.get('stockfish_config', {}).get('path')
         stockfish_elo = self.stockfish_config_data.get('stockfish_config', {}).get('elo_rating')
@@ -473,6 +478,16 @@ class ChessGame:
             "white_actual_config": self.white_ai_config, # The specific config used by white AI for this game
             "black_actual_config": self.black_ai_config  # The specific config used by black AI for this game
         }
+        # Evaluation term profiles of Viper engines running with performance.profile_eval_terms
+        eval_term_profiles = {}
+        for color_name, engine in (('white', self.white_engine), ('black', self.black_engine)):
+            profiler = getattr(getattr(engine, 'scoring_calculator', None), 'profiler', None)
+            if profiler is not None and profiler.stats:
+                eval_term_profiles[color_name] = profiler.rows()
+                if self.logging_enabled and self.logger:
+                    self.logger.info(f"Evaluation term profile for {color_name}:\n{profiler.format_table()}")
+        if eval_term_profiles:
+            game_specific_config["eval_term_profile"] = eval_term_profiles
         with open(config_filepath, "w") as f:
             yaml.dump(game_specific_config, f)
         if self.logging_enabled and self.logger:
@@ -520,6 +535,8 @@ class ChessGame:
                 white_ai_config=self.white_ai_config,
                 black_ai_config=self.black_ai_config
             )
+            for color_name, rows in eval_term_profiles.items():
+                self.metrics_store.add_eval_term_profile(game_id=game_id, player_color=color_name, rows=rows)
             if self.logging_enabled and self.logger:
                 self.logger.info(f"Game result for {game_id} stored in MetricsStore.")
 
@@ -595,7 +612,10 @@ class ChessGame:
             nodes_before_search = current_ai_engine.nodes_searched
 
         try:
-            ai_move = current_ai_engine.search(self.board, current_player_color, ai_config=current_ai_config)
+            if isinstance(current_ai_engine, ViperEvaluationEngine):
+                ai_move = self.wait_for_search(current_ai_engine.search_async(self.board, current_player_color, ai_config=current_ai_config))
+            else:
+                ai_move = current_ai_engine.search(self.board, current_player_color, ai_config=current_ai_config)
             
             move_end_time = time.perf_counter()
             self.move_duration = move_end_time - move_start_time
@@ -606,6 +626,11 @@ class ChessGame:
             if isinstance(current_ai_engine, ViperEvaluationEngine): # Changed from EvaluationEngine
                 nodes_after_search = current_ai_engine.nodes_searched
                 nodes_this_move = nodes_after_search - nodes_before_search
+                viper_info = current_ai_engine.get_last_search_info()
+                pv_line_info = viper_info.get('pv', '')
+                self.current_eval = viper_info.get('score', 0.0)
+                if current_player_color == chess.BLACK:
+                    self.current_eval = -self.current_eval
             elif isinstance(current_ai_engine, StockfishHandler):
                 stockfish_info = current_ai_engine.get_last_search_info()
                 nodes_this_move = stockfish_info.get('nodes', 0)
@@ -740,6 +765,16 @@ class ChessGame:
         if self.logging_enabled and self.logger:
             self.logger.info(f"AI ({current_player_color}) played: {ai_move} (Eval: {self.current_eval:.2f}) | Time: {self.move_duration:.4f}s | Nodes: {nodes_this_move}")
 
+    def wait_for_search(self, search_future):
+        """Keep handling window events while an asynchronous search runs, closing the window stops the search."""
+        while not search_future.done():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.quit_requested = True
+                    search_future.stop()
+            self.clock.tick(MAX_FPS)
+        return search_future.result()
+
     def push_move(self, move):
         """ Test and push a move to the board and game node """
         if not self.board.is_valid():
@@ -819,6 +854,9 @@ class ChessGame:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+            if self.quit_requested: # Window closed during a search
+                running = False
+                break
             
             if not self.board.is_game_over(claim_draw=self._is_draw_condition(self.board)) and self.board.is_valid():
                 self.process_ai_move()
@@ -843,9 +881,13 @@ class ChessGame:
         if hasattr(self, 'white_engine') and self.white_engine:
             if isinstance(self.white_engine, StockfishHandler):
                 self.white_engine.quit()
+            elif isinstance(self.white_engine, ViperEvaluationEngine):
+                self.white_engine.close()
         if hasattr(self, 'black_engine') and self.black_engine:
             if isinstance(self.black_engine, StockfishHandler):
                 self.black_engine.quit()
+            elif isinstance(self.black_engine, ViperEvaluationEngine):
+                self.black_engine.close()
 
 if __name__ == "__main__":
     game = ChessGame()
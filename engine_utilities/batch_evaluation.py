@@ -0,0 +1,246 @@
+# engine_utilities/batch_evaluation.py
+
+""" Batch Evaluation for the Viper Chess Engine
+Evaluates many positions at once with NumPy, for training, tuning and dataset labeling.
+The boards are unpacked into a (boards, color, piece type, rank, file) array of piece planes and the terms that
+only depend on piece placement (material, PST, center control, king shield, pawn structure, piece pairs,
+development, open files, and the attack-count terms mobility, activity and coordination) are computed as
+array operations. Slider attacks are found by propagating rays through the empty squares, so the counts match
+board.attacks_mask() exactly. Terms that need move generation or game state (checkmate threats, checks,
+draws, captures, castling, tempo, ...) fall back to the scalar term methods, one board at a time.
+Scores match ViperScoringCalculation.calculate_score() up to floating point summation order.
+"""
+
+import chess
+import numpy as np
+from typing import Sequence, Union
+from engine_utilities.incremental_evaluation import IncrementalEvaluator
+from engine_utilities.bitboard_evaluation import BB_FRONT_SPAN, BB_KING_SHIELD
+
+KNIGHT_OFFSETS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+KING_OFFSETS = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+BISHOP_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+# Terms computed here as array operations, the other active terms run through the scalar path
+VECTORIZED_TERMS = frozenset((
+    '_king_safety', '_piece_coordination', '_center_control', '_pawn_score', '_bishop_pair', '_knight_pair',
+    '_piece_activity', '_improved_minor_piece_activity', '_mobility_score', '_undeveloped_pieces', '_open_files'
+))
+
+def _mask_matrix(masks) -> np.ndarray:
+    """(64, 64) 0/1 matrix with row s holding the squares of masks[s]."""
+    matrix = np.zeros((64, 64), dtype=np.int32)
+    for square, mask in enumerate(masks):
+        for target in chess.scan_forward(mask):
+            matrix[square, target] = 1
+    return matrix
+
+# Indexed [color], (64, 64) each
+FRONT_SPAN_MATRIX = [_mask_matrix(BB_FRONT_SPAN[color]) for color in (chess.BLACK, chess.WHITE)]
+KING_SHIELD_MATRIX = [_mask_matrix(BB_KING_SHIELD[color]) for color in (chess.BLACK, chess.WHITE)]
+
+def board_planes(boards: Sequence[chess.Board]) -> np.ndarray:
+    """Piece planes of shape (len(boards), 2, 7, 8, 8) indexed [board, color, piece_type, rank, file], uint8."""
+    bitboards = np.array([[[board.pieces_mask(piece_type, color) if piece_type else 0 for piece_type in range(7)]
+                           for color in (chess.BLACK, chess.WHITE)] for board in boards], dtype='<u8')
+    bits = np.unpackbits(bitboards.view(np.uint8), axis=-1, bitorder='little')
+    return bits.reshape(len(boards), 2, 7, 8, 8)
+
+def shift(planes: np.ndarray, rank_offset: int, file_offset: int) -> np.ndarray:
+    """Move every square of (..., 8, 8) planes by the given offsets, dropping squares that leave the board."""
+    shifted = np.zeros_like(planes)
+    src_ranks = slice(max(0, -rank_offset), 8 - max(0, rank_offset))
+    dst_ranks = slice(max(0, rank_offset), 8 - max(0, -rank_offset))
+    src_files = slice(max(0, -file_offset), 8 - max(0, file_offset))
+    dst_files = slice(max(0, file_offset), 8 - max(0, -file_offset))
+    shifted[..., dst_ranks, dst_files] = planes[..., src_ranks, src_files]
+    return shifted
+
+def step_attacks(pieces: np.ndarray, offsets) -> np.ndarray:
+    """Per-square count of pieces attacking it for a leaper with the given offsets."""
+    attacks = np.zeros_like(pieces)
+    for rank_offset, file_offset in offsets:
+        attacks += shift(pieces, rank_offset, file_offset)
+    return attacks
+
+def slider_attacks(pieces: np.ndarray, empty: np.ndarray, directions) -> np.ndarray:
+    """Per-square count of sliders attacking it: rays run through empty squares and include the first blocker."""
+    attacks = np.zeros_like(pieces)
+    for rank_offset, file_offset in directions:
+        ray = pieces
+        for _ in range(7):
+            ray = shift(ray, rank_offset, file_offset)
+            if not ray.any():
+                break
+            attacks += ray
+            ray = ray * empty
+    return attacks
+
+class BatchEvaluation:
+    """
+    NumPy evaluation of a batch of boards for one color, with the same weights as the owning
+    ViperScoringCalculation (scoring.rules) and its scalar term methods for the remaining terms.
+    """
+
+    def __init__(self, scoring):
+        self.scoring = scoring
+        incremental = IncrementalEvaluator(scoring.pst)
+        # Signed (White-relative) PST values, flattened like board_planes() rows: [color, piece_type, square], centipawns
+        self.pst_mg = np.array(incremental.mg_values, dtype=np.float64).reshape(2 * 7 * 64)
+        self.pst_eg = np.array(incremental.eg_values, dtype=np.float64).reshape(2 * 7 * 64)
+
+    def attack_planes(self, planes: np.ndarray, color: chess.Color, empty: np.ndarray) -> np.ndarray:
+        """Attack counts per piece type for color, shape (boards, 7, 8, 8)."""
+        own = planes[:, int(color)].astype(np.int16)
+        attacks = np.zeros_like(own)
+        attacks[:, chess.PAWN] = step_attacks(own[:, chess.PAWN], ((1, -1), (1, 1)) if color == chess.WHITE else ((-1, -1), (-1, 1)))
+        attacks[:, chess.KNIGHT] = step_attacks(own[:, chess.KNIGHT], KNIGHT_OFFSETS)
+        attacks[:, chess.BISHOP] = slider_attacks(own[:, chess.BISHOP], empty, BISHOP_DIRECTIONS)
+        attacks[:, chess.ROOK] = slider_attacks(own[:, chess.ROOK], empty, ROOK_DIRECTIONS)
+        attacks[:, chess.QUEEN] = slider_attacks(own[:, chess.QUEEN], empty, BISHOP_DIRECTIONS + ROOK_DIRECTIONS)
+        attacks[:, chess.KING] = step_attacks(own[:, chess.KING], KING_OFFSETS)
+        return attacks
+
+    def scores(self, boards: Sequence[chess.Board], color: chess.Color,
+               endgame_factors: Union[float, Sequence[float]] = 0.0) -> np.ndarray:
+        """Score vector for color over boards, the batch counterpart of calculate_score()."""
+        rules = self.scoring.rules
+        active = set(rules.active_terms)
+        count = len(boards)
+        if count == 0:
+            return np.zeros(0)
+
+        planes = board_planes(boards)
+        c = int(color)
+        o = 1 - c
+        own = planes[:, c].astype(np.int16) # Small ints keep the plane arithmetic cheap, counts stay far below the limit
+        opponent = planes[:, o].astype(np.int16)
+        own_occupied = own.sum(axis=1)
+        opponent_occupied = opponent.sum(axis=1)
+        empty = 1 - own_occupied - opponent_occupied
+        own_pawns = own[:, chess.PAWN]
+        opponent_pawns = opponent[:, chess.PAWN]
+
+        # Material and PST
+        piece_counts = own.sum(axis=(2, 3))
+        scores = piece_counts[:, chess.PAWN:chess.KING] @ np.array(self.scoring.piece_value_table[chess.PAWN:chess.KING]) * rules.material_weight
+        if rules.pst_enabled:
+            endgame_factors = np.broadcast_to(np.asarray(endgame_factors, dtype=np.float64), (count,))
+            flat_planes = planes.reshape(count, 2 * 7 * 64).astype(np.float64)
+            mg = flat_planes @ self.pst_mg
+            eg = flat_planes @ self.pst_eg
+            pst_score = (mg * (1 - endgame_factors) + eg * endgame_factors) / 100.0
+            scores = scores + rules.pst_weight * (pst_score if color == chess.WHITE else -pst_score)
+
+        if '_center_control' in active:
+            scores = scores + own_occupied[:, 3:5, 3:5].sum(axis=(1, 2)) * rules.center_control_bonus
+
+        if '_king_safety' in active:
+            king_flat = own[:, chess.KING].reshape(count, 64)
+            shield = king_flat @ KING_SHIELD_MATRIX[c] # Rows are all zero for boards without a king
+            scores = scores + (shield * own_pawns.reshape(count, 64)).sum(axis=1) * rules.king_safety_bonus
+
+        own_pawn_files = own_pawns.sum(axis=1)
+        opponent_pawn_files = opponent_pawns.sum(axis=1)
+        if '_pawn_score' in active:
+            doubled = np.maximum(own_pawn_files - 1, 0).sum(axis=1)
+            has_pawn = own_pawn_files > 0
+            adjacent = np.zeros_like(has_pawn)
+            adjacent[:, 1:] |= has_pawn[:, :-1]
+            adjacent[:, :-1] |= has_pawn[:, 1:]
+            isolated = (own_pawn_files * ~adjacent).sum(axis=1)
+            blocked = (opponent_pawns.reshape(count, 64) @ FRONT_SPAN_MATRIX[c].T) > 0
+            passed = (own_pawns.reshape(count, 64) * ~blocked).sum(axis=1)
+            majorities = ((own_pawn_files[:, 4:].sum(axis=1) > opponent_pawn_files[:, 4:].sum(axis=1)).astype(np.int32) +
+                          (own_pawn_files[:, :4].sum(axis=1) > opponent_pawn_files[:, :4].sum(axis=1)))
+            scores = scores + (doubled * rules.doubled_pawn_penalty + isolated * rules.isolated_pawn_penalty +
+                               passed * rules.passed_pawn_bonus + majorities * (rules.pawn_majority_bonus / 2))
+
+        if '_bishop_pair' in active:
+            scores = scores + (piece_counts[:, chess.BISHOP] >= 2) * rules.bishop_pair_bonus
+        if '_knight_pair' in active:
+            scores = scores + (piece_counts[:, chess.KNIGHT] >= 2) * rules.knight_pair_bonus
+
+        if '_undeveloped_pieces' in active:
+            home_rank = 0 if color == chess.WHITE else 7
+            undeveloped = (own[:, chess.KNIGHT, home_rank, [1, 6]].sum(axis=1) + own[:, chess.BISHOP, home_rank, [2, 5]].sum(axis=1))
+            has_rights = np.array([board.has_castling_rights(color) for board in boards])
+            scores = scores + undeveloped * has_rights * rules.undeveloped_penalty
+
+        if '_open_files' in active:
+            no_own_pawn = own_pawn_files == 0
+            open_files = no_own_pawn & (opponent_pawn_files == 0)
+            semi_open_files = no_own_pawn & (opponent_pawn_files > 0)
+            rook_files = own[:, chess.ROOK].sum(axis=1) > 0
+            king_files = own[:, chess.KING].sum(axis=1) > 0
+            scores = scores + (open_files.sum(axis=1) * rules.open_file_bonus + semi_open_files.sum(axis=1) * (rules.open_file_bonus / 2) +
+                               (no_own_pawn & rook_files).sum(axis=1) * rules.file_control_bonus +
+                               (no_own_pawn & king_files).sum(axis=1) * rules.exposed_king_penalty)
+
+        if active & {'_mobility_score', '_piece_activity', '_improved_minor_piece_activity', '_piece_coordination'}:
+            attacks = self.attack_planes(planes, color, empty)
+            attack_counts = attacks.sum(axis=(2, 3))
+            if '_mobility_score' in active:
+                scores = scores + attack_counts[:, chess.PAWN:chess.KING].sum(axis=1) * rules.piece_mobility_bonus
+            if '_piece_activity' in active:
+                scores = scores + (attack_counts[:, chess.KNIGHT] * rules.knight_activity_bonus +
+                                   attack_counts[:, chess.BISHOP] * rules.bishop_activity_bonus)
+            if '_improved_minor_piece_activity' in active:
+                enemy_pawn_attacks = step_attacks(opponent_pawns, ((1, -1), (1, 1)) if color == chess.BLACK else ((-1, -1), (-1, 1)))
+                safe = enemy_pawn_attacks == 0
+                scores = scores + ((attacks[:, chess.KNIGHT] * safe).sum(axis=(1, 2)) * rules.knight_activity_bonus +
+                                   (attacks[:, chess.BISHOP] * safe).sum(axis=(1, 2)) * rules.bishop_activity_bonus)
+            if '_piece_coordination' in active:
+                defended = attacks.sum(axis=1) > 0
+                scores = scores + (own_occupied * defended).sum(axis=(1, 2)) * rules.piece_coordination_bonus
+
+        # Terms that need move generation or game state, through the scalar path
+        scalar_terms = [term for term in self.scoring.active_terms if term.__name__ not in VECTORIZED_TERMS]
+        if scalar_terms:
+            scores = scores + np.array([sum(term(board, color) for term in scalar_terms) for board in boards])
+        return np.asarray(scores, dtype=np.float64)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import random
+    import time
+    import yaml
+    from engine_utilities.piece_square_tables import PieceSquareTables
+    from engine_utilities.piece_values import DEFAULT_PIECE_VALUES
+    from engine_utilities.viper_scoring_calculation import ViperScoringCalculation
+
+    with open("viper.yaml") as f:
+        viper_yaml = yaml.safe_load(f)
+    # Placement terms only, so the comparison exercises the vectorized path
+    rules = {key: value for key, value in viper_yaml['default_evaluation'].items()
+             if key not in ('checkmate_bonus', 'check_bonus', 'in_check_penalty', 'draw_penalty', 'stalemate_penalty', 'capture_bonus',
+                            'hanging_piece_bonus', 'undefended_piece_penalty', 'tempo_bonus', 'en_passant_bonus', 'pawn_promotion_bonus',
+                            'castling_bonus', 'castling_protection_bonus', 'castling_protection_penalty', 'bishop_vision_bonus',
+                            'stacked_rooks_bonus', 'coordinated_rooks_bonus', 'rook_position_bonus')}
+    rules.update(draw_penalty=0.0, bishop_pair_bonus=1.0, pawn_majority_bonus=1.0)
+    scoring = ViperScoringCalculation(viper_yaml_config={'rulesets': {'batch_test': rules}}, ai_config={'ruleset': 'batch_test'},
+                                      piece_values=DEFAULT_PIECE_VALUES, pst=PieceSquareTables())
+    print("Active terms:", scoring.rules.active_terms)
+
+    boards = []
+    for _ in range(300):
+        board = chess.Board()
+        for _ in range(random.randint(0, 120)):
+            legal = list(board.legal_moves)
+            if not legal:
+                break
+            board.push(random.choice(legal))
+        boards.append(board)
+    factors = [random.choice((0.0, 0.5, 1.0)) for _ in boards]
+
+    for color in chess.COLORS:
+        start = time.perf_counter()
+        scalar = np.array([scoring.calculate_score(board, color, factor) for board, factor in zip(boards, factors)])
+        scalar_time = time.perf_counter() - start
+        start = time.perf_counter()
+        batch = scoring.calculate_scores_batch(boards, color, factors)
+        batch_time = time.perf_counter() - start
+        print(f"{'White' if color else 'Black'}: max abs difference {np.abs(scalar - batch).max():.2e}, "
+              f"scalar {scalar_time * 1000:.1f} ms, batch {batch_time * 1000:.1f} ms")
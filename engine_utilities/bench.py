@@ -0,0 +1,133 @@
+# engine_utilities/bench.py
+
+""" Deterministic Search Benchmark for the Viper Chess Engine
+Runs a fixed-depth search on each of a fixed set of 50 positions (openings, middlegames, endgames and
+move generation edge cases) and prints the total node count, time and NPS. With the opening book off,
+a single thread, no time limit, a fresh engine state per position and a seeded random module, the total
+node count is a signature of search behavior: a change that only affects speed keeps it, a change to
+the search or the evaluation almost always moves it. The NPS figure is the performance side of the gate.
+Usage, from the repository root (viper is imported from there): python -m engine_utilities.bench [depth] [viper_yaml_path] [expected_nodes]
+"""
+
+import random
+import sys
+import time
+import chess
+from typing import Any, Dict, List, Optional
+
+BENCH_DEPTH = 3
+BENCH_SEED = 0
+
+BENCH_FENS: List[str] = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 10",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 11",
+    "4rrk1/pp1n3p/3q2pQ/2p1pb2/2PP4/2P3N1/P2B2PP/4RRK1 b - - 7 19",
+    "rq3rk1/ppp2ppp/1bnpb3/3N2B1/3NP3/7P/PPPQ1PP1/2KR3R w - - 7 14",
+    "r1bq1r1k/1pp1n1pp/1p1p4/4p2Q/4Pp2/1BNP4/PPP2PPP/3R1RK1 w - - 2 14",
+    "r3r1k1/2p2ppp/p1p1bn2/8/1q2P3/2NPQN2/PPP3PP/R4RK1 b - - 2 15",
+    "r1bbk1nr/pp3p1p/2n5/1N4p1/2Np1B2/8/PPP2PPP/2KR1B1R w kq - 0 13",
+    "r1bq1rk1/ppp1nppp/4n3/3p3Q/3P4/1BP1B3/PP1N2PP/R4RK1 w - - 1 16",
+    "4r1k1/r1q2ppp/ppp2n2/4P3/5Rb1/1N1BQ3/PPP3PP/R5K1 w - - 1 17",
+    "2rqkb1r/ppp2p2/2npb1p1/1N1Nn2p/2P1PP2/8/PP2B1PP/R1BQK2R b KQ - 0 11",
+    "r1bq1r1k/b1p1npp1/p2p3p/1p6/3PP3/1B2NN2/PP3PPP/R2Q1RK1 w - - 1 16",
+    "3r1rk1/p5pp/bpp1pp2/8/q1PP1P2/b3P3/P2NQRPP/1R2B1K1 b - - 6 22",
+    "r1q2rk1/2p1bppp/2Pp4/p6b/Q1PNp3/4B3/PP1R1PPP/2K4R w - - 2 18",
+    "4k2r/1pb2ppp/1p2p3/1R1p4/3P4/2r1PN2/P4PPP/1R4K1 b - - 3 22",
+    "3q2k1/pb3p1p/4pbp1/2r5/PpN2N2/1P2P2P/5PP1/Q2R2K1 b - - 4 26",
+    "6k1/6p1/6Pp/ppp5/3pn2P/1P3K2/1PP2P2/3N4 b - - 0 1",
+    "3b4/5kp1/1p1p1p1p/pP1PpP1P/P1P1P3/3KN3/8/8 w - - 0 1",
+    "2K5/p7/7P/5pR1/8/5k2/r7/8 w - - 0 1",
+    "8/6pk/1p6/8/PP3p1p/5P2/4KP1q/3Q4 w - - 0 1",
+    "7k/3p2pp/4q3/8/4Q3/5Kp1/P6b/8 w - - 0 1",
+    "8/2p5/8/2kPKp1p/2p4P/2P5/3P4/8 w - - 0 1",
+    "8/1p3pp1/7p/5P1P/2k3P1/8/2K2P2/8 w - - 0 1",
+    "8/pp2r1k1/2p1p3/3pP2p/1P1P1P1P/P5KR/8/8 w - - 0 1",
+    "8/3p4/p1bk3p/Pp6/1Kp1PpPp/2P2P1P/2P5/5B2 b - - 0 1",
+    "5k2/7R/4P2p/5K2/p1r2P1p/8/8/8 b - - 0 1",
+    "6k1/6p1/P6p/r1N5/5p2/7P/1b3PP1/4R1K1 w - - 0 1",
+    "1r3k2/4q3/2Pp3b/3Bp3/2Q2p2/1p1P2P1/1P2KP2/3N4 w - - 0 1",
+    "6k1/4pp1p/3p2p1/P1pPb3/R7/1r2P1PP/3B1P2/6K1 w - - 0 1",
+    "8/3p3B/5p2/5P2/p7/PP5b/k7/6K1 w - - 0 1",
+    "5rk1/q6p/2p3bR/1pPp1rP1/1P1Pp3/P3B1Q1/1K3P2/R7 w - - 93 90",
+    "4rrk1/1p1nq3/p7/2p1P1pp/3P2bp/3Q1Bn1/PPPB4/1K2R1NR w - - 40 21",
+    "r3k2r/3nnpbp/q2pp1p1/p7/Pp1PPPP1/4BNN1/1P5P/R2Q1RK1 w kq - 0 16",
+    "3Qb1k1/1r2ppb1/pN1n2q1/Pp1Pp1Pr/4P2p/4BP2/4B1R1/1R5K b - - 11 40",
+    "4k3/3q1r2/1N2r1b1/3ppN2/2nPP3/1B1R2n1/2R1Q3/3K4 w - - 5 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+    "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4",
+    "rnbqkb1r/pp3ppp/4pn2/2pp4/2PP4/2N2N2/PP2PPPP/R1BQKB1R w KQkq - 0 5",
+    "r1bqk2r/pp2bppp/2nppn2/8/3NP3/2N1B3/PPP1BPPP/R2QK2R w KQkq - 2 8",
+    "rnbqk2r/ppp1ppbp/3p1np1/8/2PPP3/2N2N2/PP3PPP/R1BQKB1R b KQkq - 1 5",
+    "r3k2r/1b4bq/8/8/8/8/7B/R3K2R w KQkq - 0 1",
+    "r3k2r/8/3Q4/8/8/5q2/8/R3K2R b KQkq - 0 1",
+    "2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1",
+    "8/8/1P2K3/8/2n5/1q6/8/5k2 b - - 0 1",
+    "8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1",
+    "8/8/2k5/5q2/5n2/8/5K2/8 b - - 0 1",
+    "8/k1P5/8/1K6/8/8/8/8 w - - 0 1",
+    "8/8/8/4k3/8/8/3QK3/8 w - - 0 1",
+]
+
+def bench_config(depth: int = BENCH_DEPTH, ai_type: Optional[str] = None) -> Dict[str, Any]:
+    """Runtime ai_config of a bench search: fixed depth, no time limit and no opening book. ai_type None keeps the config's search_algorithm."""
+    config = {
+        'depth': depth,
+        'max_depth': depth,
+        'move_time_limit': float('inf'),
+        'use_opening_book': False,
+    }
+    if ai_type is not None:
+        config['ai_type'] = ai_type
+    return config
+
+def run_bench(depth: int = BENCH_DEPTH, viper_yaml_path: str = "viper.yaml", ai_type: Optional[str] = None,
+              fens: Optional[List[str]] = None, verbose: bool = False) -> Dict[str, Any]:
+    """
+    Search every bench position to depth and return {'nodes', 'time', 'nps', 'positions'}, positions holding
+    (fen, best move uci, nodes) per position. nodes is the deterministic signature.
+    """
+    from viper import ViperEvaluationEngine
+
+    engine = ViperEvaluationEngine(chess.Board(), chess.WHITE, viper_yaml_path=viper_yaml_path)
+    engine.close()
+    engine.parallel_evaluation = False # Lazy SMP helpers make node counts depend on scheduling
+    config = bench_config(depth, ai_type)
+    positions = []
+    total_nodes = 0
+    total_time = 0.0
+    for index, fen in enumerate(fens or BENCH_FENS, start=1):
+        board = chess.Board(fen)
+        engine.reset(board) # Fresh tables, so each position's count is independent of the ones before it
+        random.seed(BENCH_SEED)
+        start = time.perf_counter()
+        move = engine.search(board, board.turn, config)
+        elapsed = time.perf_counter() - start
+        nodes = engine.get_last_search_info()['nodes']
+        total_nodes += nodes
+        total_time += elapsed
+        positions.append((fen, move.uci() if move else '0000', nodes))
+        if verbose:
+            print(f"Position {index}/{len(fens or BENCH_FENS)}: {move} nodes {nodes} ({elapsed:.2f}s)", flush=True)
+    engine.close()
+    return {'nodes': total_nodes, 'time': total_time, 'nps': total_nodes / max(total_time, 1e-9), 'positions': positions}
+
+def format_bench(result: Dict[str, Any]) -> str:
+    return (f"Total time (s) : {result['time']:.2f}\n"
+            f"Nodes searched : {result['nodes']}\n"
+            f"Nodes/second   : {int(result['nps'])}")
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else BENCH_DEPTH
+    viper_yaml_path = sys.argv[2] if len(sys.argv) > 2 else "viper.yaml"
+    expected_nodes = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    result = run_bench(depth, viper_yaml_path, verbose=True)
+    print()
+    print(format_bench(result))
+    if expected_nodes is not None and result['nodes'] != expected_nodes:
+        print(f"Signature mismatch: expected {expected_nodes} nodes, searched {result['nodes']}")
+        sys.exit(1)
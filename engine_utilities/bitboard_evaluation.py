@@ -0,0 +1,258 @@
+# engine_utilities/bitboard_evaluation.py
+
+""" Bitboard Evaluation Backend for the Viper Chess Engine
+Computes the square-scanning evaluation terms of ViperScoringCalculation with integer masks and popcounts
+instead of looping over chess.SQUARES with board.piece_at() or building lists of attacked squares.
+The methods mirror the names and results of the ViperScoringCalculation term methods they replace, and read
+their weights from the same compiled ruleset, so a ruleset can switch between the two backends with its
+evaluation_backend setting ('bitboard' or 'python') and the scores can be compared side by side.
+"""
+
+import chess
+from typing import Tuple
+
+BB_CENTER = chess.BB_D4 | chess.BB_D5 | chess.BB_E4 | chess.BB_E5
+BB_KINGSIDE = chess.BB_FILE_E | chess.BB_FILE_F | chess.BB_FILE_G | chess.BB_FILE_H
+BB_QUEENSIDE = chess.BB_FILE_A | chess.BB_FILE_B | chess.BB_FILE_C | chess.BB_FILE_D
+
+# Minor pieces still on their starting squares, per color
+BB_KNIGHT_START = [chess.BB_B8 | chess.BB_G8, chess.BB_B1 | chess.BB_G1]
+BB_BISHOP_START = [chess.BB_C8 | chess.BB_F8, chess.BB_C1 | chess.BB_F1]
+# Pawns one step from promotion, per color
+BB_PROMOTION_RANK = [chess.BB_RANK_2, chess.BB_RANK_7]
+
+# Files next to each file, for isolated pawns
+BB_ADJACENT_FILES = [(chess.BB_FILES[file - 1] if file > 0 else 0) | (chess.BB_FILES[file + 1] if file < 7 else 0) for file in range(8)]
+
+def _front_span(color: chess.Color, square: chess.Square) -> int:
+    """Squares on the same and adjacent files strictly ahead of square, from color's point of view."""
+    file = chess.square_file(square)
+    rank = chess.square_rank(square)
+    ranks = range(rank + 1, 8) if color == chess.WHITE else range(0, rank)
+    mask = 0
+    for r in ranks:
+        mask |= chess.BB_RANKS[r]
+    return mask & (chess.BB_FILES[file] | BB_ADJACENT_FILES[file])
+
+def _king_shield(color: chess.Color, square: chess.Square) -> int:
+    """The one or two ranks in front of a king on square, on its own and the adjacent files."""
+    file = chess.square_file(square)
+    rank = chess.square_rank(square)
+    if color == chess.WHITE:
+        ranks = [r for r, allowed in ((rank + 1, rank < 7), (rank + 2, rank < 6)) if allowed]
+    else:
+        ranks = [r for r, allowed in ((rank - 1, rank > 0), (rank - 2, rank > 1)) if allowed]
+    mask = 0
+    for r in ranks:
+        mask |= chess.BB_RANKS[r]
+    return mask & (chess.BB_FILES[file] | BB_ADJACENT_FILES[file])
+
+# Indexed [color][square]
+BB_FRONT_SPAN = [[_front_span(color, square) for square in chess.SQUARES] for color in (chess.BLACK, chess.WHITE)]
+BB_KING_SHIELD = [[_king_shield(color, square) for square in chess.SQUARES] for color in (chess.BLACK, chess.WHITE)]
+
+def pawn_attacks(pawns: int, color: chess.Color) -> int:
+    """All squares attacked by the given pawns of color."""
+    if color == chess.WHITE:
+        return chess.shift_up_left(pawns) | chess.shift_up_right(pawns)
+    return chess.shift_down_left(pawns) | chess.shift_down_right(pawns)
+
+class BitboardEvaluation:
+    """
+    Bitboard implementations of the ViperScoringCalculation terms that scan squares or attack sets.
+    scoring is the owning ViperScoringCalculation, whose compiled ruleset (scoring.rules) holds the weights.
+    """
+
+    def __init__(self, scoring):
+        self.scoring = scoring
+        # Attack sets and mobility of the last board seen, both colors' terms are computed on the same board
+        self._attack_key = None
+        self._attacks = (0, 0)
+        self._mobility = (0, 0)
+
+    def _attack_maps(self, board: chess.Board) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """(attacked squares per color, attacked square count of non-king pieces per color) for board."""
+        key = (board.occupied_co[chess.WHITE], board.occupied_co[chess.BLACK], board.pawns, board.knights,
+               board.bishops, board.rooks, board.queens, board.kings)
+        if key != self._attack_key:
+            attacks = [0, 0]
+            mobility = [0, 0]
+            kings = board.kings
+            for color in chess.COLORS:
+                for square in chess.scan_forward(board.occupied_co[color]):
+                    square_attacks = board.attacks_mask(square)
+                    attacks[color] |= square_attacks
+                    if not kings & chess.BB_SQUARES[square]:
+                        mobility[color] += chess.popcount(square_attacks)
+            self._attack_key = key
+            self._attacks = (attacks[0], attacks[1])
+            self._mobility = (mobility[0], mobility[1])
+        return self._attacks, self._mobility
+
+    def _center_control(self, board: chess.Board, color: chess.Color) -> float:
+        return chess.popcount(board.occupied_co[color] & BB_CENTER) * self.scoring.rules.center_control_bonus
+
+    def _piece_coordination(self, board: chess.Board, color: chess.Color) -> float:
+        attacks, _ = self._attack_maps(board)
+        return chess.popcount(board.occupied_co[color] & attacks[color]) * self.scoring.rules.piece_coordination_bonus
+
+    def _king_safety(self, board: chess.Board, color: chess.Color) -> float:
+        king_square = board.king(color)
+        if king_square is None:
+            return 0.0
+        shield_pawns = board.pawns & board.occupied_co[color] & BB_KING_SHIELD[color][king_square]
+        return chess.popcount(shield_pawns) * self.scoring.rules.king_safety_bonus
+
+    def _mobility_score(self, board: chess.Board, color: chess.Color) -> float:
+        _, mobility = self._attack_maps(board)
+        return mobility[color] * self.scoring.rules.piece_mobility_bonus
+
+    def _piece_activity(self, board: chess.Board, color: chess.Color) -> float:
+        own = board.occupied_co[color]
+        knight_squares = sum(chess.popcount(board.attacks_mask(square)) for square in chess.scan_forward(board.knights & own))
+        bishop_squares = sum(chess.popcount(board.attacks_mask(square)) for square in chess.scan_forward(board.bishops & own))
+        return (knight_squares * self.scoring.rules.knight_activity_bonus +
+                bishop_squares * self.scoring.rules.bishop_activity_bonus)
+
+    def _improved_minor_piece_activity(self, board: chess.Board, color: chess.Color) -> float:
+        own = board.occupied_co[color]
+        safe = ~pawn_attacks(board.pawns & board.occupied_co[not color], not color)
+        knight_squares = sum(chess.popcount(board.attacks_mask(square) & safe) for square in chess.scan_forward(board.knights & own))
+        bishop_squares = sum(chess.popcount(board.attacks_mask(square) & safe) for square in chess.scan_forward(board.bishops & own))
+        return (knight_squares * self.scoring.rules.knight_activity_bonus +
+                bishop_squares * self.scoring.rules.bishop_activity_bonus)
+
+    def _bishop_vision(self, board: chess.Board, color: chess.Color) -> float:
+        seeing_bishops = sum(1 for square in chess.scan_forward(board.bishops & board.occupied_co[color])
+                             if chess.popcount(board.attacks_mask(square)) > 5)
+        return seeing_bishops * self.scoring.rules.bishop_vision_bonus
+
+    def _bishop_pair(self, board: chess.Board, color: chess.Color) -> float:
+        if chess.popcount(board.bishops & board.occupied_co[color]) >= 2:
+            return self.scoring.rules.bishop_pair_bonus
+        return 0.0
+
+    def _knight_pair(self, board: chess.Board, color: chess.Color) -> float:
+        if chess.popcount(board.knights & board.occupied_co[color]) >= 2:
+            return self.scoring.rules.knight_pair_bonus
+        return 0.0
+
+    def _undeveloped_pieces(self, board: chess.Board, color: chess.Color) -> float:
+        own = board.occupied_co[color]
+        undeveloped_count = chess.popcount(board.knights & own & BB_KNIGHT_START[color]) + chess.popcount(board.bishops & own & BB_BISHOP_START[color])
+        if undeveloped_count and (board.has_kingside_castling_rights(color) or board.has_queenside_castling_rights(color)):
+            return undeveloped_count * self.scoring.rules.undeveloped_penalty
+        return 0.0
+
+    def _tactical_evaluation(self, board: chess.Board, color: chess.Color) -> float:
+        score = 0.0
+        # Only the side to move has legal captures
+        if board.turn == color:
+            captures = sum(1 for _ in board.generate_legal_captures())
+            score += captures * self.scoring.rules.capture_bonus
+
+        attacks, _ = self._attack_maps(board)
+        own_attacks = attacks[color]
+        opponent_attacks = attacks[not color]
+        hanging = board.occupied_co[not color] & own_attacks & ~opponent_attacks
+        undefended = board.occupied_co[color] & opponent_attacks & ~own_attacks
+        score += chess.popcount(hanging) * self.scoring.rules.hanging_piece_bonus
+        score += chess.popcount(undefended) * self.scoring.rules.undefended_piece_penalty
+        return score
+
+    def _special_moves(self, board: chess.Board, color: chess.Color) -> float:
+        score = 0.0
+        if board.ep_square and board.turn == color and any(board.generate_legal_ep()):
+            score += self.scoring.rules.en_passant_bonus
+        promotion_candidates = board.pawns & board.occupied_co[color] & BB_PROMOTION_RANK[color]
+        score += chess.popcount(promotion_candidates) * self.scoring.rules.pawn_promotion_bonus
+        return score
+
+    def _open_files(self, board: chess.Board, color: chess.Color) -> float:
+        score = 0.0
+        own_pawns = board.pawns & board.occupied_co[color]
+        opponent_pawns = board.pawns & board.occupied_co[not color]
+        own_rooks = board.rooks & board.occupied_co[color]
+        king_square = board.king(color)
+        king_file = chess.square_file(king_square) if king_square is not None else None
+
+        for file, file_mask in enumerate(chess.BB_FILES):
+            if own_pawns & file_mask:
+                continue # Neither open nor semi-open for color, no term applies
+            if not opponent_pawns & file_mask:
+                score += self.scoring.rules.open_file_bonus
+            else:
+                score += self.scoring.rules.open_file_bonus / 2
+            if own_rooks & file_mask:
+                score += self.scoring.rules.file_control_bonus
+            if king_file == file:
+                score += self.scoring.rules.exposed_king_penalty
+        return score
+
+    def _pawn_structure(self, board: chess.Board, color: chess.Color) -> float:
+        score = 0.0
+        own_pawns = board.pawns & board.occupied_co[color]
+        for file_mask in chess.BB_FILES:
+            pawns_on_file = chess.popcount(own_pawns & file_mask)
+            if pawns_on_file > 1:
+                score += (pawns_on_file - 1) * self.scoring.rules.doubled_pawn_penalty
+        isolated = sum(1 for square in chess.scan_forward(own_pawns) if not own_pawns & BB_ADJACENT_FILES[chess.square_file(square)])
+        score += isolated * self.scoring.rules.isolated_pawn_penalty
+        return score
+
+    def _pawn_weaknesses(self, board: chess.Board, color: chess.Color) -> float:
+        return 0.0 # Backward pawns are not evaluated yet, same as the python backend
+
+    def _passed_pawns(self, board: chess.Board, color: chess.Color) -> float:
+        opponent_pawns = board.pawns & board.occupied_co[not color]
+        front_spans = BB_FRONT_SPAN[color]
+        passed = sum(1 for square in chess.scan_forward(board.pawns & board.occupied_co[color]) if not opponent_pawns & front_spans[square])
+        return passed * self.scoring.rules.passed_pawn_bonus
+
+    def _pawn_majority(self, board: chess.Board, color: chess.Color) -> float:
+        score = 0.0
+        own_pawns = board.pawns & board.occupied_co[color]
+        opponent_pawns = board.pawns & board.occupied_co[not color]
+        for wing in (BB_KINGSIDE, BB_QUEENSIDE):
+            if chess.popcount(own_pawns & wing) > chess.popcount(opponent_pawns & wing):
+                score += self.scoring.rules.pawn_majority_bonus / 2
+        return score
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import random
+    import yaml
+    from engine_utilities.piece_square_tables import PieceSquareTables
+    from engine_utilities.piece_values import DEFAULT_PIECE_VALUES
+    from engine_utilities.viper_scoring_calculation import ViperScoringCalculation
+
+    # Compare every bitboard term with the python term on random positions, using a ruleset with all terms on
+    with open("viper.yaml") as f:
+        viper_yaml = yaml.safe_load(f)
+    rules = dict(viper_yaml['default_evaluation'], bishop_pair_bonus=1.0, pawn_majority_bonus=1.0)
+    scoring = ViperScoringCalculation(viper_yaml_config={'rulesets': {'ab_test': rules}},
+                                      ai_config={'ruleset': 'ab_test'}, piece_values=DEFAULT_PIECE_VALUES, pst=PieceSquareTables())
+    backend = BitboardEvaluation(scoring)
+    terms = ['_center_control', '_piece_coordination', '_king_safety', '_mobility_score', '_piece_activity',
+             '_improved_minor_piece_activity', '_bishop_vision', '_bishop_pair', '_knight_pair', '_undeveloped_pieces',
+             '_tactical_evaluation', '_special_moves', '_open_files', '_pawn_structure', '_pawn_weaknesses',
+             '_passed_pawns', '_pawn_majority']
+    mismatches = 0
+    positions = 0
+    for _ in range(100):
+        board = chess.Board()
+        for _ in range(random.randint(0, 120)):
+            legal = list(board.legal_moves)
+            if not legal:
+                break
+            board.push(random.choice(legal))
+            positions += 1
+            for term in terms:
+                for color in chess.COLORS:
+                    expected = getattr(scoring, term)(board, color) or 0.0
+                    actual = getattr(backend, term)(board, color)
+                    if abs(expected - actual) > 1e-9:
+                        mismatches += 1
+                        print(f"{term} {color}: python {expected} bitboard {actual} | {board.fen()}")
+    print(f"Bitboard backend mismatches over {positions} positions: {mismatches}")
@@ -0,0 +1,119 @@
+# engine_utilities/compiled_ruleset.py
+
+""" Compiled Evaluation Rulesets for the Viper Chess Engine
+Resolves a ruleset from viper.yaml once, at configure time, into a frozen object with one slot per rule.
+Every weight already has the ruleset fallback chain (ruleset, then default_evaluation, then the built-in
+default) applied and the scoring modifier multiplied in, so the evaluation terms read plain attributes
+instead of doing dictionary lookups, and the terms whose weights are all zero are not evaluated at all.
+"""
+
+from typing import Any, Callable, Dict, Tuple
+
+# Built-in defaults for rules missing from both the ruleset and default_evaluation
+RULE_DEFAULTS = {
+    'checkmate_bonus': 0.0,
+    'draw_penalty': -9999999999.0,
+    'stalemate_penalty': 0.0,
+    'material_weight': 1.0,
+    'king_safety_bonus': 0.0,
+    'in_check_penalty': 0.0,
+    'check_bonus': 0.0,
+    'center_control_bonus': 0.0,
+    'piece_coordination_bonus': 0.0,
+    'doubled_pawn_penalty': 0.0,
+    'isolated_pawn_penalty': 0.0,
+    'passed_pawn_bonus': 0.0,
+    'pawn_majority_bonus': 0.0,
+    'bishop_pair_bonus': 0.0,
+    'knight_pair_bonus': 0.0,
+    'bishop_vision_bonus': 0.0,
+    'stacked_rooks_bonus': 0.0,
+    'coordinated_rooks_bonus': 0.0,
+    'rook_position_bonus': 0.0,
+    'castling_bonus': 0.0,
+    'castling_protection_bonus': 0.0,
+    'castling_protection_penalty': 0.0,
+    'knight_activity_bonus': 0.0,
+    'bishop_activity_bonus': 0.0,
+    'piece_mobility_bonus': 0.0,
+    'undeveloped_penalty': 0.0,
+    'capture_bonus': 0.0,
+    'hanging_piece_bonus': 0.0,
+    'undefended_piece_penalty': 0.0,
+    'tempo_bonus': 0.0,
+    'en_passant_bonus': 0.0,
+    'pawn_promotion_bonus': 0.0,
+    'open_file_bonus': 0.0,
+    'file_control_bonus': 0.0,
+    'exposed_king_penalty': 0.0,
+}
+
+# The weights each evaluation term is linear in, in evaluation order. A term is skipped when all are zero.
+TERM_WEIGHTS = (
+    ('_checkmate_threats', ('checkmate_bonus',)),
+    ('_king_safety', ('king_safety_bonus',)),
+    ('_king_threat', ('in_check_penalty', 'check_bonus')),
+    ('_draw_scenarios', ('draw_penalty',)),
+    ('_piece_coordination', ('piece_coordination_bonus',)),
+    ('_center_control', ('center_control_bonus',)),
+    ('_pawn_score', ('doubled_pawn_penalty', 'isolated_pawn_penalty', 'passed_pawn_bonus', 'pawn_majority_bonus')),
+    ('_bishop_pair', ('bishop_pair_bonus',)),
+    ('_knight_pair', ('knight_pair_bonus',)),
+    ('_bishop_vision', ('bishop_vision_bonus',)),
+    ('_rook_coordination', ('stacked_rooks_bonus', 'coordinated_rooks_bonus', 'rook_position_bonus')),
+    ('_castling_evaluation', ('castling_bonus', 'castling_protection_bonus', 'castling_protection_penalty')),
+    ('_piece_activity', ('knight_activity_bonus', 'bishop_activity_bonus')),
+    ('_improved_minor_piece_activity', ('knight_activity_bonus', 'bishop_activity_bonus')),
+    ('_mobility_score', ('piece_mobility_bonus',)),
+    ('_undeveloped_pieces', ('undeveloped_penalty',)),
+    ('_tactical_evaluation', ('capture_bonus', 'hanging_piece_bonus', 'undefended_piece_penalty')),
+    ('_tempo_bonus', ('tempo_bonus',)),
+    ('_special_moves', ('en_passant_bonus', 'pawn_promotion_bonus')),
+    ('_open_files', ('open_file_bonus', 'file_control_bonus', 'exposed_king_penalty')),
+    ('_stalemate', ('stalemate_penalty',)),
+)
+
+class CompiledRuleset:
+    """
+    Frozen, fully resolved ruleset. Rule weights are attributes, premultiplied by the scoring modifier,
+    and pst_weight is premultiplied too. active_terms lists the names of the terms with a non-zero weight.
+    """
+
+    __slots__ = ('name', 'evaluation_backend', 'scoring_modifier', 'pst_enabled', 'pst_weight', 'active_terms') + tuple(RULE_DEFAULTS)
+
+    def __init__(self, name: str, rule_value: Callable[[str, Any], Any], scoring_modifier: float = 1.0,
+                 pst_enabled: bool = True, pst_weight: float = 1.0):
+        """rule_value(rule_key, default) is the ruleset lookup, applied once per rule here."""
+        setattr_ = super().__setattr__
+        setattr_('name', name)
+        setattr_('evaluation_backend', rule_value('evaluation_backend', 'bitboard'))
+        setattr_('scoring_modifier', scoring_modifier)
+        setattr_('pst_enabled', bool(pst_enabled))
+        setattr_('pst_weight', scoring_modifier * pst_weight)
+        for rule_key, default_value in RULE_DEFAULTS.items():
+            setattr_(rule_key, scoring_modifier * (rule_value(rule_key, default_value) or 0.0))
+        setattr_('active_terms', tuple(term for term, weights in TERM_WEIGHTS if any(getattr(self, key) for key in weights)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"CompiledRuleset '{self.name}' is frozen")
+
+    def weights(self) -> Dict[str, float]:
+        """The premultiplied rule weights as a dict."""
+        return {rule_key: getattr(self, rule_key) for rule_key in RULE_DEFAULTS}
+
+    @staticmethod
+    def signature(name: str, scoring_modifier: float, pst_enabled: bool, pst_weight: float) -> Tuple:
+        """Identity of a compiled ruleset, used to reuse compiled objects across configure calls."""
+        return (name, scoring_modifier, bool(pst_enabled), pst_weight)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    rules = {'material_weight': 0.8, 'center_control_bonus': 0.25, 'draw_penalty': -500.0}
+    compiled = CompiledRuleset('example', lambda key, default: rules.get(key, default), scoring_modifier=2.0)
+    print("material_weight:", compiled.material_weight, "center_control_bonus:", compiled.center_control_bonus)
+    print("Active terms:", compiled.active_terms)
+    try:
+        compiled.material_weight = 1.0
+    except AttributeError as e:
+        print("Frozen:", e)
@@ -0,0 +1,76 @@
+# engine_utilities/eval_cache.py
+
+""" Evaluation Cache for the Viper Chess Engine
+A bounded least-recently-used cache of static evaluations. The same positions are evaluated many times over
+(quiescence stand-pat, the root loop, simple search and transpositions reached through different move orders),
+and a full evaluation is far more expensive than a dictionary lookup.
+Keys are built by the caller from the position's Zobrist hash and the identity of the active ruleset, so
+engines with different rulesets (viper and viper_opponent) never read each other's scores.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+class EvalCache:
+    """
+    LRU cache of evaluation scores with hit and miss counters.
+    A max_size of 0 disables the cache: get() always misses and store() does nothing.
+    """
+
+    def __init__(self, max_size: int = 100000):
+        self.max_size = max(0, int(max_size or 0))
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[float]:
+        """Return the cached score for key (marking it recently used), or None."""
+        score = self.entries.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return score
+
+    def store(self, key: Hashable, score: float):
+        """Cache score under key, evicting the least recently used entry when full."""
+        if self.max_size <= 0:
+            return
+        self.entries[key] = score
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and fill level."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self.entries),
+            'max_size': self.max_size
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    cache = EvalCache(max_size=2)
+    cache.store(("a", "default_evaluation"), 1.0)
+    cache.store(("b", "default_evaluation"), 2.0)
+    cache.get(("a", "default_evaluation"))        # a is now the most recently used
+    cache.store(("c", "default_evaluation"), 3.0)  # evicts b
+    print("a:", cache.get(("a", "default_evaluation")), "b:", cache.get(("b", "default_evaluation")),
+          "c:", cache.get(("c", "default_evaluation")))
+    print("Other ruleset:", cache.get(("a", "conservative_evaluation")))
+    print("Stats:", cache.stats())
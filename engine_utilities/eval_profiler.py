@@ -0,0 +1,78 @@
+# engine_utilities/eval_profiler.py
+
+""" Evaluation Term Profiler for the Viper Chess Engine
+Opt-in instrumentation for ViperScoringCalculation.calculate_score. When a profiler is attached, every
+evaluation term is timed and its contribution recorded, giving cumulative wall time, call count and mean
+absolute contribution per term. The table shows which terms dominate leaf cost and whether they earn it.
+Enable it with performance.profile_eval_terms in viper.yaml; ChessGame writes the table to the game's
+eval_game_*.yaml artifact and, for rated games, to the MetricsStore eval_term_profile table.
+"""
+
+from typing import Any, Dict, List
+
+class EvalProfiler:
+    """Cumulative per-term timing and contribution statistics."""
+
+    def __init__(self):
+        self.stats = {} # term -> [calls, total_time_s, total_abs_contribution]
+        self.evaluations = 0
+
+    def record(self, term: str, elapsed: float, contribution: float):
+        """Add one call of term that took elapsed seconds and contributed contribution to the score."""
+        entry = self.stats.get(term)
+        if entry is None:
+            entry = self.stats[term] = [0, 0.0, 0.0]
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] += abs(contribution)
+
+    def reset(self):
+        """Clear all statistics."""
+        self.stats = {}
+        self.evaluations = 0
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """One row per term, most expensive first."""
+        total_time = sum(entry[1] for entry in self.stats.values()) or 1.0
+        rows = []
+        for term, (calls, elapsed, abs_contribution) in self.stats.items():
+            rows.append({
+                'term': term.lstrip('_'),
+                'calls': calls,
+                'total_time_s': round(elapsed, 6),
+                'mean_time_us': round(elapsed / calls * 1e6, 3) if calls else 0.0,
+                'time_share': round(elapsed / total_time, 4),
+                'mean_abs_contribution': round(abs_contribution / calls, 6) if calls else 0.0
+            })
+        rows.sort(key=lambda row: row['total_time_s'], reverse=True)
+        return rows
+
+    def format_table(self) -> str:
+        """The rows as a fixed-width text table."""
+        lines = [f"{'term':<32}{'calls':>10}{'total s':>12}{'mean us':>12}{'share':>8}{'mean |contrib|':>16}"]
+        for row in self.rows():
+            lines.append(f"{row['term']:<32}{row['calls']:>10}{row['total_time_s']:>12.4f}{row['mean_time_us']:>12.2f}"
+                         f"{row['time_share']:>8.1%}{row['mean_abs_contribution']:>16.4f}")
+        lines.append(f"{self.evaluations} evaluations profiled")
+        return "\n".join(lines)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import chess
+    import yaml
+    from engine_utilities.piece_square_tables import PieceSquareTables
+    from engine_utilities.piece_values import DEFAULT_PIECE_VALUES
+    from engine_utilities.viper_scoring_calculation import ViperScoringCalculation
+
+    with open("viper.yaml") as f:
+        viper_yaml = yaml.safe_load(f)
+    scoring = ViperScoringCalculation(viper_yaml_config={'rulesets': {'default_evaluation': viper_yaml['default_evaluation']}},
+                                      ai_config={'ruleset': 'default_evaluation'}, piece_values=DEFAULT_PIECE_VALUES, pst=PieceSquareTables())
+    profiler = EvalProfiler()
+    scoring.profiler = profiler
+    board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    for _ in range(50):
+        scoring.calculate_score(board, chess.WHITE)
+        scoring.calculate_score(board, chess.BLACK)
+    print(profiler.format_table())
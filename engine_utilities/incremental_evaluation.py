@@ -0,0 +1,138 @@
+# engine_utilities/incremental_evaluation.py
+
+""" Incremental Evaluation for the Viper Chess Engine
+Keeps material and piece-square table accumulators for the board being searched and updates them by delta
+on every move made or unmade, instead of recounting material and looping all 64 squares at every leaf.
+The PST accumulators hold separate middlegame and endgame sums, so the game phase blend is applied at the leaf
+exactly as PieceSquareTables.evaluate_board_position() does it.
+"""
+
+import chess
+from typing import Dict, Optional
+from engine_utilities.piece_square_tables import PieceSquareTables
+from engine_utilities.piece_values import PIECE_VALUES, piece_value_table
+
+class IncrementalEvaluator:
+    """
+    Material per color and White-relative PST middlegame/endgame sums (centipawns) for one board.
+    Call reset() on a new board, push() before each board.push() and pop() after each board.pop().
+    """
+
+    def __init__(self, pst: PieceSquareTables, piece_values: Optional[Dict[int, float]] = None):
+        self.pst = pst
+        self.values = PIECE_VALUES if piece_values is None else piece_value_table(piece_values)
+        # Signed (positive for White) PST values per [color][piece_type][square], built from the same
+        # get_piece_value() the full evaluation uses so both always agree
+        self.mg_values = [[[0.0] * 64 for _ in range(7)] for _ in range(2)]
+        self.eg_values = [[[0.0] * 64 for _ in range(7)] for _ in range(2)]
+        for color in chess.COLORS:
+            sign = 1 if color == chess.WHITE else -1
+            for piece_type in chess.PIECE_TYPES:
+                piece = chess.Piece(piece_type, color)
+                for square in chess.SQUARES:
+                    self.mg_values[color][piece_type][square] = sign * pst.get_piece_value(piece, square, color, 0.0)
+                    self.eg_values[color][piece_type][square] = sign * pst.get_piece_value(piece, square, color, 1.0)
+
+        self.material = [0.0, 0.0] # Indexed by color, chess.BLACK is 0
+        self.pst_mg = 0.0
+        self.pst_eg = 0.0
+        self.stack = []
+
+    def reset(self, board: chess.Board):
+        """Compute the accumulators from scratch for board and clear the undo stack."""
+        self.material = [0.0, 0.0]
+        self.pst_mg = 0.0
+        self.pst_eg = 0.0
+        self.stack = []
+        for square, piece in board.piece_map().items():
+            self._add(piece.color, piece.piece_type, square)
+
+    def _add(self, color: chess.Color, piece_type: int, square: chess.Square):
+        self.material[color] += self.values[piece_type]
+        self.pst_mg += self.mg_values[color][piece_type][square]
+        self.pst_eg += self.eg_values[color][piece_type][square]
+
+    def _remove(self, color: chess.Color, piece_type: int, square: chess.Square):
+        self.material[color] -= self.values[piece_type]
+        self.pst_mg -= self.mg_values[color][piece_type][square]
+        self.pst_eg -= self.eg_values[color][piece_type][square]
+
+    def push(self, board: chess.Board, move: chess.Move):
+        """Apply the deltas of move. Must be called on the board *before* the move is pushed."""
+        self.stack.append((self.material[chess.BLACK], self.material[chess.WHITE], self.pst_mg, self.pst_eg))
+        if not move:
+            return # Null move
+
+        color = board.turn
+        from_square = move.from_square
+        to_square = move.to_square
+        piece_type = board.piece_type_at(from_square)
+        if piece_type is None:
+            return
+
+        if piece_type == chess.KING and board.is_castling(move):
+            rank = chess.square_rank(from_square)
+            if board.is_kingside_castling(move):
+                king_to, rook_from, rook_to = chess.square(6, rank), chess.square(7, rank), chess.square(5, rank)
+            else:
+                king_to, rook_from, rook_to = chess.square(2, rank), chess.square(0, rank), chess.square(3, rank)
+            if board.chess960:
+                rook_from = to_square # python-chess encodes 960 castling as king-takes-rook
+            self._remove(color, chess.KING, from_square)
+            self._remove(color, chess.ROOK, rook_from)
+            self._add(color, chess.KING, king_to)
+            self._add(color, chess.ROOK, rook_to)
+            return
+
+        captured_type = board.piece_type_at(to_square)
+        if captured_type is not None:
+            self._remove(not color, captured_type, to_square)
+        elif piece_type == chess.PAWN and to_square == board.ep_square and chess.square_file(from_square) != chess.square_file(to_square):
+            self._remove(not color, chess.PAWN, to_square - 8 if color == chess.WHITE else to_square + 8)
+
+        self._remove(color, piece_type, from_square)
+        self._add(color, move.promotion or piece_type, to_square)
+
+    def pop(self):
+        """Restore the accumulators from before the last push()."""
+        black_material, white_material, self.pst_mg, self.pst_eg = self.stack.pop()
+        self.material = [black_material, white_material] # Indexed by color, chess.BLACK is 0
+
+    def pst_score(self, endgame_factor: float = 0.0) -> float:
+        """White-relative PST score in pawn units, same result as PieceSquareTables.evaluate_board_position()."""
+        return (self.pst_mg * (1 - endgame_factor) + self.pst_eg * endgame_factor) / 100.0
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import random
+
+    pst = PieceSquareTables()
+    evaluator = IncrementalEvaluator(pst)
+
+    # Compare the incremental accumulators with a full recompute over random games
+    mismatches = 0
+    for game in range(30):
+        board = chess.Board()
+        evaluator.reset(board)
+        while not board.is_game_over() and board.ply() < 200:
+            move = random.choice(list(board.legal_moves))
+            evaluator.push(board, move)
+            board.push(move)
+            for factor in (0.0, 0.5, 1.0):
+                if abs(evaluator.pst_score(factor) - pst.evaluate_board_position(board, factor)) > 1e-9:
+                    mismatches += 1
+            for color in chess.COLORS:
+                material = sum(len(board.pieces(piece_type, color)) * PIECE_VALUES[piece_type] for piece_type in chess.PIECE_TYPES)
+                if abs(evaluator.material[color] - material) > 1e-9:
+                    mismatches += 1
+        while board.move_stack:
+            board.pop()
+            evaluator.pop()
+            for color in chess.COLORS:
+                material = sum(len(board.pieces(piece_type, color)) * PIECE_VALUES[piece_type] for piece_type in chess.PIECE_TYPES)
+                if abs(evaluator.material[color] - material) > 1e-9:
+                    mismatches += 1
+        if abs(evaluator.pst_score(0.0) - pst.evaluate_board_position(board, 0.0)) > 1e-9:
+            mismatches += 1
+    print(f"Incremental material/PST mismatches over 30 random games: {mismatches}")
@@ -0,0 +1,151 @@
+# engine_utilities/lazy_smp.py
+
+""" Lazy SMP Parallel Search for the Viper Chess Engine
+Helper processes search the same root position as the main search, starting their iterative deepening
+at staggered depths, and share what they learn through a SharedTranspositionTable.
+Processes are used instead of threads because the search is pure Python and would not scale under the GIL.
+The helpers are started once and stay alive between moves, each search is sent to them as a task.
+A helper that dies is replaced when the next search starts.
+"""
+
+import chess
+import queue
+import time
+import multiprocessing
+from typing import Any, Dict, List, Tuple
+from engine_utilities.transposition_table import SharedTranspositionTable
+
+def _helper_worker(worker_id: int, table_name: str, hash_size: float, task_queue, result_queue, stop_event):
+    """Entry point of a helper process: build an engine on the shared table and run search tasks until told to exit."""
+    from viper import ViperEvaluationEngine # Imported here, viper imports this module
+
+    engine = ViperEvaluationEngine(chess.Board(), chess.WHITE)
+    engine.logging_enabled = False
+    engine.show_thoughts = False
+    engine.transposition_table = SharedTranspositionTable(size_mb=hash_size, name=table_name)
+
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            search_id, root_fen, chess960, moves, player, ai_config, depth, age = task
+
+            board = chess.Board(root_fen, chess960=chess960)
+            for uci in moves:
+                board.push(chess.Move.from_uci(uci))
+
+            # ai_config is the main engine's already resolved config, so it is applied as is
+            engine.current_player = player
+            engine.configure_for_side(board, ai_config)
+            engine.transposition_table.age = age
+            engine.time_manager.start_timer(float('inf')) # Helpers run until the main search raises the stop event
+            engine.nodes_searched = 0
+
+            def report_iteration(completed_depth: int, move: chess.Move, score: float):
+                result_queue.put((search_id, worker_id, completed_depth, move.uci(), score, engine.nodes_searched))
+
+            # Odd helpers skip the first iteration so the helpers are spread over neighbouring depths
+            start_depth = 1 + (worker_id % 2)
+            try:
+                engine._deep_search(board, depth, {"infinite": True}, current_depth=start_depth,
+                                    stop_callback=stop_event.is_set, iteration_callback=report_iteration)
+            finally:
+                result_queue.put((search_id, worker_id, None, None, None, engine.nodes_searched)) # Done marker
+    finally:
+        engine.transposition_table.close()
+
+
+class LazySMP:
+    """
+    Pool of persistent helper processes for Lazy SMP. The main search runs in the calling process on the
+    same shared table. start_search() hands the root position to every helper and stop_search() stops them
+    and returns the iterations they completed.
+    """
+
+    def __init__(self, helper_count: int, table: SharedTranspositionTable):
+        self.helper_count = helper_count
+        self.table = table
+        self.context = multiprocessing.get_context("spawn")
+        self.processes = [] # Helper process of worker_id index + 1
+        self.task_queue = None
+        self.result_queue = None
+        self.stop_event = None
+        self.search_id = 0
+
+    def start(self):
+        """Start the helper processes that are not running: all of them the first time, afterwards any helper that died."""
+        if self.task_queue is None:
+            self.task_queue = self.context.Queue()
+            self.result_queue = self.context.Queue()
+            self.stop_event = self.context.Event()
+            self.processes = [None] * self.helper_count
+        for index, process in enumerate(self.processes):
+            if process is not None and process.is_alive():
+                continue
+            if process is not None:
+                process.join(timeout=0) # Reap the dead helper
+            process = self.context.Process(
+                target=_helper_worker,
+                args=(index + 1, self.table.name, self.table.size_mb, self.task_queue, self.result_queue, self.stop_event),
+                daemon=True
+            )
+            process.start()
+            self.processes[index] = process
+
+    def start_search(self, board: chess.Board, player: chess.Color, ai_config: Dict[str, Any], depth: int):
+        """Send the root position to every helper. The board's move stack is sent so repetitions are detected."""
+        self.start()
+        self.search_id += 1
+        # A helper that died before taking its task leaves it queued, its replacement must not pick it up
+        while True:
+            try:
+                self.task_queue.get_nowait()
+            except queue.Empty:
+                break
+        self.stop_event.clear()
+        root = board.root()
+        moves = [move.uci() for move in board.move_stack]
+        task = (self.search_id, root.fen(), board.chess960, moves, player, ai_config, depth, self.table.age)
+        for _ in self.processes:
+            self.task_queue.put(task)
+
+    def stop_search(self, timeout: float = 5.0) -> Tuple[List[Tuple[int, int, chess.Move, float]], int]:
+        """
+        Stop the helpers and collect their results. A helper that died sends no done marker and is not waited for.
+        Returns ([(worker_id, depth, move, score), ...] for every completed iteration, total helper nodes).
+        """
+        self.stop_event.set()
+        results = []
+        helper_nodes = {}
+        pending = {index + 1: process for index, process in enumerate(self.processes)}
+        deadline = time.monotonic() + timeout
+        while pending and time.monotonic() < deadline: # A helper that does not answer in time has its late results dropped by search_id
+            try:
+                search_id, worker_id, depth, move_uci, score, nodes = self.result_queue.get(timeout=0.05)
+            except queue.Empty:
+                for worker_id in [worker_id for worker_id, process in pending.items() if not process.is_alive()]:
+                    del pending[worker_id]
+                continue
+            if search_id != self.search_id:
+                continue
+            helper_nodes[worker_id] = nodes
+            if depth is None:
+                pending.pop(worker_id, None)
+            else:
+                results.append((worker_id, depth, chess.Move.from_uci(move_uci), score))
+        return results, sum(helper_nodes.values())
+
+    def close(self):
+        """Shut the helper processes down."""
+        if not self.processes:
+            return
+        self.stop_event.set()
+        for _ in self.processes:
+            self.task_queue.put(None)
+        for process in self.processes:
+            process.join(timeout=5.0)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+        self.task_queue = None
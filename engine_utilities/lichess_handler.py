@@ -18,13 +18,16 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 class LichessBot:
-    def __init__(self, token: str, engine_name: str = "ChessBot"):
+    def __init__(self, token: str, engine_name: str = "ChessBot", ponder: bool = True):
         self.token = token
         self.engine_name = engine_name
         self.engine = ViperEvaluationEngine()
         self.headers = {"Authorization": f"Bearer {token}"}
         self.base_url = "https://lichess.org/api"
         self.active_games = {}
+        self.pending_searches = {} # game_id -> SearchFuture of the move being calculated
+        self.ponder = ponder       # Think on the opponent's time, searching the expected reply
+        self.ponder_game = None    # game_id the engine is pondering for
 
         # Verify token and upgrade to bot account if needed
         self.verify_token()
@@ -221,7 +224,11 @@ class LichessBot:
                                 self.make_move(game_id, board, event.get('state', {}))
 
                         elif event.get('type') == 'gameState':
-                            # Game state update
+                            # Game state update, a search still running for the previous state is stale
+                            if event.get('status', 'started') != 'started':
+                                self.abort_search(game_id)
+                                logger.info(f"Game {game_id} ended ({event.get('status')}), search stopped")
+                                continue
                             moves = event.get('moves', '').split()
 
                             # Rebuild board from moves
@@ -247,6 +254,7 @@ class LichessBot:
         except Exception as e:
             logger.error(f"Error playing game {game_id}: {e}")
         finally:
+            self.abort_search(game_id)
             if game_id in self.active_games:
                 del self.active_games[game_id]
 
@@ -273,34 +281,67 @@ class LichessBot:
             return chess.WHITE
 
     def make_move(self, game_id: str, board: chess.Board, game_state: Dict[str, Any]):
-        """Calculate and make a move"""
+        """Start calculating a move in the background, it is sent when the search finishes unless the game moved on"""
         if board.is_game_over():
             return
 
         logger.info(f"Thinking for game {game_id}...")
 
-        # Convert Lichess time control to our format
+        # Convert Lichess time control to our format, then to a time budget for this move in ms
         time_control = self.convert_time_control(game_state)
+        search_config = {'move_time_limit': self.engine.time_manager.allocate_time(time_control, board) * 1000}
 
+        self.abort_search(game_id, stop_ponder=False) # Stale search for an earlier state of this game
         try:
-            # Get best move from engine
-            best_move = self.engine.search(board, board.turn, time_control)
-
-            if best_move:
-                # Make the move
-                if isinstance(best_move, chess.Move):
-                    self.send_move(game_id, best_move)
-                else:
-                    logger.error(f"Invalid move type for game {game_id}: {type(best_move)}")
-                if isinstance(best_move, chess.Move):
-                    logger.info(f"Played {best_move.uci()} in game {game_id}")
-                else:
-                    logger.error(f"Invalid move type for game {game_id}: {type(best_move)}")
+            if self.ponder_game is not None:
+                # Ponder hit: the pondering search goes on with its time credited, miss: a new search starts
+                self.ponder_game = None
+                search_future = self.engine.finish_ponder(board, board.turn, search_config)
             else:
-                logger.error(f"No move found for game {game_id}")
-
+                search_future = self.engine.search_async(board, board.turn, search_config)
         except Exception as e:
             logger.error(f"Error calculating move for game {game_id}: {e}")
+            return
+        self.pending_searches[game_id] = search_future
+        board = board.copy()
+        search_future.add_done_callback(lambda future: self.on_search_done(game_id, future, board, search_config))
+
+    def on_search_done(self, game_id: str, search_future, board: Optional[chess.Board] = None, search_config: Optional[Dict[str, Any]] = None):
+        """Send the move of a finished search, unless it was aborted, then ponder on the expected reply"""
+        if self.pending_searches.get(game_id) is not search_future:
+            return # Aborted: the game ended or its state changed while thinking
+        del self.pending_searches[game_id]
+        if search_future.exception() is not None:
+            logger.error(f"Error calculating move for game {game_id}: {search_future.exception()}")
+            return
+        best_move = search_future.result()
+        if isinstance(best_move, chess.Move) and best_move != chess.Move.null():
+            self.send_move(game_id, best_move)
+            logger.info(f"Played {best_move.uci()} in game {game_id}")
+            if self.ponder and board is not None and not self.pending_searches:
+                board.push(best_move)
+                self.start_ponder(game_id, board, search_config)
+        else:
+            logger.error(f"No move found for game {game_id}")
+
+    def start_ponder(self, game_id: str, board: chess.Board, search_config: Dict[str, Any]):
+        """Search the expected reply while the opponent thinks"""
+        try:
+            if self.engine.start_ponder(board, search_config) is not None:
+                self.ponder_game = game_id
+                logger.info(f"Pondering in game {game_id}")
+        except Exception as e:
+            logger.error(f"Could not start pondering in game {game_id}: {e}")
+
+    def abort_search(self, game_id: str, stop_ponder: bool = True):
+        """Stop the search running for game_id, its move is discarded, and by default pondering for the game"""
+        search_future = self.pending_searches.pop(game_id, None)
+        if search_future is not None:
+            search_future.stop()
+            search_future.exception() # Wait until the engine is free again
+        if stop_ponder and self.ponder_game == game_id:
+            self.ponder_game = None
+            self.engine.stop_ponder()
 
     def convert_time_control(self, game_state: Dict[str, Any]) -> Dict[str, Any]:
         """Convert Lichess time control to engine format"""
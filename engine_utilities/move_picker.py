@@ -0,0 +1,129 @@
+# engine_utilities/move_picker.py
+
+""" Staged Move Picker for the Viper Chess Engine
+Yields the moves of a search node lazily, one stage at a time:
+hash move, winning captures, killer moves, quiet moves by history score, losing captures.
+Each stage is only generated and scored when the previous one is exhausted, so a beta cutoff
+on the hash move or an early capture never pays for generating and scoring the quiet moves.
+"""
+
+import chess
+from typing import Dict, Iterator, Optional, Sequence
+from engine_utilities.static_exchange import StaticExchangeEvaluator
+
+# Stages in the order they are produced
+STAGE_HASH = 0
+STAGE_WINNING_CAPTURES = 1
+STAGE_KILLERS = 2
+STAGE_QUIETS = 3
+STAGE_LOSING_CAPTURES = 4
+
+class MovePicker:
+    """
+    Lazy, staged move ordering for one node. Iterate over the picker to get legal moves in search order.
+    The board must be in the node's position whenever the next move is requested (moves pushed by the
+    search in between have to be popped again), which is how the search loops use it.
+    """
+
+    def __init__(self, board: chess.Board, static_exchange: StaticExchangeEvaluator, hash_move: Optional[chess.Move] = None,
+                 killers: Sequence[Optional[chess.Move]] = (), history_table: Optional[Dict] = None,
+                 pv_move: Optional[chess.Move] = None, max_moves: Optional[int] = None):
+        self.board = board
+        self.static_exchange = static_exchange
+        self.hash_moves = [move for move in (pv_move, hash_move) if move]
+        self.killers = killers
+        self.history_table = history_table if history_table is not None else {}
+        self.max_moves = max_moves if max_moves and max_moves > 0 else None
+        self.stage = STAGE_HASH
+
+    def __iter__(self) -> Iterator[chess.Move]:
+        yielded = 0
+        for move in self._staged_moves():
+            yield move
+            yielded += 1
+            if self.max_moves is not None and yielded >= self.max_moves:
+                return
+
+    def _staged_moves(self) -> Iterator[chess.Move]:
+        board = self.board
+        searched = []
+
+        # 1. Hash move (and the previous iteration's PV move), only verified for legality
+        self.stage = STAGE_HASH
+        for move in self.hash_moves:
+            if move not in searched and board.is_legal(move):
+                searched.append(move)
+                yield move
+
+        # 2. Captures and promotions with a non-negative static exchange, best first
+        self.stage = STAGE_WINNING_CAPTURES
+        values = self.static_exchange.values
+        winning_captures = []
+        losing_captures = []
+        for move in self._tactical_moves():
+            if move in searched:
+                continue
+            see_score = self.static_exchange.see(board, move)
+            victim_type = board.piece_type_at(move.to_square) or chess.PAWN # En passant or plain promotion
+            ordering_key = (see_score, values[victim_type])
+            if see_score >= 0:
+                winning_captures.append((ordering_key, move))
+            else:
+                losing_captures.append((ordering_key, move))
+        winning_captures.sort(key=lambda x: x[0], reverse=True)
+        for _, move in winning_captures:
+            yield move
+
+        # 3. Killer moves that are quiet and legal in this position
+        self.stage = STAGE_KILLERS
+        for move in list(self.killers):
+            if move and move not in searched and not board.is_capture(move) and not move.promotion and board.is_legal(move):
+                searched.append(move)
+                yield move
+
+        # 4. Remaining quiet moves ordered by history score
+        self.stage = STAGE_QUIETS
+        history_table = self.history_table
+        quiet_moves = []
+        for move in board.generate_legal_moves(chess.BB_ALL, ~board.occupied_co[not board.turn]):
+            if move.promotion or move in searched or board.is_en_passant(move):
+                continue
+            piece_type = board.piece_type_at(move.from_square)
+            quiet_moves.append((history_table.get((piece_type, move.from_square, move.to_square), 0), move))
+        quiet_moves.sort(key=lambda x: x[0], reverse=True)
+        for _, move in quiet_moves:
+            yield move
+
+        # 5. Captures that lose material by static exchange
+        self.stage = STAGE_LOSING_CAPTURES
+        losing_captures.sort(key=lambda x: x[0], reverse=True)
+        for _, move in losing_captures:
+            yield move
+
+    def _tactical_moves(self) -> Iterator[chess.Move]:
+        """Legal captures (including en passant) followed by non-capturing promotions."""
+        board = self.board
+        yield from board.generate_legal_captures()
+        yield from board.generate_legal_moves(board.pawns, chess.BB_BACKRANKS & ~board.occupied)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    picker_moves = list(MovePicker(board, StaticExchangeEvaluator(), hash_move=chess.Move.from_uci("e1g1"),
+                                   killers=[chess.Move.from_uci("d2d3")]))
+    print("Staged order:", " ".join(move.uci() for move in picker_moves))
+    assert sorted(m.uci() for m in picker_moves) == sorted(m.uci() for m in board.legal_moves)
+
+    # Every legal move exactly once, across random positions
+    import random
+    for _ in range(200):
+        board = chess.Board()
+        for _ in range(random.randint(0, 80)):
+            legal = list(board.legal_moves)
+            if not legal:
+                break
+            board.push(random.choice(legal))
+        picked = list(MovePicker(board, StaticExchangeEvaluator(), hash_move=random.choice(list(board.legal_moves) or [None])))
+        assert len(picked) == len(set(picked)) and set(picked) == set(board.legal_moves), board.fen()
+    print("Staged picker yields every legal move exactly once: OK")
@@ -0,0 +1,164 @@
+# engine_utilities/perft.py
+
+""" Perft and Move Generation Throughput for the Viper Chess Engine
+perft counts the leaf nodes of the legal move tree to a fixed depth; the counts are compared against the
+published values for a standard position set (start position, Kiwipete, the CPW test positions and
+en passant, castling, promotion and stalemate edge cases), so a wrong count means broken move generation.
+divide splits the count by root move to find the move where two generators disagree.
+The throughput benchmark times python-chess legal move generation, push/pop and board.copy() separately
+over the same trees, the baseline for deciding where copy elimination pays off in viper.py.
+Usage: python engine_utilities/perft.py [max_depth] [fen]   (with a fen, prints divide for that position)
+"""
+
+import sys
+import time
+import chess
+from typing import Dict, List, Optional, Tuple
+
+# (name, fen, {depth: leaf nodes}), counts from the Chess Programming Wiki perft results and Martin Sedlak's perft suite
+PERFT_POSITIONS: List[Tuple[str, str, Dict[int, int]]] = [
+    ("start", chess.STARTING_FEN, {1: 20, 2: 400, 3: 8902, 4: 197281}),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", {1: 48, 2: 2039, 3: 97862, 4: 4085603}),
+    ("position_3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", {1: 14, 2: 191, 3: 2812, 4: 43238, 5: 674624}),
+    ("position_4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", {1: 6, 2: 264, 3: 9467, 4: 422333}),
+    ("position_5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", {1: 44, 2: 1486, 3: 62379, 4: 2103487}),
+    ("position_6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10", {1: 46, 2: 2079, 3: 89890, 4: 3894594}),
+    ("ep_pinned_capture", "3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1", {1: 18, 2: 92, 3: 1670, 4: 10138, 5: 185429}),
+    ("ep_pinned_capture_2", "8/8/4k3/8/2p5/8/B2P2K1/8 w - - 0 1", {1: 13, 2: 102, 3: 1266, 4: 10276, 5: 135655, 6: 1015133}),
+    ("ep_capture_gives_check", "8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1", {1: 15, 2: 126, 3: 1928, 4: 13931, 5: 206379}),
+    ("short_castle_gives_check", "5k2/8/8/8/8/8/8/4K2R w K - 0 1", {1: 15, 2: 66, 3: 1198, 4: 6399, 5: 120330, 6: 661072}),
+    ("long_castle_gives_check", "3k4/8/8/8/8/8/8/R3K3 w Q - 0 1", {1: 16, 2: 71, 3: 1286, 4: 7418, 5: 141077, 6: 803711}),
+    ("castle_rights", "r3k2r/1b4bq/8/8/8/8/7B/R3K2R w KQkq - 0 1", {1: 26, 2: 1141, 3: 27826, 4: 1274206}),
+    ("castle_prevented", "r3k2r/8/3Q4/8/8/5q2/8/R3K2R b KQkq - 0 1", {1: 44, 2: 1494, 3: 50509, 4: 1720476}),
+    ("promote_out_of_check", "2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1", {1: 11, 2: 133, 3: 1442, 4: 19174, 5: 266199}),
+    ("discovered_check", "8/8/1P2K3/8/2n5/1q6/8/5k2 b - - 0 1", {1: 29, 2: 165, 3: 5160, 4: 31961, 5: 1004658}),
+    ("promote_gives_check", "4k3/1P6/8/8/8/8/K7/8 w - - 0 1", {1: 9, 2: 40, 3: 472, 4: 2661, 5: 38983, 6: 217342}),
+    ("underpromote_gives_check", "8/P1k5/K7/8/8/8/8/8 w - - 0 1", {1: 6, 2: 27, 3: 273, 4: 1329, 5: 18135, 6: 92683}),
+    ("self_stalemate", "K1k5/8/P7/8/8/8/8/8 w - - 0 1", {1: 2, 2: 6, 3: 13, 4: 63, 5: 382, 6: 2217}),
+    ("stalemate_and_checkmate", "8/k1P5/8/1K6/8/8/8/8 w - - 0 1", {1: 10, 2: 25, 3: 268, 4: 926, 5: 10857, 6: 43261, 7: 567584}),
+    ("stalemate_and_checkmate_2", "8/8/2k5/5q2/5n2/8/5K2/8 b - - 0 1", {1: 37, 2: 183, 3: 6559, 4: 23527}),
+]
+
+def perft(board: chess.Board, depth: int) -> int:
+    """Number of leaf nodes of the legal move tree depth plies below board (bulk counted at the last ply)."""
+    if depth <= 0:
+        return 1
+    if depth == 1:
+        return board.legal_moves.count()
+    nodes = 0
+    for move in board.legal_moves:
+        board.push(move)
+        nodes += perft(board, depth - 1)
+        board.pop()
+    return nodes
+
+def divide(board: chess.Board, depth: int) -> Dict[str, int]:
+    """perft split by root move, {uci: nodes}."""
+    counts = {}
+    for move in board.legal_moves:
+        board.push(move)
+        counts[move.uci()] = perft(board, depth - 1)
+        board.pop()
+    return counts
+
+def format_divide(counts: Dict[str, int]) -> str:
+    lines = [f"{uci}: {nodes}" for uci, nodes in sorted(counts.items())]
+    lines.append(f"\nMoves: {len(counts)}  Nodes: {sum(counts.values())}")
+    return "\n".join(lines)
+
+def run_suite(max_depth: int = 3, positions: Optional[List[Tuple[str, str, Dict[int, int]]]] = None) -> List[Dict]:
+    """Run perft on every position at each known depth up to max_depth, returns one result dict per (position, depth)."""
+    results = []
+    for name, fen, expected in positions or PERFT_POSITIONS:
+        board = chess.Board(fen)
+        for depth in sorted(d for d in expected if d <= max_depth):
+            start = time.perf_counter()
+            nodes = perft(board, depth)
+            elapsed = time.perf_counter() - start
+            results.append({'name': name, 'depth': depth, 'nodes': nodes, 'expected': expected[depth],
+                            'passed': nodes == expected[depth], 'time': elapsed, 'nps': nodes / max(elapsed, 1e-9)})
+    return results
+
+def _tree_positions(board: chess.Board, depth: int) -> List[chess.Board]:
+    """Every interior node of the tree to depth, as independent boards with the game's move stack kept."""
+    positions = [board.copy()]
+    frontier = [board.copy()]
+    for _ in range(depth - 1):
+        next_frontier = []
+        for node in frontier:
+            for move in node.legal_moves:
+                child = node.copy()
+                child.push(move)
+                next_frontier.append(child)
+        positions.extend(next_frontier)
+        frontier = next_frontier
+    return positions
+
+def measure_throughput(max_depth: int = 3, positions: Optional[List[Tuple[str, str, Dict[int, int]]]] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Time each operation on its own over the interior nodes of every position's tree to max_depth:
+    legal_moves (full generation per node), push/pop (one pair per legal move), copy() and copy(stack=False).
+    Returns {operation: {'count', 'time', 'per_second'}}.
+    """
+    boards = []
+    for _, fen, _ in positions or PERFT_POSITIONS:
+        boards.extend(_tree_positions(chess.Board(fen), max_depth))
+    move_lists = [list(board.legal_moves) for board in boards]
+
+    timings = {}
+    start = time.perf_counter()
+    generated = 0
+    for board in boards:
+        generated += len(list(board.legal_moves))
+    timings['legal_moves'] = (generated, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    pairs = 0
+    for board, moves in zip(boards, move_lists):
+        for move in moves:
+            board.push(move)
+            board.pop()
+        pairs += len(moves)
+    timings['push_pop'] = (pairs, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for board in boards:
+        board.copy()
+    timings['copy'] = (len(boards), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for board in boards:
+        board.copy(stack=False)
+    timings['copy_no_stack'] = (len(boards), time.perf_counter() - start)
+
+    return {operation: {'count': count, 'time': elapsed, 'per_second': count / max(elapsed, 1e-9)}
+            for operation, (count, elapsed) in timings.items()}
+
+def format_report(results: List[Dict], throughput: Optional[Dict[str, Dict[str, float]]] = None) -> str:
+    lines = [f"{'position':<28}{'depth':>6}{'nodes':>12}{'expected':>12}{'nps':>12}  result"]
+    for result in results:
+        lines.append(f"{result['name']:<28}{result['depth']:>6}{result['nodes']:>12}{result['expected']:>12}"
+                     f"{int(result['nps']):>12}  {'ok' if result['passed'] else 'FAIL'}")
+    total_nodes = sum(result['nodes'] for result in results)
+    total_time = sum(result['time'] for result in results)
+    failures = sum(not result['passed'] for result in results)
+    lines.append(f"Total: {total_nodes} nodes in {total_time:.2f}s ({int(total_nodes / max(total_time, 1e-9))} nps), {failures} failed")
+    if throughput:
+        lines.append("")
+        lines.append(f"{'operation':<16}{'count':>12}{'time (s)':>12}{'per second':>14}")
+        units = {'legal_moves': 'moves', 'push_pop': 'pairs', 'copy': 'copies', 'copy_no_stack': 'copies'}
+        for operation, stats in throughput.items():
+            lines.append(f"{operation:<16}{stats['count']:>12}{stats['time']:>12.3f}{int(stats['per_second']):>14} {units.get(operation, '')}")
+    return "\n".join(lines)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    if len(sys.argv) > 2:
+        board = chess.Board(" ".join(sys.argv[2:]))
+        print(format_divide(divide(board, max_depth)))
+    else:
+        results = run_suite(max_depth)
+        print(format_report(results, measure_throughput(min(max_depth, 3))))
+        sys.exit(1 if any(not result['passed'] for result in results) else 0)
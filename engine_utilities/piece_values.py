@@ -0,0 +1,60 @@
+# engine_utilities/piece_values.py
+
+""" Piece Value Tables for the Viper Chess Engine
+Flat per-piece-type value array and a 7x7 MVV-LVA matrix, built from a piece_type -> value dict so the hot
+paths index lists instead of looking values up in dicts.
+Every ViperEvaluationEngine, ViperScoringCalculation, static exchange evaluator and incremental evaluator
+builds its own tables from the piece values it was given, so scorers with other values (the Texel tuner,
+A/B tests) never change another engine's SEE, move ordering or material. PIECE_VALUES and MVV_LVA are the
+tables of DEFAULT_PIECE_VALUES, for code without an engine; they are never modified.
+"""
+
+import chess
+from typing import Dict, List, Tuple
+
+DEFAULT_PIECE_VALUES = {
+    chess.KING: 0.0,
+    chess.QUEEN: 9.0,
+    chess.ROOK: 5.0,
+    chess.BISHOP: 3.25,
+    chess.KNIGHT: 3.0,
+    chess.PAWN: 1.0
+}
+
+def piece_value_table(piece_values: Dict[int, float]) -> List[float]:
+    """
+    Flat table indexed by piece type, index 0 (no piece) is 0.0.
+    Raises ValueError unless every piece type has a value, a missing one would silently count as 0.
+    """
+    missing = [chess.piece_name(piece_type) for piece_type in chess.PIECE_TYPES if piece_type not in piece_values]
+    if missing:
+        raise ValueError(f"Piece values missing for: {', '.join(missing)}")
+    return [0.0] + [float(piece_values[piece_type]) for piece_type in chess.PIECE_TYPES]
+
+def mvv_lva_table(values: List[float]) -> List[List[float]]:
+    """MVV_LVA[victim_type][aggressor_type] for a flat value table: most valuable victim first, least valuable attacker as tiebreak."""
+    table = [[0.0] * 7 for _ in range(7)]
+    for victim_type in chess.PIECE_TYPES:
+        for aggressor_type in chess.PIECE_TYPES:
+            table[victim_type][aggressor_type] = (values[victim_type] * 10) - values[aggressor_type]
+    return table
+
+def build_piece_tables(piece_values: Dict[int, float]) -> Tuple[List[float], List[List[float]]]:
+    """(flat value table, MVV-LVA matrix) for a piece_type -> value dict."""
+    values = piece_value_table(piece_values)
+    return values, mvv_lva_table(values)
+
+# Tables of the default values
+PIECE_VALUES, MVV_LVA = build_piece_tables(DEFAULT_PIECE_VALUES)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    print("Piece values:", PIECE_VALUES)
+    print("QxP:", MVV_LVA[chess.PAWN][chess.QUEEN], " PxQ:", MVV_LVA[chess.QUEEN][chess.PAWN])
+    values, mvv_lva = build_piece_tables({**DEFAULT_PIECE_VALUES, chess.BISHOP: 3.5})
+    print("With a 3.5 bishop:", values, "| default table unchanged:", PIECE_VALUES)
+    try:
+        build_piece_tables({})
+    except ValueError as e:
+        print("Empty values rejected:", e)
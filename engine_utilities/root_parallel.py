@@ -0,0 +1,129 @@
+# engine_utilities/root_parallel.py
+
+""" Root-Move Parallel Search for the Viper Chess Engine
+Splits the ordered root moves over a persistent ProcessPoolExecutor. Every worker process builds its own
+ViperEvaluationEngine once (YAML loading, PST construction, transposition table) in the pool initializer and
+then runs _negamax_search on the root move subtrees it is given. The pool is module level, so it survives
+across moves, games and engine instances; it is only rebuilt when the requested worker count changes.
+Workers share a stop event with the main process (handed over by the pool initializer, like the Lazy SMP
+helpers' event), so a stopped search interrupts the running batch instead of waiting for it.
+"""
+
+import chess
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+_stop_event = None # Set by the main process to stop every running worker search, shared with the workers
+_worker_engine = None # The engine of the current worker process, set by _init_worker
+STOP_POLL_INTERVAL = 0.005 # Seconds between stop_callback checks while a batch runs
+
+def _init_worker(stop_event):
+    """Pool initializer: build the worker's engine once for the lifetime of the process."""
+    global _worker_engine, _stop_event
+    from viper import ViperEvaluationEngine # Imported here, viper imports this module
+
+    _stop_event = stop_event
+
+    _worker_engine = ViperEvaluationEngine(chess.Board(), chess.WHITE)
+    _worker_engine.logging_enabled = False
+    _worker_engine.show_thoughts = False
+
+def _search_root_move(root_fen: str, chess960: bool, moves: List[str], move_uci: str, player: chess.Color,
+                      ai_config: Dict[str, Any], depth: int, alpha: float, time_limit: float) -> Tuple[str, float, int, bool, List[str]]:
+    """
+    Search one root move with negamax in a worker. Returns (move_uci, score for the root player, nodes, stopped, pv),
+    stopped meaning the time limit or the stop event cut the search short, so the score is not reliable.
+    pv is the principal variation from the root, starting with move_uci.
+    """
+    engine = _worker_engine
+    board = chess.Board(root_fen, chess960=chess960)
+    for uci in moves:
+        board.push(chess.Move.from_uci(uci))
+
+    engine.current_player = player
+    engine.configure_for_side(board, ai_config) # ai_config is the main engine's already resolved config
+    engine.transposition_table.new_search()
+    engine.time_manager.start_timer(time_limit)
+    engine.nodes_searched = 0
+    engine._search_root_ply = len(board.move_stack) # The root move's reply line is collected at ply 1
+    engine.previous_pv = []
+
+    def should_stop():
+        return _stop_event.is_set() or engine.time_manager.should_stop()
+
+    engine._push_move(board, chess.Move.from_uci(move_uci))
+    score = -engine._negamax_search(board, max(depth - 1, 0), -float('inf'), -alpha, stop_callback=should_stop)
+    pv = [move_uci] + [move.uci() for move in engine.pv_table[1]]
+    return move_uci, score, engine.nodes_searched, should_stop(), pv
+
+def get_executor(workers: int) -> ProcessPoolExecutor:
+    """Return the persistent pool, starting it (or restarting it with a new size) when needed."""
+    global _executor, _executor_workers, _stop_event
+    if _executor is not None and _executor_workers == workers:
+        return _executor
+    shutdown()
+    context = multiprocessing.get_context("spawn")
+    _stop_event = context.Event()
+    _executor = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker, initargs=(_stop_event,))
+    _executor_workers = workers
+    return _executor
+
+def shutdown():
+    """Stop the persistent pool, if running."""
+    global _executor, _executor_workers
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+    _executor = None
+    _executor_workers = 0
+
+def search_root_moves(board: chess.Board, ordered_moves: List[chess.Move], player: chess.Color, ai_config: Dict[str, Any],
+                      depth: int, workers: int, time_limit: float = float('inf'), stop_callback=None) -> Tuple[Optional[chess.Move], float, int, bool]:
+    """
+    Search ordered_moves in batches of one move per worker. The best score of each batch becomes alpha for the
+    next one, so later (usually worse) moves are searched with a tighter window. stop_callback is polled while a
+    batch runs and sets the workers' stop event. A move whose search was stopped only becomes the best move if
+    no move finished; the result is complete only if every root move was searched and none was stopped.
+    Returns (best move, best score, total worker nodes, whether the search is complete, principal variation of the best move).
+    """
+    executor = get_executor(workers)
+    _stop_event.clear() # Every future of the previous search was collected, no worker is still running
+    root = board.root()
+    moves = [move.uci() for move in board.move_stack]
+    best_move = None
+    best_score = -float('inf')
+    best_pv: List[chess.Move] = []
+    total_nodes = 0
+    complete = True
+
+    for batch_start in range(0, len(ordered_moves), workers):
+        if stop_callback and stop_callback():
+            return best_move, best_score, total_nodes, False, best_pv
+        batch = ordered_moves[batch_start:batch_start + workers]
+        futures = [executor.submit(_search_root_move, root.fen(), board.chess960, moves, move.uci(), player,
+                                   ai_config, depth, best_score, time_limit) for move in batch]
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=STOP_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            if pending and stop_callback and stop_callback():
+                _stop_event.set()
+        # Merge in submission (move ordering) order, so equal scores keep the better ordered move
+        stopped_move = None
+        for future in futures:
+            move_uci, score, nodes, stopped, pv = future.result()
+            total_nodes += nodes
+            if stopped:
+                complete = False
+                stopped_move = stopped_move or move_uci
+            elif score > best_score:
+                best_score = score
+                best_move = chess.Move.from_uci(move_uci)
+                best_pv = [chess.Move.from_uci(uci) for uci in pv]
+        if not complete:
+            if best_move is None and stopped_move is not None:
+                best_move = chess.Move.from_uci(stopped_move) # Nothing finished, the first ordered move is the best guess
+            return best_move, best_score, total_nodes, False, best_pv
+
+    return best_move, best_score, total_nodes, complete, best_pv
@@ -0,0 +1,66 @@
+# engine_utilities/search_future.py
+
+""" Asynchronous Search Handles for the Viper Chess Engine
+ViperEvaluationEngine.search_async() runs a search in a worker thread and returns a SearchFuture right away.
+The future resolves to the best move; stop() sets its stop event, which the search polls at every node
+through the TimeManager, so a stopped search returns its best move so far within a few milliseconds.
+A thread is used rather than a process so the search keeps the engine's transposition table, history and
+killer tables warm between moves.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+class SearchFuture(Future):
+    """Future for a running search, with the stop event that interrupts it."""
+
+    def __init__(self, stop_event: Optional[threading.Event] = None):
+        super().__init__()
+        self.stop_event = stop_event if stop_event is not None else threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def stop(self):
+        """Ask the search to return its best move so far."""
+        self.stop_event.set()
+
+    def stopped(self) -> bool:
+        return self.stop_event.is_set()
+
+    def cancel(self) -> bool:
+        """Stop the search; like any Future, a search that is already running cannot be cancelled and still resolves."""
+        self.stop()
+        return super().cancel()
+
+def run_search_thread(future: SearchFuture, search: Callable[[], object], name: str = "viper-search") -> SearchFuture:
+    """Run search() in a daemon thread and resolve future with its result or exception."""
+    def worker():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(search())
+        except BaseException as e:
+            future.set_exception(e)
+
+    future.thread = threading.Thread(target=worker, name=name, daemon=True)
+    future.thread.start()
+    return future
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import time
+
+    def slow_search(stop_event):
+        for step in range(1000):
+            if stop_event.is_set():
+                return f"stopped at step {step}"
+            time.sleep(0.001)
+        return "finished"
+
+    future = SearchFuture()
+    run_search_thread(future, lambda: slow_search(future.stop_event))
+    time.sleep(0.05)
+    start = time.perf_counter()
+    future.stop()
+    print(future.result(), f"({(time.perf_counter() - start) * 1000:.1f} ms after stop)")
@@ -0,0 +1,114 @@
+# engine_utilities/static_exchange.py
+
+""" Static Exchange Evaluation (SEE) for the Viper Chess Engine
+Estimates the material outcome of the full capture sequence started by a move on its target square,
+using python-chess attack bitboards so x-ray attackers (batteries behind the first capturer) are included.
+Used to order captures and to prune clearly losing captures in quiescence search.
+"""
+
+import chess
+from typing import Dict, Optional
+from engine_utilities.piece_values import PIECE_VALUES, piece_value_table
+
+class StaticExchangeEvaluator:
+    """
+    Swap-list SEE. Both sides always recapture with their least valuable attacker and may stop
+    capturing whenever continuing would lose material. Pins are ignored, as is usual for SEE.
+    """
+
+    def __init__(self, piece_values: Optional[Dict[int, float]] = None):
+        if piece_values is None:
+            self.values = PIECE_VALUES # Default values, the table is never modified
+        else:
+            self.set_piece_values(piece_values)
+
+    def set_piece_values(self, piece_values: Dict[int, float]):
+        """Use a table of these piece values, indexed by piece type (index 0 unused). Every piece type needs a value."""
+        self.values = piece_value_table(piece_values)
+
+    @staticmethod
+    def attackers_mask(board: chess.Board, square: chess.Square, occupied: int) -> int:
+        """Attackers of both colors on square for the given occupancy, so removed pieces reveal x-ray attackers."""
+        rank_file_sliders = board.rooks | board.queens
+        diagonal_sliders = board.bishops | board.queens
+        attackers = (
+            (chess.BB_KNIGHT_ATTACKS[square] & board.knights) |
+            (chess.BB_KING_ATTACKS[square] & board.kings) |
+            (chess.BB_PAWN_ATTACKS[chess.WHITE][square] & board.pawns & board.occupied_co[chess.BLACK]) |
+            (chess.BB_PAWN_ATTACKS[chess.BLACK][square] & board.pawns & board.occupied_co[chess.WHITE]) |
+            (chess.BB_RANK_ATTACKS[square][chess.BB_RANK_MASKS[square] & occupied] & rank_file_sliders) |
+            (chess.BB_FILE_ATTACKS[square][chess.BB_FILE_MASKS[square] & occupied] & rank_file_sliders) |
+            (chess.BB_DIAG_ATTACKS[square][chess.BB_DIAG_MASKS[square] & occupied] & diagonal_sliders)
+        )
+        return attackers & occupied
+
+    def see(self, board: chess.Board, move: chess.Move) -> float:
+        """
+        Material balance for the side to move after the exchange sequence on move.to_square.
+        Positive means the capture wins material, 0 is an even trade, negative loses material.
+        """
+        values = self.values
+        from_square = move.from_square
+        to_square = move.to_square
+        moving_type = board.piece_type_at(from_square)
+        if moving_type is None:
+            return 0.0
+
+        occupied = board.occupied
+        if board.is_en_passant(move):
+            captured_value = values[chess.PAWN]
+            occupied ^= chess.BB_SQUARES[to_square - 8 if board.turn == chess.WHITE else to_square + 8]
+        else:
+            captured_type = board.piece_type_at(to_square)
+            captured_value = values[captured_type] if captured_type else 0.0
+
+        gain = [captured_value]
+        piece_on_square_value = values[moving_type]
+        if move.promotion:
+            gain[0] += values[move.promotion] - values[chess.PAWN]
+            piece_on_square_value = values[move.promotion]
+
+        occupied ^= chess.BB_SQUARES[from_square]
+        side = not board.turn
+
+        while True:
+            attackers = self.attackers_mask(board, to_square, occupied)
+            side_attackers = attackers & board.occupied_co[side]
+            if not side_attackers:
+                break
+
+            # Recapture with the least valuable attacker
+            for piece_type in chess.PIECE_TYPES:
+                piece_attackers = side_attackers & board.pieces_mask(piece_type, side)
+                if piece_attackers:
+                    break
+            if piece_type == chess.KING and attackers & board.occupied_co[not side]:
+                break # The king cannot recapture onto a defended square
+
+            gain.append(piece_on_square_value - gain[-1])
+            piece_on_square_value = values[piece_type]
+            occupied ^= piece_attackers & -piece_attackers # Remove the capturer (lowest set bit)
+            side = not side
+
+        # Negamax the swap list, each side may stop capturing when continuing loses material
+        for index in range(len(gain) - 1, 0, -1):
+            gain[index - 1] = -max(-gain[index - 1], gain[index])
+        return gain[0] + 0.0 # Normalise -0.0
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    evaluator = StaticExchangeEvaluator()
+
+    examples = [
+        # (FEN, move, description)
+        ("1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1", "e1e5", "Rxe5 wins an undefended pawn"),
+        ("1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1", "d3e5", "Nxe5 loses the knight for a pawn"),
+        ("4k3/8/8/3p4/4P3/8/8/4K3 w - - 0 1", "e4d5", "exd5 wins an undefended pawn"),
+        ("4k3/8/2p5/3p4/4P3/8/8/4K3 w - - 0 1", "e4d5", "exd5 cxd5 is an even pawn trade"),
+        ("3qk3/8/8/3r4/8/8/3R4/3QK3 w - - 0 1", "d2d5", "Rxd5, Qxd5 would lose the queen to the x-ray Qxd5"),
+    ]
+    for fen, uci, description in examples:
+        board = chess.Board(fen)
+        move = chess.Move.from_uci(uci)
+        print(f"{description}: SEE = {evaluator.see(board, move):+.2f}")
@@ -0,0 +1,337 @@
+# engine_utilities/texel_tuner.py
+
+""" Texel Tuning for the Viper Chess Engine
+Fits the evaluation rule weights of a viper.yaml ruleset to game results.
+Quiet positions (side to move not in check, no winning capture available, no mate in one for either side,
+the move played was not a capture or promotion) are extracted from the games/ PGN archive and from the MetricsStore move_metrics table, labeled
+with the game result (1.0 / 0.5 / 0.0 for White). Every evaluation term is linear in its rule weights, so each
+position is featurized once into a row of per-weight raw values (the White-relative score with only that weight
+set to 1, computed with ViperScoringCalculation.calculate_scores_batch). The matrix is cached on disk and the
+weights are fit on it with a vectorized Adam optimizer minimizing the squared error between the result and
+sigmoid(K * score), K being fit first on the starting weights.
+Material and the piece-square tables anchor the score scale and are not tuned; the terminal scores (checkmate,
+draw, stalemate) are copied unchanged, they never apply to quiet positions: checkmate_bonus also scores mate in one
+threats, which is why positions with one are not quiet. The output is a new ruleset block.
+"""
+
+import os
+import glob
+import hashlib
+import sqlite3
+import chess
+import chess.pgn
+import numpy as np
+import yaml
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from engine_utilities.compiled_ruleset import CompiledRuleset, RULE_DEFAULTS
+from engine_utilities.piece_square_tables import PieceSquareTables
+from engine_utilities.piece_values import DEFAULT_PIECE_VALUES, PIECE_VALUES
+from engine_utilities.static_exchange import StaticExchangeEvaluator
+from engine_utilities.viper_scoring_calculation import ViperScoringCalculation
+
+# Rule weights not fit by the tuner: the score anchor and the terminal scores
+FIXED_RULES = ('material_weight', 'checkmate_bonus', 'draw_penalty', 'stalemate_penalty')
+TUNABLE_RULES = tuple(rule_key for rule_key in RULE_DEFAULTS if rule_key not in FIXED_RULES)
+RESULT_VALUES = {'1-0': 1.0, '0-1': 0.0, '1/2-1/2': 0.5}
+
+def endgame_factor(board: chess.Board) -> float:
+    """Game phase factor as used by ViperEvaluationEngine with game_phase_awareness enabled."""
+    total_material = 0
+    for piece_type in (chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN):
+        total_material += chess.popcount(board.pieces_mask(piece_type, chess.WHITE) | board.pieces_mask(piece_type, chess.BLACK)) * PIECE_VALUES[piece_type]
+    queen_rook = PIECE_VALUES[chess.QUEEN] + PIECE_VALUES[chess.ROOK]
+    two_rooks = PIECE_VALUES[chess.ROOK] * 2
+    knight_bishop = PIECE_VALUES[chess.KNIGHT] + PIECE_VALUES[chess.BISHOP]
+    if total_material >= (queen_rook * 2) + (knight_bishop * 2):
+        return 0.0
+    if two_rooks + knight_bishop * 2 > total_material > knight_bishop * 2:
+        return 0.5
+    if total_material <= knight_bishop * 2:
+        return 1.0
+    return 0.0
+
+class TexelTuner:
+    """
+    Extracts labeled quiet positions, featurizes them into a cached matrix and fits the rule weights of base_ruleset.
+    The scale constant K and the weights are fit on the same data; hold out data yourself if you need a validation set.
+    """
+
+    def __init__(self, viper_yaml_path: str = "viper.yaml", base_ruleset: str = "default_evaluation",
+                 cache_dir: str = "training/texel_tuning", skip_plies: int = 8, game_phase_awareness: bool = True):
+        with open(viper_yaml_path) as f:
+            self.viper_yaml = yaml.safe_load(f)
+        self.base_ruleset = base_ruleset
+        self.base_rules = dict(self.viper_yaml.get(base_ruleset, {}) or {})
+        self.cache_dir = cache_dir
+        self.skip_plies = skip_plies # Opening plies skipped, they mostly come from the book
+        self.game_phase_awareness = game_phase_awareness
+        self.see = StaticExchangeEvaluator(DEFAULT_PIECE_VALUES)
+        self.scoring = ViperScoringCalculation(viper_yaml_config={'rulesets': {base_ruleset: self.base_rules},
+                                                                  'performance': {'pawn_hash_size': 0}},
+                                               ai_config={'ruleset': base_ruleset}, piece_values=DEFAULT_PIECE_VALUES,
+                                               pst=PieceSquareTables())
+        self.positions: List[Tuple[str, float]] = []
+        self.features: Optional[np.ndarray] = None
+        self.results: Optional[np.ndarray] = None
+        self.k = 1.0
+
+    # =================================
+    # ===== POSITION EXTRACTION =======
+
+    def is_quiet(self, board: chess.Board, move: Optional[chess.Move] = None) -> bool:
+        """
+        True if board can be scored statically: not in check, no winning capture, no mate in one for either side
+        (the checkmate_bonus threat term would dwarf the rest of the score), and move (if known) is quiet.
+        """
+        if board.is_check() or board.is_game_over(claim_draw=False):
+            return False
+        if move is not None and (board.is_capture(move) or move.promotion):
+            return False
+        if any(self.see.see(board, capture) > 0 for capture in board.generate_legal_captures()):
+            return False
+        if self._has_mate_in_one(board):
+            return False
+        board.push(chess.Move.null()) # The side not to move, as _checkmate_threats sees it
+        try:
+            return not self._has_mate_in_one(board)
+        finally:
+            board.pop()
+
+    @staticmethod
+    def _has_mate_in_one(board: chess.Board) -> bool:
+        for move in board.legal_moves:
+            if board.gives_check(move):
+                board.push(move)
+                checkmate = board.is_checkmate()
+                board.pop()
+                if checkmate:
+                    return True
+        return False
+
+    def _game_positions(self, game: chess.pgn.Game, result: float) -> List[Tuple[str, float]]:
+        positions = []
+        board = game.board()
+        for ply, move in enumerate(game.mainline_moves()):
+            if ply >= self.skip_plies and self.is_quiet(board, move):
+                positions.append((board.fen(), result))
+            board.push(move)
+        return positions
+
+    def load_pgn_positions(self, games_dir: str = "games") -> int:
+        """Add the quiet positions of every finished game in the PGN archive. Returns the number added."""
+        added = 0
+        for pgn_file in sorted(glob.glob(os.path.join(games_dir, "*.pgn"))):
+            with open(pgn_file, encoding='utf-8') as f:
+                while True:
+                    game = chess.pgn.read_game(f)
+                    if game is None:
+                        break
+                    result = RESULT_VALUES.get(game.headers.get('Result', '*'))
+                    if result is None:
+                        continue
+                    positions = self._game_positions(game, result)
+                    self.positions.extend(positions)
+                    added += len(positions)
+        return added
+
+    def load_metrics_positions(self, db_path: str = "metrics/chess_metrics.db") -> int:
+        """Add the quiet positions of the move_metrics table, labeled with the game_results winner. Returns the number added."""
+        if not os.path.exists(db_path):
+            return 0
+        connection = sqlite3.connect(db_path)
+        try:
+            rows = connection.execute('''
+                SELECT m.fen_before, m.move_uci, g.winner
+                FROM move_metrics m JOIN game_results g ON m.game_id = g.game_id
+                WHERE m.fen_before IS NOT NULL AND m.move_number > ?
+            ''', (self.skip_plies // 2,)).fetchall()
+        except sqlite3.Error:
+            return 0
+        finally:
+            connection.close()
+        added = 0
+        for fen, move_uci, winner in rows:
+            result = RESULT_VALUES.get(winner)
+            if result is None:
+                continue
+            try:
+                board = chess.Board(fen)
+                move = chess.Move.from_uci(move_uci) if move_uci else None
+            except ValueError:
+                continue
+            if move is not None and move not in board.legal_moves:
+                move = None
+            if self.is_quiet(board, move):
+                self.positions.append((fen, result))
+                added += 1
+        return added
+
+    def deduplicate(self):
+        """Keep one entry per (position, result), games sharing an opening would otherwise dominate."""
+        self.positions = list(dict.fromkeys(self.positions))
+
+    # =================================
+    # ===== FEATURIZATION =============
+
+    def feature_names(self) -> Tuple[str, ...]:
+        """Matrix columns: the fixed base score (material and PST), then one column per tunable rule."""
+        return ('base',) + TUNABLE_RULES
+
+    def engine_pst_settings(self) -> Tuple[bool, float]:
+        """
+        PST enabled flag and weight as ViperEvaluationEngine._ensure_ai_config resolves them from the viper block:
+        only a pst mapping is read, 'pst: true' (or false) becomes enabled with weight 1.0 and pst_weight is not used.
+        """
+        pst_config = self.viper_yaml.get('viper', {}).get('pst')
+        if not isinstance(pst_config, dict):
+            pst_config = {}
+        return bool(pst_config.get('enabled', True)), float(pst_config.get('weight', 1.0))
+
+    def _unit_rules(self, rule_key: Optional[str], pst: bool = False) -> CompiledRuleset:
+        """Ruleset with rule_key at 1 and every other weight at 0 (material too unless rule_key is material_weight)."""
+        backend = self.base_rules.get('evaluation_backend', 'bitboard')
+        def rule_value(key, default):
+            if key == 'evaluation_backend':
+                return backend
+            return 1.0 if key == rule_key else 0.0
+        return CompiledRuleset(f"unit_{rule_key}", rule_value, 1.0, pst, 1.0)
+
+    def featurize(self, use_cache: bool = True) -> np.ndarray:
+        """
+        Build the (positions, features) matrix of White-relative raw term values, loading it from the cache
+        when the same positions were featurized before. The base column uses the base ruleset's material weight and pst.
+        """
+        pst_enabled, pst_weight = self.engine_pst_settings()
+        material_weight = self.base_rules.get('material_weight', RULE_DEFAULTS['material_weight'])
+
+        digest = hashlib.sha1()
+        for fen, result in self.positions:
+            digest.update(f"{fen}|{result}\n".encode())
+        digest.update(repr((self.feature_names(), self.game_phase_awareness, pst_enabled, pst_weight, material_weight)).encode())
+        cache_path = os.path.join(self.cache_dir, f"texel_features_{digest.hexdigest()[:16]}.npz")
+        if use_cache and os.path.exists(cache_path):
+            cached = np.load(cache_path)
+            self.features, self.results = cached['features'], cached['results']
+            return self.features
+
+        boards = [chess.Board(fen) for fen, _ in self.positions]
+        factors = np.array([endgame_factor(board) if self.game_phase_awareness else 0.0 for board in boards])
+        columns = []
+        for column in self.feature_names():
+            if column == 'base':
+                material = self._score_white_relative(self._unit_rules('material_weight'), boards, factors)
+                pst = self._score_white_relative(self._unit_rules(None, pst=True), boards, factors) if pst_enabled else 0.0
+                columns.append(material * material_weight + pst * pst_weight)
+            else:
+                columns.append(self._score_white_relative(self._unit_rules(column), boards, factors))
+        self.features = np.column_stack(columns) if boards else np.zeros((0, len(columns)))
+        self.results = np.array([result for _, result in self.positions], dtype=np.float64)
+
+        if use_cache:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            np.savez_compressed(cache_path, features=self.features, results=self.results)
+        return self.features
+
+    def _score_white_relative(self, rules: CompiledRuleset, boards: Sequence[chess.Board], factors: np.ndarray) -> np.ndarray:
+        self.scoring.apply_rules(rules)
+        return (self.scoring.calculate_scores_batch(boards, chess.WHITE, factors)
+                - self.scoring.calculate_scores_batch(boards, chess.BLACK, factors))
+
+    # =================================
+    # ===== OPTIMIZATION ==============
+
+    def initial_weights(self) -> np.ndarray:
+        """Starting weights: 1 for the base column, then the base ruleset values."""
+        return np.array([1.0] + [float(self.base_rules.get(rule_key, RULE_DEFAULTS[rule_key]) or 0.0) for rule_key in TUNABLE_RULES])
+
+    def error(self, weights: np.ndarray, k: Optional[float] = None) -> float:
+        """Mean squared error between the results and sigmoid(k * score)."""
+        k = self.k if k is None else k
+        predictions = 1.0 / (1.0 + np.exp(-k * (self.features @ weights)))
+        return float(np.mean((self.results - predictions) ** 2))
+
+    def fit_k(self, weights: np.ndarray, low: float = 1e-3, high: float = 10.0, iterations: int = 60) -> float:
+        """Golden-section search for the scale constant K that minimizes the error of weights."""
+        ratio = (np.sqrt(5.0) - 1.0) / 2.0
+        a, b = low, high
+        c, d = b - ratio * (b - a), a + ratio * (b - a)
+        for _ in range(iterations):
+            if self.error(weights, c) < self.error(weights, d):
+                b = d
+            else:
+                a = c
+            c, d = b - ratio * (b - a), a + ratio * (b - a)
+        self.k = (a + b) / 2.0
+        return self.k
+
+    def tune(self, iterations: int = 2000, learning_rate: float = 0.01, l2: float = 0.0, verbose: bool = False) -> Dict[str, float]:
+        """
+        Fit K, then the tunable weights with Adam on the full matrix. The base column weight stays at 1.
+        Returns the tuned weights by rule key.
+        """
+        if self.features is None:
+            self.featurize()
+        if len(self.results) == 0:
+            raise ValueError("No positions to tune on, load positions first")
+        weights = self.initial_weights()
+        self.fit_k(weights)
+
+        # Normalize the columns so one learning rate suits weights of very different scales
+        scale = np.abs(self.features).max(axis=0)
+        scale[scale == 0] = 1.0
+        x = self.features / scale
+        theta = weights * scale
+        trainable = np.ones_like(theta, dtype=bool)
+        trainable[0] = False
+        trainable[np.abs(self.features).max(axis=0) == 0] = False # Terms that never fire keep their value
+        m = np.zeros_like(theta)
+        v = np.zeros_like(theta)
+        beta1, beta2, epsilon = 0.9, 0.999, 1e-8
+        count = len(self.results)
+        for step in range(1, iterations + 1):
+            predictions = 1.0 / (1.0 + np.exp(-self.k * (x @ theta)))
+            residual = (predictions - self.results) * predictions * (1.0 - predictions)
+            gradient = (2.0 * self.k / count) * (x.T @ residual) + 2.0 * l2 * theta
+            gradient[~trainable] = 0.0
+            m = beta1 * m + (1 - beta1) * gradient
+            v = beta2 * v + (1 - beta2) * gradient ** 2
+            theta -= learning_rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + epsilon)
+            if verbose and (step % 200 == 0 or step == iterations):
+                print(f"step {step}: error {self.error(theta / scale):.6f}")
+        weights = theta / scale
+        return {rule_key: float(weight) for rule_key, weight in zip(TUNABLE_RULES, weights[1:])}
+
+    def ruleset_block(self, tuned: Dict[str, float], name: str = "tuned_evaluation") -> Dict[str, Dict]:
+        """The base ruleset with the tuned weights applied, as a {name: rules} viper.yaml block."""
+        rules = dict(self.base_rules)
+        for rule_key, weight in tuned.items():
+            rules[rule_key] = round(weight, 4)
+        return {name: rules}
+
+    def save_ruleset(self, tuned: Dict[str, float], name: str = "tuned_evaluation", output_path: Optional[str] = None) -> str:
+        """Write the tuned ruleset block to a yaml file for pasting into viper.yaml. Returns the file path."""
+        if output_path is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            output_path = os.path.join(self.cache_dir, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.yaml")
+        with open(output_path, 'w') as f:
+            f.write(f"# Texel-tuned from {self.base_ruleset} on {len(self.results)} positions, K = {self.k:.4f}\n")
+            yaml.safe_dump(self.ruleset_block(tuned, name), f, sort_keys=False)
+        return output_path
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import time
+
+    tuner = TexelTuner(base_ruleset="default_evaluation")
+    print("PGN positions:", tuner.load_pgn_positions("games"))
+    print("Metrics positions:", tuner.load_metrics_positions("metrics/chess_metrics.db"))
+    tuner.deduplicate()
+    start = time.perf_counter()
+    tuner.featurize()
+    print(f"Featurized {tuner.features.shape[0]} positions x {tuner.features.shape[1]} features in {time.perf_counter() - start:.2f}s")
+    start_error = tuner.error(tuner.initial_weights(), tuner.fit_k(tuner.initial_weights()))
+    tuned = tuner.tune(iterations=1000, verbose=True)
+    print(f"K = {tuner.k:.4f}, error {start_error:.6f} -> {tuner.error(np.array([1.0] + list(tuned.values()))):.6f}")
+    print("Tuned ruleset written to", tuner.save_ruleset(tuned))
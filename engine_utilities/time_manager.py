@@ -15,6 +15,10 @@ class TimeManager:
         self.allocated_time = None
         self.max_time = None
         self.emergency_time = None
+        self.stop_requested = False  # Set by request_stop(), e.g. on a UCI 'stop'
+        self.node_limit = None       # Optional node budget, checked through node_counter
+        self.node_counter = None
+        self.stop_callback = None    # External stop signal, e.g. the stop event of an asynchronous search
 
     def allocate_time(self, time_control: Dict[str, Any], board) -> float:
         """
@@ -157,6 +161,35 @@ class TimeManager:
         self.allocated_time = allocated_time
         self.max_time = allocated_time * 1.2  # 20% buffer for critical positions
         self.emergency_time = allocated_time * 0.1  # Emergency stop time
+        self.stop_requested = False
+
+    def ponder_hit(self, allocated_time: float):
+        """
+        Give a search that was pondering without a time limit allocated_time seconds,
+        counted from the start of the search so the pondering time is credited
+        """
+        start_time = self.start_time if self.start_time is not None else time.time()
+        self.start_timer(allocated_time)
+        self.start_time = start_time
+
+    def request_stop(self):
+        """Make should_stop() return True until the next start_timer()"""
+        self.stop_requested = True
+
+    def set_stop_callback(self, stop_callback=None):
+        """Make should_stop() return True whenever stop_callback() does, None removes it"""
+        self.stop_callback = stop_callback
+
+    def set_node_limit(self, node_limit: Optional[int], node_counter=None):
+        """
+        Stop the search once node_counter() reaches node_limit (UCI 'go nodes')
+
+        Args:
+            node_limit: Maximum nodes to search, None for no limit
+            node_counter: Callable returning the nodes searched so far
+        """
+        self.node_limit = node_limit
+        self.node_counter = node_counter if node_limit is not None else None
 
     def should_stop(self, depth: int = 0, nodes: int = 0) -> bool:
         """
@@ -169,6 +202,12 @@ class TimeManager:
         Returns:
             True if search should stop
         """
+        if self.stop_requested or (self.stop_callback is not None and self.stop_callback()):
+            return True
+
+        if self.node_counter is not None and self.node_counter() >= self.node_limit:
+            return True
+
         if self.start_time is None or self.allocated_time is None:
             return False
 
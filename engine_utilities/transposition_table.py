@@ -0,0 +1,220 @@
+# engine_utilities/transposition_table.py
+
+""" Transposition Table for the Viper Chess Engine
+A fixed-size, preallocated hash table backed by parallel typed arrays instead of per-entry dicts.
+The table is sized in MB from the performance.hash_size setting, so its memory use is predictable.
+Each bucket holds two slots: a depth-preferred slot and an always-replace slot.
+SharedTranspositionTable lays the same arrays out in a multiprocessing.shared_memory block for Lazy SMP.
+"""
+
+import chess
+from array import array
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+# Bound types for stored scores, 0 marks an empty slot
+BOUND_NONE = 0
+BOUND_EXACT = 1   # Score is the exact value of the position
+BOUND_LOWER = 2   # Search failed high, true value is >= score
+BOUND_UPPER = 3   # Search failed low, true value is <= score
+
+SLOTS_PER_BUCKET = 2
+
+class TranspositionTable:
+    """
+    Slot-indexed transposition table storing key, move, depth, score, bound and age per entry.
+    Moves are packed as from_square | to_square << 6 | promotion << 12, with 0 meaning no move.
+    """
+
+    def __init__(self, size_mb: float = 64):
+        self.size_mb = size_mb
+        self.age = 0
+        self.resize(size_mb)
+
+    @staticmethod
+    def entry_size() -> int:
+        """Bytes used by a single entry across all parallel arrays."""
+        return sum(array(typecode).itemsize for typecode in ('Q', 'H', 'h', 'd', 'B', 'B'))
+
+    def resize(self, size_mb: float):
+        """Reallocate the table for the given size in MB (rounded down to a power of two buckets)."""
+        self.size_mb = size_mb
+        max_entries = max(SLOTS_PER_BUCKET, int(size_mb * 1024 * 1024) // self.entry_size())
+        bucket_count = 1
+        while bucket_count * 2 * SLOTS_PER_BUCKET <= max_entries:
+            bucket_count *= 2
+        self.bucket_mask = bucket_count - 1
+        self.entry_count = bucket_count * SLOTS_PER_BUCKET
+        self._allocate()
+
+    def _allocate(self):
+        self.clear()
+
+    def clear(self):
+        """Empty the table, keeping its size."""
+        n = self.entry_count
+        self.keys = array('Q', bytes(8 * n))
+        self.moves = array('H', bytes(2 * n))
+        self.depths = array('h', bytes(2 * n))
+        self.scores = array('d', bytes(8 * n))
+        self.bounds = array('B', bytes(n))
+        self.ages = array('B', bytes(n))
+        self.age = 0
+
+    def new_search(self):
+        """Advance the table age so entries from earlier searches are replaced first."""
+        self.age = (self.age + 1) & 0xFF
+
+    @staticmethod
+    def encode_move(move: Optional[chess.Move]) -> int:
+        if not move:
+            return 0
+        return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+    @staticmethod
+    def decode_move(packed: int) -> Optional[chess.Move]:
+        if packed == 0:
+            return None
+        return chess.Move(packed & 0x3F, (packed >> 6) & 0x3F, (packed >> 12) or None)
+
+    def _find_slot(self, key: int) -> int:
+        index = (key & self.bucket_mask) * SLOTS_PER_BUCKET
+        if self.bounds[index] != BOUND_NONE and self.keys[index] == key:
+            return index
+        if self.bounds[index + 1] != BOUND_NONE and self.keys[index + 1] == key:
+            return index + 1
+        return -1
+
+    def probe(self, key: int) -> Optional[Tuple[Optional[chess.Move], int, float, int]]:
+        """Return (move, depth, score, bound) stored for key, or None if not present."""
+        index = self._find_slot(key)
+        if index < 0:
+            return None
+        return self.decode_move(self.moves[index]), self.depths[index], self.scores[index], self.bounds[index]
+
+    def store(self, key: int, move: Optional[chess.Move], depth: int, score: float, bound: int):
+        """Store an entry using the depth-preferred / always-replace bucket policy."""
+        index = (key & self.bucket_mask) * SLOTS_PER_BUCKET
+        packed_move = self.encode_move(move)
+        existing = self._find_slot(key)
+        if not packed_move and existing >= 0:
+            packed_move = self.moves[existing] # Keep the previous best move when none was found this time
+
+        if existing == index:
+            # Same position in the depth-preferred slot, only overwrite with equal or better information
+            if depth < self.depths[index] and bound != BOUND_EXACT and self.ages[index] == self.age:
+                self.moves[index] = packed_move
+                return
+            slot = index
+        elif self.bounds[index] == BOUND_NONE or depth >= self.depths[index] or self.ages[index] != self.age:
+            slot = index
+            if self.bounds[index] != BOUND_NONE:
+                # Demote the displaced depth-preferred entry into the always-replace slot
+                self._copy_slot(index, index + 1)
+            elif existing == index + 1:
+                self.bounds[index + 1] = BOUND_NONE # Drop the stale copy of this position
+        else:
+            slot = index + 1 # Always-replace slot
+
+        self.keys[slot] = key
+        self.moves[slot] = packed_move
+        self.depths[slot] = depth
+        self.scores[slot] = score
+        self.bounds[slot] = bound
+        self.ages[slot] = self.age
+
+    def _copy_slot(self, source: int, target: int):
+        self.keys[target] = self.keys[source]
+        self.moves[target] = self.moves[source]
+        self.depths[target] = self.depths[source]
+        self.scores[target] = self.scores[source]
+        self.bounds[target] = self.bounds[source]
+        self.ages[target] = self.ages[source]
+
+    def hashfull(self) -> int:
+        """Permille of the first 1000 entries in use by the current search (UCI style estimate)."""
+        sample = min(1000, self.entry_count)
+        used = sum(1 for i in range(sample) if self.bounds[i] != BOUND_NONE and self.ages[i] == self.age)
+        return used * 1000 // sample
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """
+    Transposition table whose arrays live in one named shared memory block, so Lazy SMP worker
+    processes read and write the same entries. The process that creates the block owns it and unlinks
+    it on close(); workers attach by name. Entries are written without locks, a torn entry is rejected
+    by the key comparison or by the engine's pseudo-legal check on the stored move.
+    """
+
+    # (attribute, typecode, item size), widest first so every view stays aligned
+    LAYOUT = (('keys', 'Q', 8), ('scores', 'd', 8), ('moves', 'H', 2), ('depths', 'h', 2), ('bounds', 'B', 1), ('ages', 'B', 1))
+
+    def __init__(self, size_mb: float = 64, name: Optional[str] = None):
+        self.shm = None
+        self.owner = name is None
+        self.name = name
+        super().__init__(size_mb)
+
+    def _allocate(self):
+        self._release()
+        self.nbytes = self.entry_count * self.entry_size()
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=self.nbytes)
+            self.name = self.shm.name
+        else:
+            self.shm = shared_memory.SharedMemory(name=self.name)
+
+        offset = 0
+        for attribute, typecode, item_size in self.LAYOUT:
+            length = self.entry_count * item_size
+            setattr(self, attribute, self.shm.buf[offset:offset + length].cast(typecode))
+            offset += length
+        if self.owner:
+            self.clear()
+
+    def clear(self):
+        """Empty the shared table in place, every attached process sees the cleared entries."""
+        self.shm.buf[:self.nbytes] = bytes(self.nbytes)
+        self.age = 0
+
+    def _release(self):
+        if self.shm is None:
+            return
+        for attribute, _, _ in self.LAYOUT:
+            getattr(self, attribute).release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+        self.shm = None
+
+    def close(self):
+        """Detach from the shared block, and free it if this process created it."""
+        self._release()
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import chess.polyglot
+
+    table = TranspositionTable(size_mb=1)
+    print(f"Entry size: {table.entry_size()} bytes, entries: {table.entry_count}")
+
+    board = chess.Board()
+    key = chess.polyglot.zobrist_hash(board)
+    table.store(key, chess.Move.from_uci("e2e4"), 4, 0.35, BOUND_EXACT)
+    print("Probe start position:", table.probe(key))
+
+    # A shallower result for the same position must not overwrite the deeper one
+    table.store(key, chess.Move.from_uci("d2d4"), 2, 0.10, BOUND_LOWER)
+    print("Probe after shallower store:", table.probe(key))
+
+    promotion = chess.Move.from_uci("a7a8q")
+    assert table.decode_move(table.encode_move(promotion)) == promotion
+    print("Promotion move packing round trip: OK")
+
+    shared = SharedTranspositionTable(size_mb=1)
+    attached = SharedTranspositionTable(size_mb=1, name=shared.name)
+    shared.store(key, chess.Move.from_uci("e2e4"), 5, 0.40, BOUND_EXACT)
+    print("Probe through a second handle on the shared block:", attached.probe(key))
+    attached.close()
+    shared.close()
@@ -11,8 +11,16 @@ import yaml # Keep for config loading if needed directly, though passed via init
 import random
 import logging
 import os
+import time
 import threading # TODO enable parallel score calculations via threading
 from engine_utilities.piece_square_tables import PieceSquareTables # Need this for PST evaluation
+from engine_utilities.piece_values import piece_value_table
+from engine_utilities.incremental_evaluation import IncrementalEvaluator
+from engine_utilities.eval_cache import EvalCache
+from engine_utilities.bitboard_evaluation import BitboardEvaluation
+from engine_utilities.compiled_ruleset import CompiledRuleset
+from engine_utilities.eval_profiler import EvalProfiler
+from typing import Optional
 from engine_utilities.time_manager import TimeManager # May not be directly needed here, but kept for context if sub-fns rely on it
 from engine_utilities.opening_book import OpeningBook # Not directly needed here, but kept for context
 
@@ -50,6 +58,7 @@ class ViperScoringCalculation:
         self.viper_config = viper_yaml_config 
         self.ai_config = ai_config # This is the resolved AI config for the current player/search
         self.piece_values = piece_values
+        self.piece_value_table = piece_value_table(piece_values) # This scorer's own flat table, see set_piece_values()
         self.pst = pst
 
         # Ruleset and scoring modifier are determined by the resolved ai_config
@@ -60,6 +69,14 @@ class ViperScoringCalculation:
         self.pst_enabled = self.ai_config.get('pst', {}).get('enabled', True)
         self.pst_weight = self.ai_config.get('pst', {}).get('weight', 1.0)
 
+        # Pawn hash table: the pawn terms only depend on the two pawn bitboards, which repeat far more often than positions
+        self.pawn_hash = EvalCache(max_size=self.viper_config.get('performance', {}).get('pawn_hash_size', 16384))
+        # Mask and popcount implementations of the square-scanning terms, used when the ruleset's evaluation_backend is 'bitboard'
+        self.bitboard_terms = BitboardEvaluation(self)
+        self.batch_evaluation = None # Created on the first calculate_scores_batch() call
+        # Opt-in per-term timing and contribution stats, None keeps calculate_score on its fast path
+        self.profiler = EvalProfiler() if self.viper_config.get('performance', {}).get('profile_eval_terms', False) else None
+
         # Logging setup - use global monitoring settings from ai_config if available, else viper_config
         # Assuming ai_config might carry 'monitoring' settings from chess_game.yaml if relevant here
         # For simplicity, let's assume viper_config's debug/logging is primary for scoring module's own logs
@@ -87,6 +104,10 @@ class ViperScoringCalculation:
             self.logger.debug(f"Using ruleset: '{self.ruleset_name}'. Rules: {self.current_ruleset}")
             self.logger.debug(f"PST Enabled: {self.pst_enabled}, PST Weight: {self.pst_weight}")
 
+        # Rulesets compiled by compile_ruleset(), keyed by CompiledRuleset.signature()
+        self._compiled_rulesets = {}
+        self.compile_ruleset()
+
     def _get_rule_value(self, rule_key: str, default_value: float = 0.0) -> float:
         """Helper to safely get a rule value from the current ruleset."""
         # Fallback to viper_config's top-level 'default_evaluation' if key not in current_ruleset
@@ -102,89 +123,125 @@ class ViperScoringCalculation:
                  self.logger.debug(f"Rule '{rule_key}' not in ruleset '{self.ruleset_name}' or default_evaluation, using hardcoded default: {default_value}")
         return value
 
-    # Renamed from _calculate_score to calculate_score to be the public API
-    def calculate_score(self, board: chess.Board, color: chess.Color, endgame_factor: float = 0.0) -> float:
+    def set_piece_values(self, piece_values: dict):
+        """Score material with new piece values. Pawn hash entries do not depend on them and stay valid."""
+        self.piece_values = piece_values
+        self.piece_value_table = piece_value_table(piece_values)
+
+    def compile_ruleset(self):
         """
-        Calculates the position evaluation score for a given board and color,
-        applying dynamic ruleset settings and endgame awareness.
-        This is the main public method for this class.
+        Resolve the ruleset, scoring modifier and PST settings from ai_config into a CompiledRuleset and bind the
+        terms with a non-zero weight. Called once per configuration (ViperEvaluationEngine.configure_for_side),
+        not per evaluation. Compiled rulesets are reused for the same settings, so pawn hash entries stay valid.
         """
-        score = 0.0
-
-        # Ensure the current ruleset is up-to-date based on ai_config (in case it changed)
-        # This is important if the same ViperScoringCalculation instance is used across different contexts
-        # where ai_config might change (e.g. switching sides or re-configuring mid-game if that's a feature)
-        current_ruleset_name_from_ai_config = self.ai_config.get('ruleset', self.viper_config.get('ruleset', 'default_evaluation'))
-        if self.ruleset_name != current_ruleset_name_from_ai_config:
-            self.ruleset_name = current_ruleset_name_from_ai_config
-            if self.ruleset_name not in self.rulesets:
-                self.logger.warning(f"Ruleset '{self.ruleset_name}' (from updated ai_config) not found. Using empty ruleset.")
-                self.current_ruleset = {}
-            else:
-                self.current_ruleset = self.rulesets.get(self.ruleset_name, {})
-            if self.logging_enabled:
-                self.logger.debug(f"Switched to ruleset: '{self.ruleset_name}'. Rules: {self.current_ruleset}")
-        
-        # Update other relevant parameters from ai_config
+        self.ruleset_name = self.ai_config.get('ruleset', self.viper_config.get('ruleset', 'default_evaluation'))
+        if self.ruleset_name not in self.rulesets:
+            self.logger.warning(f"Ruleset '{self.ruleset_name}' (from updated ai_config) not found. Using empty ruleset.")
+        self.current_ruleset = self.rulesets.get(self.ruleset_name, {})
         self.scoring_modifier = self.ai_config.get('scoring_modifier', self.viper_config.get('scoring_modifier', 1.0))
         self.pst_enabled = self.ai_config.get('pst', {}).get('enabled', True)
         self.pst_weight = self.ai_config.get('pst', {}).get('weight', 1.0)
 
-        # Critical scoring components
-        score += self.scoring_modifier * (self._checkmate_threats(board, color) or 0.0)
-        score += self.scoring_modifier * (self._king_safety(board, color) or 0.0)
-        score += self.scoring_modifier * (self._king_threat(board, color) or 0.0)
-        score += self.scoring_modifier * (self._draw_scenarios(board) or 0.0)
+        signature = CompiledRuleset.signature(self.ruleset_name, self.scoring_modifier, self.pst_enabled, self.pst_weight)
+        rules = self._compiled_rulesets.get(signature)
+        if rules is None:
+            rules = CompiledRuleset(self.ruleset_name, self._get_rule_value, self.scoring_modifier, self.pst_enabled, self.pst_weight)
+            self._compiled_rulesets[signature] = rules
+        self.apply_rules(rules)
+
+        if self.logging_enabled:
+            self.logger.debug(f"Compiled ruleset '{self.ruleset_name}' (modifier {self.scoring_modifier}, backend {rules.evaluation_backend}), active terms: {rules.active_terms}")
+
+    def apply_rules(self, rules: CompiledRuleset):
+        """Score with an already compiled ruleset: bind its backend and active terms. Also used by the Texel tuner."""
+        self.rules = rules
+        # Evaluation backend for the square-scanning terms, 'bitboard' (default) or 'python'
+        self.terms_backend = self.bitboard_terms if rules.evaluation_backend == 'bitboard' else self
+        self.active_terms = [getattr(self.terms_backend, term, None) or getattr(self, term) for term in rules.active_terms]
+
+    # Renamed from _calculate_score to calculate_score to be the public API
+    def calculate_score(self, board: chess.Board, color: chess.Color, endgame_factor: float = 0.0, incremental: Optional[IncrementalEvaluator] = None) -> float:
+        """
+        Calculates the position evaluation score for a given board and color,
+        using the ruleset compiled by compile_ruleset() and endgame awareness.
+        This is the main public method for this class.
+        If an IncrementalEvaluator in sync with board is given, material and PST are read from its accumulators.
+        """
+        if self.profiler is not None:
+            return self._calculate_score_profiled(board, color, endgame_factor, incremental)
+        rules = self.rules # Weights are premultiplied by the scoring modifier
 
         # Material and piece-square table evaluation
-        score += self.scoring_modifier * self._material_score(board, color)
-        if self.pst_enabled:
-            # Pass endgame_factor directly to PST evaluation
-            # The PST evaluation itself should be color-aware or return a neutral score
-            # that is then interpreted by the caller (ViperEvaluationEngine.evaluate_position)
-            # For now, assuming pst.evaluate_board_position gives a score from White's perspective.
-            # If calculate_score is for a specific color, PST score might need adjustment if it's neutral.
-            # Let's assume pst.evaluate_board_position is neutral and needs to be perspectivized if color is BLACK.
-            pst_board_score = self.pst.evaluate_board_position(board, endgame_factor) # This is likely from White's perspective
+        if incremental is not None:
+            score = incremental.material[color] * rules.material_weight
+        else:
+            score = self._material_score(board, color)
+        if rules.pst_enabled:
+            # PST scores are from White's perspective, endgame_factor blends the middlegame and endgame tables
+            if incremental is not None:
+                pst_board_score = incremental.pst_score(endgame_factor)
+            else:
+                pst_board_score = self.pst.evaluate_board_position(board, endgame_factor)
             if color == chess.BLACK:
-                pst_board_score = -pst_board_score # Adjust if PST is always White-centric
-            score += self.scoring_modifier * self.pst_weight * pst_board_score
-
-        # Piece coordination and control
-        score += self.scoring_modifier * (self._piece_coordination(board, color) or 0.0)
-        score += self.scoring_modifier * (self._center_control(board, color) or 0.0)
-        score += self.scoring_modifier * (self._pawn_structure(board, color) or 0.0)
-        score += self.scoring_modifier * (self._pawn_weaknesses(board, color) or 0.0)
-        score += self.scoring_modifier * (self._passed_pawns(board, color) or 0.0)
-        score += self.scoring_modifier * (self._pawn_majority(board, color) or 0.0)
-        score += self.scoring_modifier * (self._bishop_pair(board, color) or 0.0)
-        score += self.scoring_modifier * (self._knight_pair(board, color) or 0.0)
-        score += self.scoring_modifier * (self._bishop_vision(board, color) or 0.0)
-        score += self.scoring_modifier * (self._rook_coordination(board, color) or 0.0)
-        score += self.scoring_modifier * (self._castling_evaluation(board, color) or 0.0)
-
-        # Piece development and mobility
-        score += self.scoring_modifier * (self._piece_activity(board, color) or 0.0)
-        score += self.scoring_modifier * (self._improved_minor_piece_activity(board, color) or 0.0)
-        score += self.scoring_modifier * (self._mobility_score(board, color) or 0.0)
-        score += self.scoring_modifier * (self._undeveloped_pieces(board, color) or 0.0)
-
-        # Tactical and strategic considerations
-        score += self.scoring_modifier * (self._tactical_evaluation(board, color) or 0.0)
-        score += self.scoring_modifier * (self._tempo_bonus(board, color) or 0.0)
-        score += self.scoring_modifier * (self._special_moves(board, color) or 0.0) # Pass color
-        score += self.scoring_modifier * (self._open_files(board, color) or 0.0)
-        score += self.scoring_modifier * (self._stalemate(board) or 0.0)
+                pst_board_score = -pst_board_score
+            score += rules.pst_weight * pst_board_score
+
+        # Rule terms with a non-zero weight: king safety, draws, pawn structure, coordination, mobility, tactics, ...
+        for term in self.active_terms:
+            score += term(board, color)
 
         if self.show_thoughts and self.logging_enabled:
             self.logger.debug(f"Final score for {color}: {score:.3f} (Ruleset: {self.ruleset_name}, Modifier: {self.scoring_modifier}) | FEN: {board.fen()}")
 
         return score
 
+    def calculate_scores_batch(self, boards, color: chess.Color = chess.WHITE, endgame_factors=0.0):
+        """
+        Score many boards for color at once with NumPy, matching calculate_score() within floating point tolerance.
+        endgame_factors is one factor for all boards or one per board. Returns a numpy array of scores.
+        """
+        if self.batch_evaluation is None:
+            from engine_utilities.batch_evaluation import BatchEvaluation # NumPy is only needed for batch scoring
+            self.batch_evaluation = BatchEvaluation(self)
+        return self.batch_evaluation.scores(boards, color, endgame_factors)
+
+    def _calculate_score_profiled(self, board: chess.Board, color: chess.Color, endgame_factor: float = 0.0, incremental: Optional[IncrementalEvaluator] = None) -> float:
+        """calculate_score with every term timed and its contribution recorded in self.profiler."""
+        rules = self.rules
+        profiler = self.profiler
+        profiler.evaluations += 1
+
+        start = time.perf_counter()
+        if incremental is not None:
+            score = incremental.material[color] * rules.material_weight
+        else:
+            score = self._material_score(board, color)
+        profiler.record('material', time.perf_counter() - start, score)
+
+        if rules.pst_enabled:
+            start = time.perf_counter()
+            if incremental is not None:
+                pst_board_score = incremental.pst_score(endgame_factor)
+            else:
+                pst_board_score = self.pst.evaluate_board_position(board, endgame_factor)
+            if color == chess.BLACK:
+                pst_board_score = -pst_board_score
+            pst_score = rules.pst_weight * pst_board_score
+            profiler.record('pst', time.perf_counter() - start, pst_score)
+            score += pst_score
+
+        for term in self.active_terms:
+            start = time.perf_counter()
+            term_score = term(board, color)
+            profiler.record(term.__name__, time.perf_counter() - start, term_score)
+            score += term_score
+
+        return score
+
     # ==========================================
     # ========= RULE SCORING FUNCTIONS =========
     # These functions are now methods of ViperScoringCalculation
-    # and access their rule values via self._get_rule_value()
+    # and read their premultiplied weights from the compiled ruleset, self.rules
 
     def _checkmate_threats(self, board: chess.Board, color: chess.Color) -> float:
         """
@@ -207,7 +264,7 @@ class ViperScoringCalculation:
                     continue
                 board_copy.push(move)
                 if board_copy.is_checkmate():
-                    score += self._get_rule_value('checkmate_bonus', 0)
+                    score += self.rules.checkmate_bonus
                     board_copy.pop()
                     # If a checkmate is found, we can break and return the bonus.
                     # However, a common heuristic might be to give the bonus to the side *delivering* mate.
@@ -222,19 +279,19 @@ class ViperScoringCalculation:
                 self.logger.error(f"Error in _checkmate_threats: {e} | FEN: {board.fen()}")
         return score
 
-    def _draw_scenarios(self, board: chess.Board) -> float:
+    def _draw_scenarios(self, board: chess.Board, color: Optional[chess.Color] = None) -> float: # Same for both colors
         score = 0.0
         if board.is_stalemate() or board.is_insufficient_material() or board.is_fivefold_repetition() or board.is_repetition(count=2):
-            score += self._get_rule_value('draw_penalty', -9999999999.0)
+            score += self.rules.draw_penalty
         return score
 
     def _material_score(self, board: chess.Board, color: chess.Color) -> float:
         """Simple material count for given color"""
         score = 0.0
-        for piece_type, value in self.piece_values.items():
-            score += len(board.pieces(piece_type, color)) * value
+        for piece_type in (chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN):
+            score += chess.popcount(board.pieces_mask(piece_type, color)) * self.piece_value_table[piece_type]
         # Apply material weight from ruleset
-        return score * self._get_rule_value('material_weight', 1.0)
+        return score * self.rules.material_weight
     
     # This method is correctly called directly from self.pst.evaluate_board_position in calculate_score
 
@@ -251,14 +308,14 @@ class ViperScoringCalculation:
                 # Check if the target square is not attacked by enemy pawns
                 if not self._is_attacked_by_pawn(board, target, not color):
                     safe_moves += 1
-            score += safe_moves * self._get_rule_value('knight_activity_bonus', 0.0)
+            score += safe_moves * self.rules.knight_activity_bonus
 
         for square in board.pieces(chess.BISHOP, color):
             safe_moves = 0
             for target in board.attacks(square):
                 if not self._is_attacked_by_pawn(board, target, not color):
                     safe_moves += 1
-            score += safe_moves * self._get_rule_value('bishop_activity_bonus', 0.0)
+            score += safe_moves * self.rules.bishop_activity_bonus
 
         return score
 
@@ -267,7 +324,7 @@ class ViperScoringCalculation:
         # The 'current_player' attribute is from EvaluationEngine, need to pass it or infer.
         # This method is part of scoring specific 'color'. So, if it's 'color's turn.
         if board.turn == color and not board.is_game_over() and board.is_valid():
-            return self._get_rule_value('tempo_bonus', 0.0)
+            return self.rules.tempo_bonus
         return 0.0
 
     def _is_attacked_by_pawn(self, board: chess.Board, square: chess.Square, by_color: chess.Color) -> bool:
@@ -287,7 +344,7 @@ class ViperScoringCalculation:
             # Check if current player controls (has a piece on) center square
             piece = board.piece_at(square)
             if piece and piece.color == color:
-                score += self._get_rule_value('center_control_bonus', 0.0)
+                score += self.rules.center_control_bonus
         return score
 
     def _piece_activity(self, board: chess.Board, color: chess.Color) -> float:
@@ -295,10 +352,10 @@ class ViperScoringCalculation:
         score = 0.0
 
         for square in board.pieces(chess.KNIGHT, color):
-            score += len(list(board.attacks(square))) * self._get_rule_value('knight_activity_bonus', 0.0)
+            score += len(list(board.attacks(square))) * self.rules.knight_activity_bonus
 
         for square in board.pieces(chess.BISHOP, color):
-            score += len(list(board.attacks(square))) * self._get_rule_value('bishop_activity_bonus', 0.0)
+            score += len(list(board.attacks(square))) * self.rules.bishop_activity_bonus
 
         return score
 
@@ -328,7 +385,7 @@ class ViperScoringCalculation:
                     shield_square = chess.square(target_file, rank_offset)
                     piece = board.piece_at(shield_square)
                     if piece and piece.piece_type == chess.PAWN and piece.color == color:
-                        score += self._get_rule_value('king_safety_bonus', 0.0)
+                        score += self.rules.king_safety_bonus
         
         return score
 
@@ -349,9 +406,9 @@ class ViperScoringCalculation:
             
             # This method calculates score from the perspective of 'color'
             if board.turn != color: # If it's *not* 'color's turn, and board is in check, 'color' is in check
-                score += self._get_rule_value('in_check_penalty', 0.0)
+                score += self.rules.in_check_penalty
             else: # If it *is* 'color's turn, and board is in check, then 'color' just gave check
-                score += self._get_rule_value('check_bonus', 0.0)
+                score += self.rules.check_bonus
         return score
 
     def _undeveloped_pieces(self, board: chess.Board, color: chess.Color) -> float:
@@ -373,7 +430,7 @@ class ViperScoringCalculation:
 
         # Apply penalty only if castling rights exist (implies early/middlegame and not yet developed)
         if undeveloped_count > 0 and (board.has_kingside_castling_rights(color) or board.has_queenside_castling_rights(color)):
-            score += undeveloped_count * self._get_rule_value('undeveloped_penalty', 0.0)
+            score += undeveloped_count * self.rules.undeveloped_penalty
 
         return score
 
@@ -385,7 +442,7 @@ class ViperScoringCalculation:
         for square in chess.SQUARES:
             piece = board.piece_at(square)
             if piece and piece.color == color and piece.piece_type != chess.KING: # Exclude king from general mobility
-                score += len(list(board.attacks(square))) * self._get_rule_value('piece_mobility_bonus', 0.0)
+                score += len(list(board.attacks(square))) * self.rules.piece_mobility_bonus
 
         return score
     
@@ -402,7 +459,7 @@ class ViperScoringCalculation:
                     # Ensure piece_on_from_square is not None before accessing attributes
                     if piece_on_from_square and piece_on_from_square.piece_type == chess.PAWN and piece_on_from_square.color == color:
                         if board.is_en_passant(move):
-                            score += self._get_rule_value('en_passant_bonus', 0.0)
+                            score += self.rules.en_passant_bonus
                             break # Found one en passant, bonus applied
         
         # Promotion opportunities for 'color'
@@ -416,7 +473,7 @@ class ViperScoringCalculation:
                 # Check if pawn can advance to promotion rank
                 # This is a simplified check; a full check involves move generation.
                 # For now, just having a pawn on the 7th/2nd is a strong indicator.
-                score += self._get_rule_value('pawn_promotion_bonus', 0.0) 
+                score += self.rules.pawn_promotion_bonus 
                 # A more accurate way would be to check board.generate_legal_moves() for promotions for 'color'
                 # but that might be too slow for an eval term. The current approach is a heuristic.
         return score
@@ -430,7 +487,7 @@ class ViperScoringCalculation:
                 piece_making_capture = board.piece_at(move.from_square)
                 # Ensure piece_making_capture is not None
                 if piece_making_capture and piece_making_capture.color == color:
-                    score += self._get_rule_value('capture_bonus', 0.0)
+                    score += self.rules.capture_bonus
         
         opponent_color = not color
 
@@ -439,11 +496,11 @@ class ViperScoringCalculation:
             if piece and piece.color == opponent_color:
                 # Check if it's attacked by 'color' and not defended by 'opponent_color' (i.e., not attacked by opponent_color)
                 if board.is_attacked_by(color, square) and not board.is_attacked_by(opponent_color, square):
-                    score += self._get_rule_value('hanging_piece_bonus', 0.0)
+                    score += self.rules.hanging_piece_bonus
             elif piece and piece.color == color:
                 # Penalty for 'color' having pieces attacked by opponent_color and not defended by 'color'
                 if board.is_attacked_by(opponent_color, square) and not board.is_attacked_by(color, square):
-                    score += self._get_rule_value('undefended_piece_penalty', 0.0)
+                    score += self.rules.undefended_piece_penalty
         
         return score
 
@@ -456,25 +513,25 @@ class ViperScoringCalculation:
         if king_sq: # Ensure king exists
             if color == chess.WHITE:
                 if king_sq == chess.G1: # Kingside castled
-                    score += self._get_rule_value('castling_bonus', 0.0)
+                    score += self.rules.castling_bonus
                 elif king_sq == chess.C1: # Queenside castled
-                    score += self._get_rule_value('castling_bonus', 0.0)
+                    score += self.rules.castling_bonus
             else: # Black
                 if king_sq == chess.G8: # Kingside castled
-                    score += self._get_rule_value('castling_bonus', 0.0)
+                    score += self.rules.castling_bonus
                 elif king_sq == chess.C8: # Queenside castled
-                    score += self._get_rule_value('castling_bonus', 0.0)
+                    score += self.rules.castling_bonus
 
         # Penalty if castling rights lost and not yet castled
         initial_king_square = chess.E1 if color == chess.WHITE else chess.E8
         if not board.has_castling_rights(color) and king_sq == initial_king_square:
-            score += self._get_rule_value('castling_protection_penalty', 0.0)
+            score += self.rules.castling_protection_penalty
         
         # Bonus if still has kingside or queenside castling rights
         if board.has_kingside_castling_rights(color) and board.has_queenside_castling_rights(color):
-            score += self._get_rule_value('castling_protection_bonus', 0.0)
+            score += self.rules.castling_protection_bonus
         elif board.has_kingside_castling_rights(color) or board.has_queenside_castling_rights(color):
-            score += self._get_rule_value('castling_protection_bonus', 0.0) / 2
+            score += self.rules.castling_protection_bonus / 2
         
         return score
 
@@ -487,9 +544,21 @@ class ViperScoringCalculation:
             if piece and piece.color == color:
                 # If the piece is defended by another friendly piece (i.e., the square it's on is attacked by its own color)
                 if board.is_attacked_by(color, square): 
-                    score += self._get_rule_value('piece_coordination_bonus', 0.0) 
+                    score += self.rules.piece_coordination_bonus 
         return score
     
+    def _pawn_score(self, board: chess.Board, color: chess.Color) -> float:
+        """Combined pawn structure, weakness, passed pawn and majority terms, cached in the pawn hash table."""
+        # Keyed on the compiled ruleset, whose weights (and scoring modifier) the cached score includes
+        key = (board.pawns & board.occupied_co[chess.WHITE], board.pawns & board.occupied_co[chess.BLACK], color, self.rules)
+        score = self.pawn_hash.get(key)
+        if score is None:
+            terms = self.terms_backend # Either backend gives the same score, so entries are shared
+            score = ((terms._pawn_structure(board, color) or 0.0) + (terms._pawn_weaknesses(board, color) or 0.0) +
+                     (terms._passed_pawns(board, color) or 0.0) + (terms._pawn_majority(board, color) or 0.0))
+            self.pawn_hash.store(key, score)
+        return score
+
     def _pawn_structure(self, board: chess.Board, color: chess.Color) -> float:
         """Evaluate pawn structure (doubled, isolated pawns)"""
         score = 0.0
@@ -498,7 +567,7 @@ class ViperScoringCalculation:
         for file in range(8):
             pawns_on_file = [s for s in board.pieces(chess.PAWN, color) if chess.square_file(s) == file]
             if len(pawns_on_file) > 1:
-                score += (len(pawns_on_file) - 1) * self._get_rule_value('doubled_pawn_penalty', 0.0)
+                score += (len(pawns_on_file) - 1) * self.rules.doubled_pawn_penalty
         
         # Count isolated pawns
         for square in board.pieces(chess.PAWN, color):
@@ -522,13 +591,13 @@ class ViperScoringCalculation:
                         break
 
             if is_isolated:
-                score += self._get_rule_value('isolated_pawn_penalty', 0.0)
+                score += self.rules.isolated_pawn_penalty
         
         # No general pawn_structure_bonus here, as it's typically derived from good structure
         # (absence of penalties, presence of passed pawns, etc.)
         # If score is positive from penalties, it implies bad structure, so no bonus.
         # if score > 0: 
-        #     score += self._get_rule_value('pawn_structure_bonus', 0.0)
+        #     score += self.rules.pawn_structure_bonus
 
         return score
 
@@ -558,7 +627,7 @@ class ViperScoringCalculation:
             #             is_passed = False
             #             break
             # if is_passed:
-            #     score += self._get_rule_value('passed_pawn_bonus', 0.0) 
+            #     score += self.rules.passed_pawn_bonus 
             pass # Placeholder for backward/passed pawn logic
         
         return score
@@ -577,24 +646,24 @@ class ViperScoringCalculation:
         # Compare pawn counts on each wing
         if color == chess.WHITE:
             if white_pawns_kingside > black_pawns_kingside:
-                score += self._get_rule_value('pawn_majority_bonus', 0.0) / 2 # Half bonus for kingside
+                score += self.rules.pawn_majority_bonus / 2 # Half bonus for kingside
             if white_pawns_queenside > black_pawns_queenside:
-                score += self._get_rule_value('pawn_majority_bonus', 0.0) / 2 # Half bonus for queenside
+                score += self.rules.pawn_majority_bonus / 2 # Half bonus for queenside
             # Optionally add penalty for minority
             # if white_pawns_kingside < black_pawns_kingside:
-            #     score += self._get_rule_value('pawn_minority_penalty', 0.0) / 2
+            #     score += self.rules.pawn_minority_penalty / 2
             # if white_pawns_queenside < black_pawns_queenside:
-            #     score += self._get_rule_value('pawn_minority_penalty', 0.0) / 2
+            #     score += self.rules.pawn_minority_penalty / 2
         else: # Black
             if black_pawns_kingside > white_pawns_kingside:
-                score += self._get_rule_value('pawn_majority_bonus', 0.0) / 2
+                score += self.rules.pawn_majority_bonus / 2
             if black_pawns_queenside > white_pawns_queenside:
-                score += self._get_rule_value('pawn_majority_bonus', 0.0) / 2
+                score += self.rules.pawn_majority_bonus / 2
             # Optionally add penalty for minority
             # if black_pawns_kingside < white_pawns_kingside:
-            #     score += self._get_rule_value('pawn_minority_penalty', 0.0) / 2
+            #     score += self.rules.pawn_minority_penalty / 2
             # if black_pawns_queenside < white_pawns_queenside:
-            #     score += self._get_rule_value('pawn_minority_penalty', 0.0) / 2
+            #     score += self.rules.pawn_minority_penalty / 2
         
         return score
 
@@ -617,7 +686,7 @@ class ViperScoringCalculation:
                         is_passed = False
                         break
             if is_passed:
-                score += self._get_rule_value('passed_pawn_bonus', 0.0)
+                score += self.rules.passed_pawn_bonus
         return score
 
     def _knight_pair(self, board: chess.Board, color: chess.Color) -> float:
@@ -625,7 +694,7 @@ class ViperScoringCalculation:
         score = 0.0
         knights = list(board.pieces(chess.KNIGHT, color))
         if len(knights) >= 2:
-            score += self._get_rule_value('knight_pair_bonus', 0.0) # Bonus for having *a* knight pair
+            score += self.rules.knight_pair_bonus # Bonus for having *a* knight pair
             # If the bonus is per knight in a pair, it would be len(knights) * bonus / 2 (or similar)
         return score
 
@@ -634,7 +703,7 @@ class ViperScoringCalculation:
         score = 0.0
         bishops = list(board.pieces(chess.BISHOP, color))
         if len(bishops) >= 2:
-            score += self._get_rule_value('bishop_pair_bonus', 0.0)
+            score += self.rules.bishop_pair_bonus
         return score
 
     def _bishop_vision(self, board: chess.Board, color: chess.Color) -> float:
@@ -644,7 +713,7 @@ class ViperScoringCalculation:
             attacks = board.attacks(sq)
             # Bonus for having more attacked squares (i.e., good vision)
             if len(list(attacks)) > 5: # Bishops generally attack 7-13 squares, adjust threshold as needed
-                score += self._get_rule_value('bishop_vision_bonus', 0.0)
+                score += self.rules.bishop_vision_bonus
         return score
 
     def _rook_coordination(self, board: chess.Board, color: chess.Color) -> float:
@@ -656,15 +725,15 @@ class ViperScoringCalculation:
             for j in range(i+1, len(rooks)):
                 sq1, sq2 = rooks[i], rooks[j]
                 if chess.square_file(sq1) == chess.square_file(sq2):
-                    score += self._get_rule_value('stacked_rooks_bonus', 0.0)
+                    score += self.rules.stacked_rooks_bonus
                 if chess.square_rank(sq1) == chess.square_rank(sq2):
-                    score += self._get_rule_value('coordinated_rooks_bonus', 0.0)
+                    score += self.rules.coordinated_rooks_bonus
                 
                 # Rook on 7th rank bonus (critical for attacking pawns)
                 # Check for white on rank 7 (index 6) or black on rank 2 (index 1)
                 if (color == chess.WHITE and (chess.square_rank(sq1) == 6 or chess.square_rank(sq2) == 6)) or \
                    (color == chess.BLACK and (chess.square_rank(sq1) == 1 or chess.square_rank(sq2) == 1)):
-                    score += self._get_rule_value('rook_position_bonus', 0.0)
+                    score += self.rules.rook_position_bonus
         return score
 
     def _open_files(self, board: chess.Board, color: chess.Color) -> float:
@@ -688,25 +757,25 @@ class ViperScoringCalculation:
             # Bonus for controlling an open or semi-open file
             # An open file has no pawns. A semi-open file has only opponent pawns.
             if is_file_open: # Truly open file
-                score += self._get_rule_value('open_file_bonus', 0.0)
+                score += self.rules.open_file_bonus
             elif not is_file_open and not has_own_pawn_on_file and has_opponent_pawn_on_file: # Semi-open file for 'color'
-                score += self._get_rule_value('open_file_bonus', 0.0) / 2 # Half bonus for semi-open (tuneable)
+                score += self.rules.open_file_bonus / 2 # Half bonus for semi-open (tuneable)
 
             # Bonus if a rook is on an open or semi-open file
             if any(board.piece_at(chess.square(file, r)) == chess.Piece(chess.ROOK, color) for r in range(8)):
                 if is_file_open or (not is_file_open and not has_own_pawn_on_file): # If open or semi-open
-                    score += self._get_rule_value('file_control_bonus', 0.0)
+                    score += self.rules.file_control_bonus
             
             # Exposed king penalty if king is on an open/semi-open file
             king_sq = board.king(color)
             if king_sq is not None and chess.square_file(king_sq) == file:
                 if is_file_open or (not is_file_open and not has_own_pawn_on_file): # If king is on an open/semi-open file
-                    score += self._get_rule_value('exposed_king_penalty', 0.0)
+                    score += self.rules.exposed_king_penalty
 
         return score
     
-    def _stalemate(self, board: chess.Board) -> float:
+    def _stalemate(self, board: chess.Board, color: Optional[chess.Color] = None) -> float: # Same for both colors
         """Check if the position is a stalemate"""
         if board.is_stalemate():
-            return self._get_rule_value('stalemate_penalty', 0.0)
+            return self.rules.stalemate_penalty
         return 0.0
\ No newline at end of file
@@ -0,0 +1,105 @@
+# engine_utilities/zobrist_hash.py
+
+""" Zobrist Hashing for the Viper Chess Engine
+Provides 64-bit position keys for the transposition table. Keys use the standard
+Polyglot random array from python-chess, so a full hash equals chess.polyglot.zobrist_hash(board),
+but the search only pays for a full hash at the root and updates keys incrementally on push/pop.
+"""
+
+import chess
+import chess.polyglot
+
+class ZobristHash:
+    """
+    Incremental Zobrist hashing compatible with Polyglot keys.
+    Piece keys are precomputed per (color, piece_type, square) so a move update is a handful of XORs.
+    """
+
+    def __init__(self, random_array=None):
+        self.array = random_array if random_array is not None else chess.polyglot.POLYGLOT_RANDOM_ARRAY
+        self.hasher = chess.polyglot.ZobristHasher(self.array)
+
+        # piece_keys[color][piece_type][square], Polyglot piece index is (piece_type - 1) * 2 + color
+        self.piece_keys = [[[0] * 64 for _ in range(7)] for _ in range(2)]
+        for color in chess.COLORS:
+            for piece_type in chess.PIECE_TYPES:
+                piece_index = (piece_type - 1) * 2 + int(color)
+                for square in chess.SQUARES:
+                    self.piece_keys[color][piece_type][square] = self.array[64 * piece_index + square]
+
+    def hash_board(self, board: chess.Board) -> int:
+        """Compute the full key for a position from scratch."""
+        return self.hasher(board)
+
+    def state_component(self, board: chess.Board) -> int:
+        """Key component for castling rights, en passant file and side to move."""
+        return self.hasher.hash_castling(board) ^ self.hasher.hash_ep_square(board) ^ self.hasher.hash_turn(board)
+
+    def move_component(self, board: chess.Board, move: chess.Move) -> int:
+        """
+        Key component for the piece placement changes caused by 'move'.
+        Must be called on the board *before* the move is pushed.
+        """
+        if not move:
+            return 0 # Null move only changes the state component
+
+        color = board.turn
+        from_square = move.from_square
+        to_square = move.to_square
+        piece_type = board.piece_type_at(from_square)
+        if piece_type is None:
+            return 0
+
+        own_keys = self.piece_keys[color]
+        delta = own_keys[piece_type][from_square]
+
+        if piece_type == chess.KING and board.is_castling(move):
+            rank = chess.square_rank(from_square)
+            if board.is_kingside_castling(move):
+                king_to, rook_from, rook_to = chess.square(6, rank), chess.square(7, rank), chess.square(5, rank)
+            else:
+                king_to, rook_from, rook_to = chess.square(2, rank), chess.square(0, rank), chess.square(3, rank)
+            if board.chess960:
+                rook_from = to_square # python-chess encodes 960 castling as king-takes-rook
+            return delta ^ own_keys[chess.KING][king_to] ^ own_keys[chess.ROOK][rook_from] ^ own_keys[chess.ROOK][rook_to]
+
+        captured_type = board.piece_type_at(to_square)
+        if captured_type is not None:
+            delta ^= self.piece_keys[not color][captured_type][to_square]
+        elif piece_type == chess.PAWN and to_square == board.ep_square and chess.square_file(from_square) != chess.square_file(to_square):
+            captured_square = to_square - 8 if color == chess.WHITE else to_square + 8
+            delta ^= self.piece_keys[not color][chess.PAWN][captured_square]
+
+        delta ^= own_keys[move.promotion or piece_type][to_square]
+        return delta
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import random
+
+    zobrist = ZobristHash()
+    board = chess.Board()
+    key = zobrist.hash_board(board)
+    print(f"Initial position key: {key:016x} (polyglot: {chess.polyglot.zobrist_hash(board):016x})")
+
+    # Play random games and compare the incremental key with a full recompute after every move
+    mismatches = 0
+    for game in range(50):
+        board = chess.Board()
+        key = zobrist.hash_board(board)
+        keys = [key]
+        while not board.is_game_over() and board.ply() < 200:
+            move = random.choice(list(board.legal_moves))
+            key ^= zobrist.state_component(board) ^ zobrist.move_component(board, move)
+            board.push(move)
+            key ^= zobrist.state_component(board)
+            keys.append(key)
+            if key != chess.polyglot.zobrist_hash(board):
+                mismatches += 1
+        while board.move_stack:
+            board.pop()
+            keys.pop()
+            if keys[-1] != chess.polyglot.zobrist_hash(board):
+                mismatches += 1
+    print(f"Incremental key mismatches over 50 random games: {mismatches}")
@@ -97,6 +97,21 @@ Database Schema Documentation:
      - time_taken: Time in seconds taken to find the move.
      - pv_line: Principal Variation (best line of play found).
      - created_at: Timestamp of entry creation.
+
+6. eval_term_profile Table:
+   - Stores the per-game evaluation term profile (viper.yaml performance.profile_eval_terms).
+   - Kept across database rebuilds so term costs can be tracked over time.
+   - Columns:
+     - id: Primary key.
+     - game_id: Associated game ID.
+     - player_color: Color of the profiled engine ('white' or 'black').
+     - term: Evaluation term name (e.g., 'mobility_score', 'pst').
+     - calls: Number of times the term was evaluated.
+     - total_time_s: Cumulative wall time spent in the term.
+     - mean_time_us: Mean wall time per call in microseconds.
+     - time_share: Fraction of the profiled evaluation time spent in the term.
+     - mean_abs_contribution: Mean absolute contribution of the term to the score.
+     - created_at: Timestamp of entry creation.
 """
 
 class MetricsStore:
@@ -190,6 +205,20 @@ class MetricsStore:
                 engine_version TEXT,
                 created_at TEXT
             )''')
+            # Evaluation term profiles are not dropped, they are compared across engine versions
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS eval_term_profile (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                game_id TEXT,
+                player_color TEXT,
+                term TEXT,
+                calls INTEGER,
+                total_time_s REAL,
+                mean_time_us REAL,
+                time_share REAL,
+                mean_abs_contribution REAL,
+                created_at TEXT
+            )''')
             connection.commit()
         
             # Add missing columns to game_results table for direct config access
@@ -522,6 +551,40 @@ class MetricsStore:
             except sqlite3.Error as e:
                 print(f"Error adding move metric for game {game_id}, move {move_number}: {e}")
 
+    def add_eval_term_profile(self, game_id: str, player_color: str, rows: list):
+        """
+        Inserts one game's evaluation term profile (EvalProfiler.rows()) for one color into the eval_term_profile table.
+        """
+        connection = self._get_connection()
+        with connection:
+            cursor = connection.cursor()
+            try:
+                created_at = datetime.now().isoformat()
+                for row in rows:
+                    self._execute_with_retry(cursor, '''
+                    INSERT INTO eval_term_profile
+                    (game_id, player_color, term, calls, total_time_s, mean_time_us, time_share, mean_abs_contribution, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', (
+                        game_id, player_color, row['term'], row['calls'], row['total_time_s'], row['mean_time_us'],
+                        row['time_share'], row['mean_abs_contribution'], created_at
+                    ))
+                connection.commit()
+            except sqlite3.Error as e:
+                print(f"Error adding evaluation term profile for game {game_id}: {e}")
+
+    def get_eval_term_profile_df(self, game_id: Optional[str] = None):
+        """
+        Retrieves evaluation term profiles as a Pandas DataFrame, for one game or all games.
+        """
+        connection = self._get_connection()
+        with connection:
+            if game_id is None:
+                df = pd.read_sql_query("SELECT * FROM eval_term_profile", connection)
+            else:
+                df = pd.read_sql_query("SELECT * FROM eval_term_profile WHERE game_id = ?", connection, params=(game_id,))
+        return df
+
     def get_game_statistics(self):
         """
         Retrieve game statistics such as total games, wins, losses, and draws.
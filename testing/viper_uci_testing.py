@@ -0,0 +1,77 @@
+# testing/viper_uci_testing.py
+
+""" Tests for the UCI front end
+bestmove has to be the first move of the last reported info line, also when the search is stopped or runs
+out of nodes mid-iteration, and a quick ponderhit has to put the search on the real clock.
+Run from the repository root: python -m unittest testing/viper_uci_testing.py
+"""
+
+import io
+import os
+import sys
+import time
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from viper_uci import ViperUCI
+
+class ViperUCITest(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_cwd = os.getcwd()
+        os.chdir(REPO_ROOT) # viper.yaml and chess_game.yaml are read from the working directory
+        self.output = io.StringIO()
+        self.uci = ViperUCI(input_stream=io.StringIO(), output_stream=self.output)
+
+    def tearDown(self):
+        self.uci.handle_command("stop")
+        self.uci.engine.close()
+        os.chdir(self.previous_cwd)
+
+    def run_commands(self, *commands: str):
+        for command in commands:
+            self.uci.handle_command(command)
+
+    def wait_for_bestmove(self, timeout: float = 120.0) -> list:
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            lines = self.output.getvalue().splitlines()
+            if any(line.startswith("bestmove") for line in lines):
+                return lines
+            time.sleep(0.01)
+        self.fail("no bestmove")
+
+    def assert_bestmove_matches_last_info(self, lines: list):
+        infos = [line for line in lines if line.startswith("info depth")]
+        bestmove = [line for line in lines if line.startswith("bestmove")][-1].split()[1]
+        self.assertTrue(infos, "no completed iteration was reported")
+        self.assertEqual(infos[-1].split(" pv ")[1].split()[0], bestmove)
+
+    def test_depth_search(self):
+        self.run_commands("position startpos moves e2e4 e7e5", "go depth 3")
+        self.assert_bestmove_matches_last_info(self.wait_for_bestmove())
+
+    def test_stop_keeps_last_completed_iteration(self):
+        self.run_commands("position startpos", "go infinite")
+        time.sleep(2.0)
+        self.run_commands("stop")
+        self.assert_bestmove_matches_last_info(self.wait_for_bestmove())
+
+    def test_node_limit_keeps_last_completed_iteration(self):
+        for nodes in (500, 3000):
+            self.output.seek(0)
+            self.output.truncate()
+            self.run_commands("position startpos moves e2e4", f"go nodes {nodes}")
+            self.assert_bestmove_matches_last_info(self.wait_for_bestmove())
+
+    def test_quick_ponderhit_uses_real_clock(self):
+        self.run_commands("position startpos moves e2e4", "go ponder movetime 300")
+        self.run_commands("ponderhit") # Straight away, before the search thread may have started its timer
+        start = time.time()
+        self.wait_for_bestmove(timeout=30.0)
+        self.assertLess(time.time() - start, 5.0)
+
+if __name__ == "__main__":
+    unittest.main()
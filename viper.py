@@ -19,7 +19,16 @@ from engine_utilities.piece_square_tables import PieceSquareTables
 from engine_utilities.time_manager import TimeManager
 from engine_utilities.opening_book import OpeningBook
 from engine_utilities.viper_scoring_calculation import ViperScoringCalculation # Import the new scoring module
-from collections import OrderedDict
+from engine_utilities.zobrist_hash import ZobristHash
+from engine_utilities.static_exchange import StaticExchangeEvaluator
+from engine_utilities.piece_values import build_piece_tables
+from engine_utilities.incremental_evaluation import IncrementalEvaluator
+from engine_utilities.eval_cache import EvalCache
+from engine_utilities.move_picker import MovePicker
+from engine_utilities.transposition_table import TranspositionTable, SharedTranspositionTable, BOUND_EXACT, BOUND_LOWER, BOUND_UPPER
+from engine_utilities.lazy_smp import LazySMP
+from engine_utilities import root_parallel
+from engine_utilities.search_future import SearchFuture, run_search_thread
 
 # At module level, define a single logger for this file
 # Renamed from evaluation_logger to viper_engine_logger for clarity, consistent with file/class name
@@ -44,31 +53,33 @@ if not viper_engine_logger.handlers:
     viper_engine_logger.addHandler(file_handler)
     viper_engine_logger.propagate = False
 
-class LimitedSizeDict(OrderedDict):
-    def __init__(self, *args, maxlen=100000, **kwargs):
-        self.maxlen = maxlen
-        super().__init__(*args, **kwargs)
-    def __setitem__(self, key, value):
-        if key in self:
-            self.move_to_end(key)
-        super().__setitem__(key, value)
-        if len(self) > self.maxlen:
-            oldest = next(iter(self))
-            del self[oldest]
-
 class ViperEvaluationEngine: # Renamed class from EvaluationEngine
-    def __init__(self, board: chess.Board = chess.Board(), player: chess.Color = chess.WHITE, ai_config=None):
+    def __init__(self, board: chess.Board = chess.Board(), player: chess.Color = chess.WHITE, ai_config=None, viper_yaml_path: str = "viper.yaml"):
         self.board = board
         self.current_player = player
         self.time_manager = TimeManager()
         self.opening_book = OpeningBook()
 
         self.nodes_searched = 0
-        self.transposition_table = LimitedSizeDict(maxlen=1000000) 
         self.killer_moves = [[None, None] for _ in range(50)] 
         self.history_table = {}
         self.counter_moves = {}
 
+        # Zobrist keys for the transposition table, updated incrementally by _push_move/_pop_move
+        self.zobrist = ZobristHash()
+        self._zobrist_board = None
+        self._zobrist_base_ply = 0
+        self._zobrist_stack = []
+
+        # Principal variation collected per ply (triangular table) and the PV of the last completed iteration
+        self.pv_table = [[] for _ in range(50)]
+        self.previous_pv = []
+        self._search_root_ply = 0
+        # Score, PV and stats of the last search(), see get_last_search_info()
+        self.last_search_score = None
+        self.last_search_depth = 0
+        self.last_search_info = {'score': 0.0, 'nodes': 0, 'pv': '', 'depth': 0, 'time': 0.0}
+
         self.piece_values = {
             chess.KING: 0.0,
             chess.QUEEN: 9.0,
@@ -77,9 +88,23 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
             chess.KNIGHT: 3.0,
             chess.PAWN: 1.0
         }
+        # This engine's own flat value table and MVV-LVA matrix, rebuilt by _apply_piece_values() when piece_values changes
+        self.piece_value_table, self.mvv_lva = build_piece_tables(self.piece_values)
+        self._applied_piece_values = dict(self.piece_values)
+        self.static_exchange = StaticExchangeEvaluator(self.piece_values)
+
+        # Asynchronous search (search_async) and progress reporting
+        self._active_search = None
+        self._info_callback = None
+        self._search_start_time = time.perf_counter()
+        self._search_timer_started = threading.Event() # Set once the running search has started its timer
+        # Pondering: (search future, Zobrist key of the pondered position), see start_ponder()
+        self._ponder = None
+        self.ponder_hits = 0
+        self.ponder_misses = 0
 
         try:
-            with open("viper.yaml") as f:
+            with open(viper_yaml_path) as f: # viper.yaml unless another config is chosen (bench, tuning runs)
                 viper_data = yaml.safe_load(f) or {}
                 self.viper_config_data = viper_data.get('viper', {})
             with open("chess_game.yaml") as f:
@@ -94,9 +119,14 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
         viper_perf = self.viper_config_data.get('performance', {})
         game_perf = self.game_settings_config_data.get('performance', {})
         
-        self.hash_size = viper_perf.get('hash_size', game_perf.get('hash_size', 1024*1024))
-        self.transposition_table.maxlen = self.hash_size // 100 # Approximate entry size
+        self.hash_size = viper_perf.get('hash_size', game_perf.get('hash_size', 64)) # MB
+        self.transposition_table = TranspositionTable(size_mb=self.hash_size)
         self.threads = viper_perf.get('thread_limit', game_perf.get('thread_limit', 1))
+        # Lazy SMP: deepsearch runs with thread_limit - 1 helper processes on a shared transposition table
+        self.parallel_evaluation = viper_perf.get('parallel_evaluation', game_perf.get('parallel_evaluation', False))
+        self._lazy_smp = None
+        # Static evaluations cached by Zobrist key and ruleset identity
+        self.eval_cache = EvalCache(max_size=viper_perf.get('eval_cache_size', game_perf.get('eval_cache_size', 100000)))
 
         # Monitoring settings primarily from game_settings_config_data
         monitoring_settings = self.game_settings_config_data.get('monitoring', {}) if self.game_settings_config_data else {}
@@ -114,6 +144,8 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
         self.configure_for_side(self.board, self.ai_config) 
         
         self.pst = PieceSquareTables()
+        # Material and PST accumulators for the searched board, kept in step with the Zobrist key stack
+        self.incremental_eval = IncrementalEvaluator(self.pst, self.piece_values)
 
         self.scoring_calculator = ViperScoringCalculation(
             viper_yaml_config=self.viper_config_data, # Pass full viper.yaml data
@@ -180,6 +212,21 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
             final_config['quiescence'] = {}
         final_config['quiescence'].setdefault('enabled', True)
         final_config['quiescence'].setdefault('max_depth', 5)
+        final_config['quiescence'].setdefault('see_pruning', True)
+        # Null-move pruning and late-move reductions, a plain true/false in the YAML toggles them with default settings
+        for pruning_key in ('null_move', 'late_move_reduction'):
+            pruning_setting = final_config.get(pruning_key)
+            if isinstance(pruning_setting, bool):
+                final_config[pruning_key] = {'enabled': pruning_setting}
+            elif not isinstance(pruning_setting, dict):
+                final_config[pruning_key] = {}
+            final_config[pruning_key].setdefault('enabled', False)
+        final_config['null_move'].setdefault('reduction', 2)
+        final_config['null_move'].setdefault('min_depth', 3)
+        final_config['late_move_reduction'].setdefault('reduction', 1)
+        final_config['late_move_reduction'].setdefault('min_depth', 3)
+        final_config['late_move_reduction'].setdefault('full_depth_moves', 3)
+        final_config.setdefault('aspiration_window', 0.5)
         final_config.setdefault('use_opening_book', self.viper_config_data.get('use_opening_book', True))
 
         # Performance related defaults that might be in chess_game.yaml
@@ -199,6 +246,7 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
 
     def configure_for_side(self, board: chess.Board, ai_config_resolved: dict):
         self.ai_config = ai_config_resolved # This is the fully resolved config
+        self._apply_piece_values() # No-op unless the piece values were changed
 
         self.ai_type = self.ai_config.get('ai_type') # Already defaulted in _ensure_ai_config
         self.ai_color = 'white' if board.turn == chess.WHITE else 'black'
@@ -208,6 +256,15 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
         self.solutions_enabled = self.ai_config.get('use_opening_book') # 'use_solutions' was an old key
         self.move_ordering_enabled = self.ai_config.get('move_ordering', {}).get('enabled')
         self.quiescence_enabled = self.ai_config.get('quiescence', {}).get('enabled')
+        null_move_cfg = self.ai_config.get('null_move', {})
+        self.null_move_enabled = null_move_cfg.get('enabled', False)
+        self.null_move_reduction = null_move_cfg.get('reduction', 2)
+        self.null_move_min_depth = null_move_cfg.get('min_depth', 3)
+        lmr_cfg = self.ai_config.get('late_move_reduction', {})
+        self.lmr_enabled = lmr_cfg.get('enabled', False)
+        self.lmr_reduction = lmr_cfg.get('reduction', 1)
+        self.lmr_min_depth = lmr_cfg.get('min_depth', 3)
+        self.lmr_full_depth_moves = lmr_cfg.get('full_depth_moves', 3)
         self.move_time_limit = self.ai_config.get('move_time_limit')
         
         self.pst_enabled = self.ai_config.get('pst', {}).get('enabled')
@@ -216,6 +273,9 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
         self.eval_engine = self.ai_config.get('engine', 'viper') # Should be 'viper'
         self.ruleset = self.ai_config.get('ruleset')
         self.scoring_modifier = self.ai_config.get('scoring_modifier')
+        # Everything besides the position that the evaluation depends on, part of every eval cache key
+        self._eval_cache_ruleset = (self.ruleset, self.scoring_modifier, self.ai_config.get('pst', {}).get('enabled'),
+                                    self.ai_config.get('pst', {}).get('weight'), self.ai_config.get('game_phase_awareness', True))
 
         if self.logging_enabled and self.logger:
             self.logger.debug(f"Configuring Viper AI for {'White' if board.turn == chess.WHITE else 'Black'} with resolved config: {self.ai_config}")
@@ -239,25 +299,38 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
         
         if hasattr(self, 'scoring_calculator') and self.scoring_calculator:
             self.scoring_calculator.ai_config = self.ai_config # Update with the latest resolved config
-            self.scoring_calculator.ruleset_name = self.ruleset
-            # scoring_calculator's __init__ now takes viper_yaml_config, so it has all rulesets.
-            # It will internally select the current_ruleset based on self.ruleset_name.
-            self.scoring_calculator.current_ruleset = self.scoring_calculator.rulesets.get(self.ruleset, {}) # Ensure this is updated
-            self.scoring_calculator.scoring_modifier = self.scoring_modifier
-            self.scoring_calculator.pst_enabled = self.pst_enabled # pst_enabled from resolved config
-            self.scoring_calculator.pst_weight = self.pst_weight   # pst_weight from resolved config
+            # Resolve the ruleset, scoring modifier and PST settings once here instead of on every evaluation
+            self.scoring_calculator.compile_ruleset()
 
         if self.show_thoughts and self.logger:
             self.logger.debug(f"Viper AI configured for {'White' if board.turn == chess.WHITE else 'Black'}: type={self.ai_type} depth={self.depth}, ruleset={self.ruleset}")
 
+    def _apply_piece_values(self):
+        """Rebuild this engine's piece value tables and those of its evaluators if self.piece_values was changed."""
+        if self.piece_values == self._applied_piece_values:
+            return
+        self.piece_value_table, self.mvv_lva = build_piece_tables(self.piece_values) # Raises ValueError for incomplete values
+        self._applied_piece_values = dict(self.piece_values)
+        self.static_exchange.set_piece_values(self.piece_values)
+        self.incremental_eval.values = self.piece_value_table
+        self._zobrist_board = None # The material accumulators are recomputed when the next search starts tracking
+        self.scoring_calculator.set_piece_values(self.piece_values)
+        self.eval_cache.clear()
+
     def reset(self, board: chess.Board):
         self.board = board.copy()
         self.current_player = chess.WHITE if board.turn else chess.BLACK
         self.nodes_searched = 0
         self.transposition_table.clear()
+        self.eval_cache.clear()
+        self.scoring_calculator.pawn_hash.clear()
         self.killer_moves = [[None, None] for _ in range(50)]
         self.history_table.clear()
         self.counter_moves.clear()
+        self._zobrist_board = None
+        self._zobrist_stack = []
+        self.pv_table = [[] for _ in range(50)]
+        self.previous_pv = []
         if self.show_thoughts and self.logger:
             self.logger.debug(f"ViperEvaluationEngine for {self.ai_color} reset to initial state.")
         
@@ -276,15 +349,14 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
         if not self.game_phase_awareness:
             return 0.0
         
+        values = self.piece_value_table
         total_material = 0
-        for piece_type, value in self.piece_values.items():
-            if piece_type != chess.KING:
-                total_material += len(board.pieces(piece_type, chess.WHITE)) * value
-                total_material += len(board.pieces(piece_type, chess.BLACK)) * value
+        for piece_type in (chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN):
+            total_material += chess.popcount(board.pieces_mask(piece_type, chess.WHITE) | board.pieces_mask(piece_type, chess.BLACK)) * values[piece_type]
 
-        QUEEN_ROOK_MATERIAL = self.piece_values[chess.QUEEN] + self.piece_values[chess.ROOK]
-        TWO_ROOK_MATERIAL = self.piece_values[chess.ROOK] * 2
-        KNIGHT_BISHOP_MATERIAL = self.piece_values[chess.KNIGHT] + self.piece_values[chess.BISHOP]
+        QUEEN_ROOK_MATERIAL = values[chess.QUEEN] + values[chess.ROOK]
+        TWO_ROOK_MATERIAL = values[chess.ROOK] * 2
+        KNIGHT_BISHOP_MATERIAL = values[chess.KNIGHT] + values[chess.BISHOP]
 
         if total_material >= (QUEEN_ROOK_MATERIAL * 2) + (KNIGHT_BISHOP_MATERIAL * 2):
             return 0.0
@@ -312,12 +384,235 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
             return False
         return self.board.fen() != self.game_board.fen()
 
-    def search(self, board: chess.Board, player: chess.Color, ai_config: dict = {}, stop_callback: Optional[Callable[[], bool]] = None) -> chess.Move:
+    def search(self, board: chess.Board, player: chess.Color, ai_config: dict = {}, stop_callback: Optional[Callable[[], bool]] = None,
+               info_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> chess.Move:
+        """
+        Find the best move for player. The search returns its best move so far as soon as stop_callback() returns True.
+        info_callback(info) receives the deepsearch progress, see _report_info().
+        """
+        self.time_manager.set_stop_callback(stop_callback)
+        self._info_callback = info_callback
+        try:
+            best_move = self._search(board, player, ai_config)
+            self.last_search_info = self._search_info(self.board, best_move)
+            return best_move
+        finally:
+            self.time_manager.set_stop_callback(None)
+            self._info_callback = None
+
+    def get_last_search_info(self) -> Dict[str, Any]:
+        """
+        Result of the last search(), like StockfishHandler.get_last_search_info(): score (pawns, from the view of the
+        side that moved), nodes, pv (space separated UCI moves, starting with the move played), depth and time (seconds).
+        """
+        return self.last_search_info
+
+    def _search_info(self, board: chess.Board, best_move: chess.Move) -> Dict[str, Any]:
+        """Build last_search_info for best_move on the searched board from the principal variation and root score."""
+        if best_move is None or best_move == chess.Move.null() or not board.is_legal(best_move):
+            return {'score': 0.0, 'nodes': self.nodes_searched, 'pv': '', 'depth': 0, 'time': time.perf_counter() - self._search_start_time}
+        pv = self.previous_pv if self.previous_pv and self.previous_pv[0] == best_move else [best_move]
+        score = self.last_search_score if pv is self.previous_pv else None
+        if score is None or abs(score) == float('inf'):
+            # Book, random and fallback moves have no search score, use the static evaluation after the move
+            after_move = board.copy()
+            after_move.push(best_move)
+            score = self.evaluate_position_from_perspective(after_move, board.turn)
+        pv = self._complete_pv(board, pv, max(self.depth or 1, len(pv)))
+        return {
+            'score': score,
+            'nodes': self.nodes_searched,
+            'pv': ' '.join(move.uci() for move in pv),
+            'depth': self.last_search_depth,
+            'time': time.perf_counter() - self._search_start_time
+        }
+
+    def _complete_pv(self, board: chess.Board, pv: list, max_length: int) -> list:
+        """
+        Extend pv with the transposition table's best moves, up to max_length plies. PV collection stops
+        at transposition table cutoffs, the stored moves carry the line on from there.
+        """
+        line_board = board.copy()
+        line = []
+        for move in pv:
+            if not line_board.is_legal(move):
+                return line
+            line_board.push(move)
+            line.append(move)
+        seen = set()
+        while len(line) < max_length and not line_board.is_game_over():
+            key = self.zobrist.hash_board(line_board)
+            entry = self.transposition_table.probe(key)
+            if key in seen or entry is None or entry[0] is None or not line_board.is_legal(entry[0]):
+                break
+            seen.add(key)
+            line_board.push(entry[0])
+            line.append(entry[0])
+        return line
+
+    def search_async(self, board: chess.Board, player: chess.Color, ai_config: dict = {},
+                     info_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                     stop_event: Optional[threading.Event] = None) -> SearchFuture:
+        """
+        Run search() in a worker thread and return a SearchFuture resolving to the best move.
+        Setting stop_event (or calling future.stop()) makes the search return its best move so far.
+        info_callback is called from the worker thread. Only one search per engine can run at a time.
+        """
+        if self._active_search is not None and not self._active_search.done():
+            raise RuntimeError("A search is already running on this engine")
+        future = SearchFuture(stop_event)
+        board = board.copy()
+        self._active_search = future
+        self._search_timer_started.clear()
+        return run_search_thread(future, lambda: self.search(board, player, ai_config, stop_callback=future.stop_event.is_set, info_callback=info_callback))
+
+    def search_multipv(self, board: chess.Board, n: int = 3, ai_config: dict = {}, stop_callback: Optional[Callable[[], bool]] = None
+                       ) -> Dict[int, list]:
+        """
+        Multi-PV analysis of board for the side to move. Iterative deepening where each depth searches the root n times,
+        excluding the root moves already found at that depth, so line k is the best move outside lines 1..k-1.
+        Returns {depth: [(move, score, pv), ...]} for every completed depth, best line first, with scores in pawns
+        from the side to move's view. All lines and depths share the transposition table.
+        Depth and time limit come from the resolved ai_config, as in search(); format_multipv() makes a pv_line string.
+        """
+        self.nodes_searched = 0
+        self._search_start_time = time.perf_counter()
+        self.sync_with_game_board(board)
+        player = self.board.turn
+        self.current_player = player
+        self.transposition_table.new_search()
+        self.configure_for_side(self.board, self._ensure_ai_config(ai_config, player))
+        move_time_limit_ms = self.ai_config.get('move_time_limit') or 0
+        self.time_manager.start_timer(move_time_limit_ms / 1000.0 if move_time_limit_ms > 0 else 0)
+        self.time_manager.set_stop_callback(stop_callback)
+
+        root = self.board.copy()
+        self._search_root_ply = len(root.move_stack)
+        legal_moves = list(root.legal_moves)
+        n = min(n, len(legal_moves))
+        max_depth = min(self.depth or 1, self.max_depth or self.depth or 1)
+        results = {}
+        previous_lines = []
+        try:
+            for depth in range(1, max_depth + 1):
+                if n == 0 or self.time_manager.should_stop(depth - 1):
+                    break
+                # The previous depth's lines go first, in their order, then the remaining moves in the usual move order
+                first_moves = [line[0] for line in previous_lines]
+                other_moves = [move for move in legal_moves if move not in first_moves]
+                if self.move_ordering_enabled:
+                    hash_move, _ = self.get_transposition_move(root, depth)
+                    other_moves = self.order_moves(root, other_moves, hash_move=hash_move, depth=depth)
+                remaining = first_moves + other_moves
+
+                lines = []
+                for _ in range(n):
+                    move, score = self._deep_search_root(root, remaining, depth, -float('inf'), float('inf'), self.time_manager.should_stop)
+                    if move == chess.Move.null() or self.time_manager.should_stop():
+                        break
+                    lines.append((move, score, list(self.pv_table[0]) or [move]))
+                    remaining = [other for other in remaining if other != move]
+                if len(lines) < n:
+                    break # Stopped mid-depth, only completed depths are reported
+                lines.sort(key=lambda line: line[1], reverse=True)
+                results[depth] = lines
+                previous_lines = lines
+                self.previous_pv = lines[0][2]
+                if self.show_thoughts and self.logger:
+                    self.logger.debug(f"Multi-PV depth {depth}: {self.format_multipv(lines)}")
+        finally:
+            self.time_manager.set_stop_callback(None)
+        return results
+
+    @staticmethod
+    def format_multipv(lines: list) -> str:
+        """Multi-PV lines as one string for the move_metrics pv_line column: 'multipv 1 score 0.35 pv e2e4 e7e5 | multipv 2 ...'."""
+        return " | ".join(f"multipv {index} score {score:.2f} pv {' '.join(move.uci() for move in pv)}"
+                          for index, (_, score, pv) in enumerate(lines, start=1))
+
+    def start_ponder(self, board: chess.Board, ai_config: dict = {},
+                     info_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> Optional[SearchFuture]:
+        """
+        Think on the opponent's time. board is the position after our move, with the opponent to move.
+        The position after the expected reply (the second move of the last principal variation) is searched
+        without a time limit, filling the transposition table, until finish_ponder() or stop_ponder().
+        Returns the pondering search, or None when there is no expected reply.
+        """
+        self.stop_ponder()
+        pv = self.previous_pv
+        if len(pv) < 2 or (board.move_stack and board.peek() != pv[0]) or not board.is_legal(pv[1]):
+            return None
+        ponder_board = board.copy()
+        ponder_board.push(pv[1])
+        ponder_config = dict(ai_config)
+        ponder_config['move_time_limit'] = float('inf')
+        ponder_config['use_opening_book'] = False
+        future = self.search_async(ponder_board, ponder_board.turn, ponder_config, info_callback=info_callback)
+        self._ponder = (future, self.zobrist.hash_board(ponder_board))
+        if self.show_thoughts and self.logger:
+            self.logger.debug(f"Pondering on expected reply {pv[1]} | FEN: {ponder_board.fen()}")
+        return future
+
+    def finish_ponder(self, board: chess.Board, player: chess.Color, ai_config: dict = {},
+                      info_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> SearchFuture:
+        """
+        The opponent has moved, search board for player. On a ponder hit (board is the pondered position) the pondering
+        search carries on as the real search, with the move_time_limit of ai_config counted from the start of pondering,
+        so the time already spent is credited. On a miss the pondering search is stopped and a new search is started.
+        """
+        ponder, self._ponder = self._ponder, None
+        if ponder is not None:
+            future, ponder_key = ponder
+            if self.zobrist.hash_board(board) == ponder_key and not future.stopped():
+                self.ponder_hits += 1
+                self._search_timer_started.wait(1.0) # The pondering search must not restart its timer after the hit
+                move_time_limit_ms = self._ensure_ai_config(ai_config, player).get('move_time_limit') or 0
+                self.time_manager.ponder_hit(move_time_limit_ms / 1000.0)
+                if self.logging_enabled and self.logger:
+                    self.logger.debug(f"Ponder hit after {self.time_manager.time_elapsed():.2f}s | hits {self.ponder_hits}, misses {self.ponder_misses}")
+                return future
+            self.ponder_misses += 1
+            future.stop()
+            future.exception() # Wait for the engine to be free
+        return self.search_async(board, player, ai_config, info_callback=info_callback)
+
+    def stop_ponder(self):
+        """Stop and discard a pondering search, if any."""
+        ponder, self._ponder = self._ponder, None
+        if ponder is not None:
+            ponder[0].stop()
+            ponder[0].exception()
+
+    def _report_info(self, info_type: str, depth: int, move: chess.Move, score: float):
+        """
+        Send search progress to the info_callback of the running search:
+        'bestmove' when a root move becomes the best one of the current iteration, 'depth' when an iteration completes.
+        info has type, depth, move, score (side to move, pawns), nodes, time (seconds) and pv (moves, 'depth' only).
+        """
+        if self._info_callback is None:
+            return
+        self._info_callback({
+            'type': info_type,
+            'depth': depth,
+            'move': move,
+            'score': score,
+            'nodes': self.nodes_searched,
+            'time': time.perf_counter() - self._search_start_time,
+            'pv': list(self.previous_pv) if info_type == 'depth' else [move]
+        })
+
+    def _search(self, board: chess.Board, player: chess.Color, ai_config: dict = {}) -> chess.Move:
         self.nodes_searched = 0
         search_start_time = time.perf_counter()
+        self._search_start_time = search_start_time
 
         self.sync_with_game_board(board)
         self.current_player = player
+        self.transposition_table.new_search()
+        self.previous_pv = []
+        self.last_search_score = None # Root score of the move found, from the searching side's view
+        self.last_search_depth = 0
+        self._search_root_ply = len(self.board.move_stack)
 
         # Resolve the configuration for this specific search call
         resolved_search_config = self._ensure_ai_config(ai_config, player) # Pass runtime ai_config and player
@@ -327,6 +622,7 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
         if current_move_time_limit_ms is None:
             current_move_time_limit_ms = 0
         self.time_manager.start_timer(current_move_time_limit_ms / 1000.0 if current_move_time_limit_ms > 0 else 0)
+        self._search_timer_started.set()
         
         if self.solutions_enabled: # solutions_enabled is set by configure_for_side
             book_move = self.opening_book.get_book_move(self.board)
@@ -340,12 +636,15 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
         
         # Transposition table depth check uses self.depth which is set by configure_for_side
         trans_move, trans_score = self.get_transposition_move(board, self.depth if self.depth is not None else 1)
-        if trans_move:
+        if trans_move and trans_score is not None and self.board.is_legal(trans_move):
             if self.show_thoughts and self.logger:
                 self.logger.debug(f"Transposition table hit: {trans_move} (Score: {trans_score:.2f}) | FEN: {board.fen()}")
             search_duration = time.perf_counter() - search_start_time
             if self.logging_enabled and self.logger:
                 self.logger.debug(f"Transposition table hit search took {search_duration:.4f} seconds and searched {self.nodes_searched} nodes.")
+            self.previous_pv = [trans_move]
+            self.last_search_score = trans_score
+            self.last_search_depth = self.depth if self.depth is not None else 1
             return trans_move
 
         if self.show_thoughts:
@@ -367,31 +666,46 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
             best_score_overall = float('inf')
 
         best_move = ordered_moves[0] if ordered_moves else chess.Move.null()
+        best_root_pv = []
+        root_search_complete = True
+
+        if self.ai_type == 'root_parallel':
+            # Root moves are split over the persistent process pool, thread_limit workers
+            parallel_move, best_score_overall, worker_nodes, root_search_complete, parallel_pv = root_parallel.search_root_moves(
+                self.board, ordered_moves, self.current_player, self.ai_config, self.depth if self.depth is not None else 1,
+                workers=max(1, self.threads or 1), time_limit=self.time_manager.time_remaining(), stop_callback=self.time_manager.should_stop)
+            self.nodes_searched += worker_nodes
+            if parallel_move is not None:
+                best_move = parallel_move
+                best_root_pv = parallel_pv # Empty when no root move finished, the move then has no search score
+            ordered_moves = [] # Every root move has been searched by the workers
 
         for move in ordered_moves:
             if self.time_manager.should_stop(self.depth if self.depth is not None else 1):
                 if self.logging_enabled and self.logger:
                     self.logger.info(f"Search stopped due to time limit during move iteration at root. Best move so far: {best_move}")
+                root_search_complete = False
                 break
 
             temp_board = self.board.copy()
             temp_board.push(move)
             current_move_score = 0.0
+            self._clear_pv(1) # The reply line of this root move, filled by the child search
 
             try:
                 # self.ai_type is correctly set by configure_for_side
                 if self.ai_type == 'deepsearch':
                     # Pass self.depth (from resolved config) to _deep_search
-                    final_deepsearch_move_result = self._deep_search(self.board.copy(), self.depth if self.depth is not None else 1, self.time_control, stop_callback=self.time_manager.should_stop)
+                    if self.parallel_evaluation and self.threads and self.threads > 1:
+                        final_deepsearch_move_result = self._lazy_smp_search(self.board.copy(), self.depth if self.depth is not None else 1, self.time_control, stop_callback=self.time_manager.should_stop,
+                                                                             iteration_callback=self._report_iteration)
+                    else:
+                        final_deepsearch_move_result = self._deep_search(self.board.copy(), self.depth if self.depth is not None else 1, self.time_control, stop_callback=self.time_manager.should_stop,
+                                                                         iteration_callback=self._report_iteration)
                     if final_deepsearch_move_result != chess.Move.null():
                         best_move = final_deepsearch_move_result
-                        if self.board.is_legal(best_move): # Check legality on original board
-                            temp_board_after_move = self.board.copy()
-                            temp_board_after_move.push(best_move)
-                            # Evaluate from current player's perspective
-                            current_move_score = self.evaluate_position_from_perspective(temp_board_after_move, self.current_player)
-                        
-                        self.update_transposition_table(self.board, self.depth if self.depth is not None else 1, best_move, current_move_score)
+                        # _deep_search stored every completed iteration in the transposition table at the depth it reached and
+                        # none of a stopped one, storing the root again at the requested depth would make a stopped search look complete
                         search_duration = time.perf_counter() - search_start_time
                         if self.logging_enabled and self.logger:
                             self.logger.debug(f"Deepsearch final move selection took {search_duration:.4f} seconds and searched {self.nodes_searched} nodes.")
@@ -440,19 +754,30 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
                 if current_move_score > best_score_overall:
                     best_score_overall = current_move_score
                     best_move = move
+                    best_root_pv = [move] + list(self.pv_table[1])
             else: # Black is minimizing White's score (or maximizing Black's score if eval is from Black's perspective)
                   # If evaluate_position_from_perspective returns score from self.current_player's view, then Black also maximizes.
                   # Let's assume evaluate_position_from_perspective always returns higher = better for the player passed to it.
                 if current_move_score > best_score_overall: # This was <, should be > if eval is from perspective
                     best_score_overall = current_move_score
                     best_move = move
+                    best_root_pv = [move] + list(self.pv_table[1])
             
-            # Update transposition table with the best move found so far at the root
-            self.update_transposition_table(self.board, self.depth if self.depth is not None else 1, best_move, best_score_overall)
+            # Update transposition table with the best move found so far at the root (a lower bound until all moves are searched)
+            self.update_transposition_table(self.board, self.depth if self.depth is not None else 1, best_move, best_score_overall, BOUND_LOWER)
 
             if self.show_thoughts and self.logger:
                 self.logger.debug(f"Root search iteration: Move={move}, Score={current_move_score:.2f}, Best Move So Far={best_move}, Best Score={best_score_overall:.2f}")
 
+        if root_search_complete and best_move != chess.Move.null():
+            # Every root move was searched, so the root result is exact
+            self.update_transposition_table(self.board, self.depth if self.depth is not None else 1, best_move, best_score_overall, BOUND_EXACT)
+        if best_root_pv and best_root_pv[0] == best_move:
+            self.previous_pv = best_root_pv
+            self.last_search_score = best_score_overall
+            if root_search_complete:
+                self.last_search_depth = self.depth if self.depth is not None else 1
+
         if best_move == chess.Move.null() and ordered_moves: # Check ordered_moves, not just legal_moves
             best_move = random.choice(ordered_moves) # Fallback to random from ordered if no best move found
 
@@ -469,15 +794,32 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
         
         search_duration = time.perf_counter() - search_start_time
         if self.logging_enabled and self.logger:
-            self.logger.debug(f"Search for {self.current_player} took {search_duration:.4f} seconds and searched {self.nodes_searched} nodes.")
+            self.logger.debug(f"Search for {self.current_player} took {search_duration:.4f} seconds and searched {self.nodes_searched} nodes. Eval cache: {self.eval_cache.stats()} | Pawn hash: {self.scoring_calculator.pawn_hash.stats()}")
 
         return best_move
 
     # =================================
     # ===== EVALUATION FUNCTIONS ======
 
+    def _eval_cache_key(self, board: chess.Board):
+        """Eval cache key for board, or None when its evaluation must not be cached."""
+        if self.eval_cache.max_size <= 0:
+            return None
+        # The draw penalty depends on the move history, not just the position, so repetitions are never cached
+        if board.halfmove_clock >= 4 and board.is_repetition(count=2):
+            return None
+        # The Zobrist key includes the side to move; untracked boards are hashed without taking over the key stack
+        key = self._zobrist_stack[-1] if self._is_tracked(board) else self.zobrist.hash_board(board)
+        return (key, self._eval_cache_ruleset)
+
     def evaluate_position(self, board: chess.Board) -> float:
         """Calculate base position evaluation by delegating to scoring_calculator."""
+        cache_key = self._eval_cache_key(board)
+        if cache_key is not None:
+            cached_score = self.eval_cache.get(cache_key) # White-relative score
+            if cached_score is not None:
+                return cached_score
+        incremental = self.incremental_eval if self._is_tracked(board) else None
         positional_evaluation_board = board.copy()
         if not isinstance(positional_evaluation_board, chess.Board) or not positional_evaluation_board.is_valid():
             if self.logger:
@@ -489,19 +831,29 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
         score = self.scoring_calculator.calculate_score(
             board=positional_evaluation_board,
             color=chess.WHITE,
-            endgame_factor=endgame_factor
+            endgame_factor=endgame_factor,
+            incremental=incremental
         ) - self.scoring_calculator.calculate_score(
             board=positional_evaluation_board,
             color=chess.BLACK,
-            endgame_factor=endgame_factor
+            endgame_factor=endgame_factor,
+            incremental=incremental
         )
         
+        if cache_key is not None:
+            self.eval_cache.store(cache_key, score)
         if self.logging_enabled and self.logger:
             self.logger.debug(f"Position evaluation (delegated): {score:.3f} | FEN: {positional_evaluation_board.fen()} | Endgame Factor: {endgame_factor:.2f}")
         return score
 
     def evaluate_position_from_perspective(self, board: chess.Board, player: chess.Color) -> float:
         """Calculate position evaluation from specified player's perspective by delegating to scoring_calculator."""
+        cache_key = self._eval_cache_key(board)
+        if cache_key is not None:
+            cached_score = self.eval_cache.get(cache_key) # White-relative score
+            if cached_score is not None:
+                return cached_score if player == chess.WHITE else -cached_score
+        incremental = self.incremental_eval if self._is_tracked(board) else None # Material/PST from the search accumulators
         perspective_evaluation_board = board.copy()
         if not isinstance(player, chess.Color) or not perspective_evaluation_board.is_valid():
             if self.logger:
@@ -513,15 +865,19 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
         white_score = self.scoring_calculator.calculate_score(
             board=perspective_evaluation_board,
             color=chess.WHITE,
-            endgame_factor=endgame_factor
+            endgame_factor=endgame_factor,
+            incremental=incremental
         )
         black_score = self.scoring_calculator.calculate_score(
             board=perspective_evaluation_board,
             color=chess.BLACK,
-            endgame_factor=endgame_factor
+            endgame_factor=endgame_factor,
+            incremental=incremental
         )
         
         score = (white_score - black_score) if player == chess.WHITE else (black_score - white_score)
+        if cache_key is not None:
+            self.eval_cache.store(cache_key, white_score - black_score)
         
         if self.logging_enabled and self.logger:
             self.logger.debug(f"Position evaluation from {player} perspective (delegated): {score:.3f} | FEN: {perspective_evaluation_board.fen()} | Endgame Factor: {endgame_factor:.2f}")
@@ -547,8 +903,8 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
     # ===================================
     # ======= HELPER FUNCTIONS ==========
     
-    def order_moves(self, board: chess.Board, moves, hash_move: Optional[chess.Move] = None, depth: int = 0):
-        """Order moves for better alpha-beta pruning efficiency"""
+    def order_moves(self, board: chess.Board, moves, hash_move: Optional[chess.Move] = None, depth: int = 0, pv_move: Optional[chess.Move] = None):
+        """Order moves for better alpha-beta pruning efficiency. The previous iteration's PV move, if given, is searched first."""
         if isinstance(moves, chess.Move):
             moves = [moves]
         
@@ -561,7 +917,7 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
         
         if hash_move and hash_move in moves:
             # Use a very high bonus for hash move, potentially from config if defined
-            hash_move_bonus = self.viper_config_data.get('move_ordering', {}).get('hash_move_bonus', 2000000.0)
+            hash_move_bonus = self.ai_config.get('move_ordering', {}).get('hash_move_bonus', 2000000.0)
             move_scores.append((hash_move, hash_move_bonus))
             moves = [m for m in moves if m != hash_move]
 
@@ -575,6 +931,12 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
             move_scores.append((move, score))
 
         move_scores.sort(key=lambda x: x[1], reverse=True)
+
+        if pv_move and move_scores and pv_move != move_scores[0][0]:
+            for index, (move, score) in enumerate(move_scores):
+                if move == pv_move:
+                    move_scores.insert(0, move_scores.pop(index))
+                    break
         
         # max_moves_to_evaluate can come from viper_config_data or game_settings_config_data (performance section)
         # self.ai_config should have this resolved value
@@ -591,49 +953,38 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
         return [move for move, _ in move_scores]
 
     def _order_move_score(self, board: chess.Board, move: chess.Move, depth: int = 0) -> float:
-        """Calculate a score for a move for ordering purposes."""
+        """
+        Calculate a score for a move for ordering purposes.
+        Works from the board's attack masks only (no copy, push or pop), checkmates are left to the search.
+        """
         score = 0.0
         # Access move ordering bonuses from the resolved self.ai_config, which merges viper_config_data
         move_ordering_cfg = self.ai_config.get('move_ordering', {})
 
-        temp_board = board.copy()
-        temp_board.push(move)
-        if temp_board.is_checkmate():
-            temp_board.pop()
-            # Checkmate bonus from 'evaluation' part of viper_config_data, or a specific move_ordering config
-            eval_cfg = self.ai_config.get('evaluation', {}) # 'evaluation' might be a sub-key in viper.yaml
-            return move_ordering_cfg.get('checkmate_move_bonus', eval_cfg.get('checkmate_move_bonus', 1000000.0))
-        
-        if temp_board.is_check(): # Check after move is made
+        if board.gives_check(move):
             score += move_ordering_cfg.get('check_move_bonus', 10000.0)
-        temp_board.pop() # Pop before is_capture check on original board state
 
-        if board.is_capture(move):
-            score += move_ordering_cfg.get('capture_bonus', 1000000.0)
-            victim_type = board.piece_type_at(move.to_square)
-            aggressor_type = board.piece_type_at(move.from_square)
-            if victim_type and aggressor_type:
-                score += (self.piece_values.get(victim_type, 0) * 10) - self.piece_values.get(aggressor_type, 0)
+        aggressor_type = board.piece_type_at(move.from_square)
+        victim_type = board.piece_type_at(move.to_square)
+        if victim_type is None and board.is_en_passant(move):
+            victim_type = chess.PAWN
+        if victim_type and aggressor_type and board.color_at(move.to_square) != board.turn:
+            # Only captures that do not lose material by static exchange get the capture bonus
+            see_score = self.static_exchange.see(board, move)
+            if see_score >= 0:
+                score += move_ordering_cfg.get('capture_bonus', 1000000.0)
+            score += see_score * 100 + self.mvv_lva[victim_type][aggressor_type]
 
         if depth < len(self.killer_moves) and move in self.killer_moves[depth]:
             score += move_ordering_cfg.get('killer_move_bonus', 900000.0)
 
-        # Countermove heuristic (if applicable)
-        # if board.move_stack and self.counter_moves.get(board.move_stack[-1], None) == move:
-        # score += move_ordering_cfg.get('counter_move_bonus', 800000.0)
-
-        score += self.history_table.get((board.turn, move.from_square, move.to_square), 0)
+        # History heuristic, keyed the same way update_history_score stores it
+        score += self.history_table.get((aggressor_type, move.from_square, move.to_square), 0)
         
         if move.promotion:
             score += move_ordering_cfg.get('promotion_bonus', 700000.0)
             if move.promotion == chess.QUEEN:
-                score += self.piece_values.get(chess.QUEEN, 9.0) * 100 # Ensure piece_values is used
-
-        # Redundant check for board.is_check() as it was done above.
-        # board.push(move)
-        # if board.is_check():
-        # score += move_ordering_cfg.get('check_bonus', 50000.0) # This was a different key, consolidate
-        # board.pop()
+                score += self.piece_value_table[chess.QUEEN] * 100
 
         return score
     
@@ -672,16 +1023,19 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
         # If in check, all legal moves should be considered to escape check.
         if board.is_check():
             capture_moves = list(board.legal_moves)
-
-
-        # Order capture moves (e.g., MVV-LVA or simple capture value)
-        # For simplicity, not re-ordering here, but could be beneficial.
-        # ordered_q_moves = self.order_moves(board, capture_moves, depth=current_ply) # Can reuse order_moves logic
-
-        for move in capture_moves: # Potentially use ordered_q_moves
-            board.push(move)
+        else:
+            # Order captures by static exchange and drop the ones that clearly lose material
+            see_pruning = self.ai_config.get('quiescence', {}).get('see_pruning', True)
+            scored_captures = [(self.static_exchange.see(board, move), move) for move in capture_moves]
+            if see_pruning:
+                scored_captures = [(see_score, move) for see_score, move in scored_captures if see_score >= 0]
+            scored_captures.sort(key=lambda x: x[0], reverse=True)
+            capture_moves = [move for _, move in scored_captures]
+
+        for move in capture_moves:
+            self._push_move(board, move)
             score = self._quiescence_search(board, alpha, beta, not maximizing_player, stop_callback, current_ply + 1)
-            board.pop()
+            self._pop_move(board)
 
             if maximizing_player:
                 alpha = max(alpha, score)
@@ -694,27 +1048,117 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
         
         return alpha if maximizing_player else beta
     
-    def get_transposition_move(self, board: chess.Board, depth: int) -> Tuple[Optional[chess.Move], Optional[float]]:
-        key = board.fen()
-        if key in self.transposition_table:
-            entry = self.transposition_table[key]
-            if entry['depth'] >= depth:
-                return entry['best_move'], entry['score']
-        return None, None
+    def _is_tracked(self, board: chess.Board) -> bool:
+        """True when the incremental key stack and evaluation accumulators belong to this board in its current position."""
+        return board is self._zobrist_board and len(board.move_stack) == self._zobrist_base_ply + len(self._zobrist_stack) - 1
+
+    def _position_key(self, board: chess.Board) -> int:
+        """Zobrist key for the board, taken from the incremental key stack when it tracks this board."""
+        if self._is_tracked(board):
+            return self._zobrist_stack[-1]
+        # Untracked board (root of a new search or a copied board), hash it fully and start tracking it
+        key = self.zobrist.hash_board(board)
+        self._zobrist_board = board
+        self._zobrist_base_ply = len(board.move_stack)
+        self._zobrist_stack = [key]
+        self.incremental_eval.reset(board)
+        return key
+
+    def _push_move(self, board: chess.Board, move: chess.Move):
+        """Push a move during search and update the Zobrist key and evaluation accumulators incrementally."""
+        key = self._position_key(board)
+        key ^= self.zobrist.state_component(board) ^ self.zobrist.move_component(board, move)
+        self.incremental_eval.push(board, move)
+        board.push(move)
+        key ^= self.zobrist.state_component(board)
+        self._zobrist_stack.append(key)
+
+    def _pop_move(self, board: chess.Board) -> chess.Move:
+        """Pop a move pushed by _push_move, restoring the previous Zobrist key and evaluation accumulators."""
+        move = board.pop()
+        if board is self._zobrist_board and len(self._zobrist_stack) > 1:
+            self._zobrist_stack.pop()
+            self.incremental_eval.pop()
+        else:
+            self._zobrist_board = None
+        return move
+
+    def get_transposition_move(self, board: chess.Board, depth: int, alpha: float = -float('inf'), beta: float = float('inf')) -> Tuple[Optional[chess.Move], Optional[float]]:
+        """
+        Probe the transposition table. Returns the stored best move (for ordering) and a score
+        only when the entry is deep enough and its bound makes the score usable for the (alpha, beta) window.
+        """
+        entry = self.transposition_table.probe(self._position_key(board))
+        if entry is None:
+            return None, None
+        tt_move, tt_depth, tt_score, tt_bound = entry
+        if tt_move is not None and not board.is_pseudo_legal(tt_move):
+            tt_move = None # Key collision, ignore the stored move
+        if tt_depth >= depth:
+            if tt_bound == BOUND_EXACT or \
+               (tt_bound == BOUND_LOWER and tt_score >= beta) or \
+               (tt_bound == BOUND_UPPER and tt_score <= alpha):
+                return tt_move, tt_score
+        return tt_move, None
     
-    def update_transposition_table(self, board: chess.Board, depth: int, best_move: Optional[chess.Move], score: float):
-        key = board.fen()
-        if key in self.transposition_table:
-            existing_entry = self.transposition_table[key]
-            if depth < existing_entry['depth'] and score <= existing_entry['score']:
-                return
-
-        if best_move is not None:
-            self.transposition_table[key] = {
-                'best_move': best_move,
-                'depth': depth,
-                'score': score
-            }
+    def update_transposition_table(self, board: chess.Board, depth: int, best_move: Optional[chess.Move], score: float, bound: int = BOUND_EXACT):
+        self.transposition_table.store(self._position_key(board), best_move, depth, score, bound)
+
+    def _transposition_bound(self, score: float, alpha_original: float, beta: float) -> int:
+        """Bound type for a fail-soft search result relative to the window it was searched with."""
+        if score <= alpha_original:
+            return BOUND_UPPER
+        if score >= beta:
+            return BOUND_LOWER
+        return BOUND_EXACT
+
+    def _staged_moves(self, board: chess.Board, tt_move: Optional[chess.Move], depth: int, pv_move: Optional[chess.Move] = None):
+        """Moves for a search node: a lazy staged MovePicker when move ordering is enabled, otherwise all legal moves."""
+        if not self.move_ordering_enabled:
+            return list(board.legal_moves)
+        killers = self.killer_moves[depth] if depth < len(self.killer_moves) else ()
+        return MovePicker(board, self.static_exchange, hash_move=tt_move, killers=killers, history_table=self.history_table,
+                          pv_move=pv_move, max_moves=self.ai_config.get('max_moves_evaluated'))
+
+    def _search_ply(self, board: chess.Board) -> int:
+        """Distance in plies from the root of the current search."""
+        return len(board.move_stack) - self._search_root_ply
+
+    def _get_pv_move(self, board: chess.Board, ply: int) -> Optional[chess.Move]:
+        """Return the previous iteration's PV move for this node, if the moves played so far still follow that PV."""
+        pv = self.previous_pv
+        if ply < 0 or ply >= len(pv):
+            return None
+        if ply and board.move_stack[-ply:] != pv[:ply]:
+            return None
+        return pv[ply]
+
+    def _clear_pv(self, ply: int):
+        if 0 <= ply < len(self.pv_table):
+            self.pv_table[ply] = []
+
+    def _update_pv(self, ply: int, move: chess.Move):
+        """Triangular PV update: this node's PV is the move followed by the child's PV."""
+        if 0 <= ply < len(self.pv_table) - 1:
+            self.pv_table[ply] = [move] + self.pv_table[ply + 1]
+
+    def _null_move_allowed(self, board: chess.Board, depth: int, beta: float) -> bool:
+        """Zugzwang guards for null-move pruning: never in check or when the side to move has only pawns and king."""
+        if not self.null_move_enabled or depth < self.null_move_min_depth or beta == float('inf'):
+            return False
+        if board.is_check():
+            return False
+        return bool(board.occupied_co[board.turn] & ~(board.pawns | board.kings))
+
+    def _late_move_reduction(self, board: chess.Board, move: chess.Move, depth: int, move_index: int, in_check: bool) -> int:
+        """Depth reduction for a late, quiet move. Captures, promotions, checks and killer moves are never reduced."""
+        if not self.lmr_enabled or in_check or depth < self.lmr_min_depth or move_index < self.lmr_full_depth_moves:
+            return 0
+        if move.promotion or board.is_capture(move) or board.gives_check(move):
+            return 0
+        if depth < len(self.killer_moves) and move in self.killer_moves[depth]:
+            return 0
+        return min(self.lmr_reduction, depth - 1)
 
     def update_killer_move(self, move, ply): # Renamed depth to ply for clarity, as it's depth in current search tree
         """Update killer move table with a move that caused a beta cutoff"""
@@ -773,6 +1217,7 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
             if self.logger:
                 self.logger.error(f"Draw prevention check encountered illegal move: {move} for FEN: {board.fen()}")
             return move
+        return move
 
     # =======================================
     # ======= MAIN SEARCH ALGORITHMS ========
@@ -847,11 +1292,14 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
     def _lookahead_search(self, board: chess.Board, depth: int, alpha: float, beta: float, stop_callback: Optional[Callable[[], bool]] = None) -> float:
         """Lookahead search with static depth. Returns score (float)."""
         self.nodes_searched += 1 # Increment nodes searched
+        ply = self._search_ply(board)
+        self._clear_pv(ply)
         if stop_callback and stop_callback():
             return self.evaluate_position_from_perspective(board, board.turn)
 
         # Check transposition table
-        tt_move, tt_score = self.get_transposition_move(board, depth)
+        alpha_original = alpha
+        tt_move, tt_score = self.get_transposition_move(board, depth, alpha, beta)
         if tt_score is not None:
             return tt_score
 
@@ -862,21 +1310,21 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
                 return self.evaluate_position_from_perspective(board, board.turn)
 
         best_score = -float('inf') # Always maximizing from the current player's perspective
+        best_move = None
 
-        legal_moves = list(board.legal_moves)
-        if self.move_ordering_enabled:
-            legal_moves = self.order_moves(board, legal_moves, hash_move=tt_move, depth=depth)
+        legal_moves = self._staged_moves(board, tt_move, depth)
 
         for move in legal_moves:
-            board.push(move)
+            self._push_move(board, move)
             # Recursive call: _lookahead_search only returns score (float)
             score = -self._lookahead_search(board, depth - 1, -beta, -alpha, stop_callback)
-            board.pop()
+            self._pop_move(board)
 
             if score > best_score:
                 best_score = score
-                # Update transposition table for this node (store best move found at this sub-node)
-                self.update_transposition_table(board, depth, move, best_score) # Store move from THIS node
+                best_move = move
+            if score > alpha:
+                self._update_pv(ply, move)
                 
             alpha = max(alpha, best_score)
             if alpha >= beta:
@@ -884,16 +1332,21 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
                 self.update_history_score(board, move, depth) # Update history for cutoff moves
                 break # Prune remaining moves at this depth
         
+        # Update transposition table for this node with the best move and the bound of its score
+        if not (stop_callback and stop_callback()):
+            self.update_transposition_table(board, depth, best_move, best_score, self._transposition_bound(best_score, alpha_original, beta))
         return best_score
 
     def _minimax_search(self, board: chess.Board, depth: int, alpha: float, beta: float, maximizing_player: bool, stop_callback: Optional[Callable[[], bool]] = None) -> float:
         """Minimax search with alpha-beta pruning. Returns score (float)."""
         self.nodes_searched += 1 # Increment nodes searched
+        ply = self._search_ply(board)
+        self._clear_pv(ply)
         if stop_callback and stop_callback():
             return self.evaluate_position_from_perspective(board, board.turn) # Return immediate eval if stopping
 
         # Check transposition table
-        tt_move, tt_score = self.get_transposition_move(board, depth)
+        tt_move, tt_score = self.get_transposition_move(board, depth) # Exact scores only, minimax scores are not side-to-move relative
         if tt_score is not None:
             return tt_score
 
@@ -905,22 +1358,22 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
 
         best_score = -float('inf') if maximizing_player else float('inf')
         
-        legal_moves = list(board.legal_moves)
-        if self.move_ordering_enabled:
-            legal_moves = self.order_moves(board, legal_moves, hash_move=tt_move, depth=depth)
+        legal_moves = self._staged_moves(board, tt_move, depth)
 
         for move in legal_moves:
-            board.push(move)
+            self._push_move(board, move)
             # Recursive call: _minimax_search now always returns a score (float)
             score = self._minimax_search(board, depth-1, alpha, beta, not maximizing_player, stop_callback)
-            board.pop()
+            self._pop_move(board)
 
             if maximizing_player:
                 if score > best_score:
                     best_score = score
+                    self._update_pv(ply, move)
             else: # Minimizing player
                 if score < best_score:
                     best_score = score
+                    self._update_pv(ply, move)
             
             # Alpha-beta pruning update
             if maximizing_player:
@@ -956,13 +1409,16 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
         # Keeping it simple for now, as the root search is handling overall best_move tracking.
         return best_score
 
-    def _negamax_search(self, board: chess.Board, depth: int, alpha: float, beta: float, stop_callback: Optional[Callable[[], bool]] = None) -> float:
+    def _negamax_search(self, board: chess.Board, depth: int, alpha: float, beta: float, stop_callback: Optional[Callable[[], bool]] = None, allow_null: bool = True) -> float:
         self.nodes_searched += 1
+        ply = self._search_ply(board)
+        self._clear_pv(ply)
         if stop_callback and stop_callback():
             return self.evaluate_position_from_perspective(board, board.turn)
 
         # Check transposition table
-        tt_move, tt_score = self.get_transposition_move(board, depth)
+        alpha_original = alpha
+        tt_move, tt_score = self.get_transposition_move(board, depth, alpha, beta)
         if tt_score is not None:
             return tt_score
 
@@ -972,20 +1428,38 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
             else:
                 return self.evaluate_position_from_perspective(board, board.turn)
 
+        # Null-move pruning: if passing still fails high at reduced depth, the position is good enough to cut
+        if allow_null and self._null_move_allowed(board, depth, beta):
+            self._push_move(board, chess.Move.null())
+            null_score = -self._negamax_search(board, max(0, depth - 1 - self.null_move_reduction), -beta, -beta + 1, stop_callback, allow_null=False)
+            self._pop_move(board)
+            if null_score >= beta:
+                return beta # Do not return unproven mate scores from a null-move search
+
         best_score = -float('inf')
+        best_move = None
+        in_check = board.is_check()
         
-        legal_moves = list(board.legal_moves)
-        if self.move_ordering_enabled:
-            legal_moves = self.order_moves(board, legal_moves, hash_move=tt_move, depth=depth)
+        legal_moves = self._staged_moves(board, tt_move, depth, pv_move=self._get_pv_move(board, ply))
 
-        for move in legal_moves:
-            board.push(move)
+        for move_index, move in enumerate(legal_moves):
+            reduction = self._late_move_reduction(board, move, depth, move_index, in_check) if alpha > -float('inf') else 0
+            self._push_move(board, move)
             # Recursive call: _negamax_search now always returns a score (float)
-            score = -self._negamax_search(board, depth-1, -beta, -alpha, stop_callback)
-            board.pop()
+            if reduction:
+                # Late move: null window search at reduced depth, re-search at full depth if it beats alpha
+                score = -self._negamax_search(board, depth-1-reduction, -alpha-1, -alpha, stop_callback)
+                if score > alpha:
+                    score = -self._negamax_search(board, depth-1, -beta, -alpha, stop_callback)
+            else:
+                score = -self._negamax_search(board, depth-1, -beta, -alpha, stop_callback)
+            self._pop_move(board)
 
             if score > best_score:
                 best_score = score
+                best_move = move
+            if score > alpha:
+                self._update_pv(ply, move)
             
             alpha = max(alpha, score)
             if alpha >= beta:
@@ -993,18 +1467,21 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
                 self.update_history_score(board, move, depth) # Update history for cutoff moves
                 break # Alpha-beta cutoff
 
-        # Update transposition table for this node (store best score encountered during this sub-search)
-        # Best move from recursive call is not explicitly propagated here, just the score.
-        # Rely on the root search function to track the actual best_move.
+        # Update transposition table for this node with the best move and the bound of its score
+        if not (stop_callback and stop_callback()):
+            self.update_transposition_table(board, depth, best_move, best_score, self._transposition_bound(best_score, alpha_original, beta))
         return best_score
 
-    def _negascout(self, board: chess.Board, depth: int, alpha: float, beta: float, stop_callback: Optional[Callable[[], bool]] = None) -> float:
+    def _negascout(self, board: chess.Board, depth: int, alpha: float, beta: float, stop_callback: Optional[Callable[[], bool]] = None, allow_null: bool = True) -> float:
         self.nodes_searched += 1
+        ply = self._search_ply(board)
+        self._clear_pv(ply)
         if stop_callback and stop_callback():
             return self.evaluate_position_from_perspective(board, board.turn)
 
         # Check transposition table
-        tt_move, tt_score = self.get_transposition_move(board, depth)
+        alpha_original = alpha
+        tt_move, tt_score = self.get_transposition_move(board, depth, alpha, beta)
         if tt_score is not None:
             return tt_score
 
@@ -1014,30 +1491,44 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
             else:
                 return self.evaluate_position_from_perspective(board, board.turn)
 
+        # Null-move pruning: if passing still fails high at reduced depth, the position is good enough to cut
+        if allow_null and self._null_move_allowed(board, depth, beta):
+            self._push_move(board, chess.Move.null())
+            null_score = -self._negascout(board, max(0, depth - 1 - self.null_move_reduction), -beta, -beta + 1, stop_callback, allow_null=False)
+            self._pop_move(board)
+            if null_score >= beta:
+                return beta # Do not return unproven mate scores from a null-move search
+
         best_score = -float('inf')
+        best_move = None
         first_move = True
+        in_check = board.is_check()
 
-        legal_moves = list(board.legal_moves)
-        if self.move_ordering_enabled:
-            legal_moves = self.order_moves(board, legal_moves, hash_move=tt_move, depth=depth)
+        legal_moves = self._staged_moves(board, tt_move, depth)
 
-        for move in legal_moves:
-            board.push(move)
+        for move_index, move in enumerate(legal_moves):
+            reduction = 0 if first_move else self._late_move_reduction(board, move, depth, move_index, in_check)
+            self._push_move(board, move)
             if first_move:
                 # Recursive call: _negascout now always returns a score (float)
                 score = -self._negascout(board, depth-1, -beta, -alpha, stop_callback)
             else:
-                # Null window search (zero window search)
-                score = -self._negascout(board, depth-1, -alpha-1, -alpha, stop_callback)
+                # Null window search (zero window search), at reduced depth for late quiet moves
+                score = -self._negascout(board, depth-1-reduction, -alpha-1, -alpha, stop_callback)
+                if reduction and score > alpha:
+                    score = -self._negascout(board, depth-1, -alpha-1, -alpha, stop_callback)
                 
                 # If the score is within the (alpha, beta) window, re-search with full window
                 if alpha < score < beta:
                     score = -self._negascout(board, depth-1, -beta, -score, stop_callback)
             
-            board.pop()
+            self._pop_move(board)
 
             if score > best_score:
                 best_score = score
+                best_move = move
+            if score > alpha:
+                self._update_pv(ply, move)
             
             alpha = max(alpha, score)
             if alpha >= beta:
@@ -1047,11 +1538,14 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
             
             first_move = False
         
-        # Update transposition table for this node (store best score encountered during this sub-search)
+        # Update transposition table for this node with the best move and the bound of its score
+        if not (stop_callback and stop_callback()):
+            self.update_transposition_table(board, depth, best_move, best_score, self._transposition_bound(best_score, alpha_original, beta))
         return best_score
     
-    def _deep_search(self, board: chess.Board, depth: int, time_control: dict, current_depth: int = 1, stop_callback: Optional[Callable[[], bool]] = None) -> chess.Move:
-        """Iterative deepening search with time management."""
+    def _deep_search(self, board: chess.Board, depth: int, time_control: dict, current_depth: int = 1, stop_callback: Optional[Callable[[], bool]] = None,
+                     iteration_callback: Optional[Callable[[int, chess.Move, float], None]] = None) -> chess.Move:
+        """Iterative deepening search with time management. iteration_callback(depth, move, score) is called after each completed iteration."""
         best_move_root = chess.Move.null() # The best move found at the root of the search
         best_score_root = -float('inf')
         
@@ -1069,6 +1563,13 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
         search_depth_limit = min(depth, iterative_max_depth)
 
 
+        # Aspiration window half-width around the previous iteration's score, 0 disables aspiration windows.
+        # Each fail-low / fail-high widens the window four times, after a few failures it opens fully.
+        aspiration_window = self.ai_config.get('aspiration_window', 0.5)
+        checkmate_threshold = self.ai_config.get('evaluation', {}).get('checkmate_bonus', 1000000.0) / 2
+        self._search_root_ply = len(board.move_stack)
+        self.previous_pv = []
+
         for iterative_depth in range(current_depth, search_depth_limit + 1):
             if stop_callback and stop_callback(): # Call stop_callback without arguments
                 if self.logging_enabled and self.logger:
@@ -1080,71 +1581,150 @@ class ViperEvaluationEngine: # Renamed class from EvaluationEngine
                     self.logger.info(f"Deepsearch stopped by time manager at depth {iterative_depth-1}.")
                 break # Stop if time manager says so
 
-            # Get legal moves for the current board state for this iteration
-            # This was the source of the error, legal_moves should be defined before this loop.
-            # It's already defined at the start of the function for the initial board state.
-            # If the board state for ordering changes per iteration (it doesn't here), it would need re-evaluation.
-            # For iterative deepening, we consider moves from the root board state.
-            
             current_iter_legal_moves = list(board.legal_moves) # Ensure we use the root board's legal moves for each iteration.
             if not current_iter_legal_moves: # Should not happen if initial check passed, but good for safety.
                 break
 
-            # Re-order moves at each iteration if move ordering is enabled
+            # Re-order moves at each iteration if move ordering is enabled, the previous PV move goes first
             if self.move_ordering_enabled:
                 # Get hash move from transposition table for current board state
                 hash_move, _ = self.get_transposition_move(board, iterative_depth)
-                ordered_moves = self.order_moves(board, current_iter_legal_moves, hash_move=hash_move, depth=iterative_depth)
+                ordered_moves = self.order_moves(board, current_iter_legal_moves, hash_move=hash_move, depth=iterative_depth, pv_move=self._get_pv_move(board, 0))
             else:
                 ordered_moves = current_iter_legal_moves
 
-            local_best_move_at_depth = chess.Move.null()
-            local_best_score_at_depth = -float('inf')
+            # Search a narrow window around the previous score first, widening it on fail-low / fail-high
+            use_aspiration = aspiration_window and iterative_depth > current_depth and abs(best_score_root) < checkmate_threshold
+            window = aspiration_window
+            alpha = best_score_root - window if use_aspiration else -float('inf')
+            beta = best_score_root + window if use_aspiration else float('inf')
 
-            # Alpha and Beta for the current iteration
-            alpha = -float('inf')  # Ensure alpha is initialized as a float
-            beta = float('inf')    # Ensure beta is initialized as a float
-
-            for move in ordered_moves:
+            while True:
+                local_best_move_at_depth, local_best_score_at_depth = self._deep_search_root(board, ordered_moves, iterative_depth, alpha, beta, stop_callback)
                 if stop_callback and stop_callback():
-                    break # Stop if time is up mid-iteration
+                    break
+                if local_best_score_at_depth <= alpha and alpha > -float('inf'):
+                    window *= 4
+                    alpha = -float('inf') if window > aspiration_window * 16 else local_best_score_at_depth - window
+                elif local_best_score_at_depth >= beta and beta < float('inf'):
+                    window *= 4
+                    beta = float('inf') if window > aspiration_window * 16 else local_best_score_at_depth + window
+                    ordered_moves = [local_best_move_at_depth] + [m for m in ordered_moves if m != local_best_move_at_depth]
+                else:
+                    break
+                if self.show_thoughts and self.logger:
+                    self.logger.debug(f"Deepsearch aspiration re-search at depth {iterative_depth} with window ({alpha:.2f}, {beta:.2f})")
 
-                temp_board = board.copy()
-                temp_board.push(move)
-                
-                # Recursive call to negamax (or negascout, or minimax)
-                # _negamax_search now always returns a score (float)
-                current_move_score = -self._negamax_search(temp_board, iterative_depth - 1, -beta, -alpha, stop_callback)
+            if stop_callback and stop_callback():
+                # An interrupted iteration scored its last subtrees from cut-off searches: the last completed iteration
+                # stands. Its move is only used when no iteration completed, and then never stored or reported as a depth.
+                if best_move_root == chess.Move.null() and local_best_move_at_depth != chess.Move.null():
+                    best_move_root = local_best_move_at_depth
+                if self.logging_enabled and self.logger:
+                    self.logger.info(f"Deepsearch stopped during depth {iterative_depth}, keeping depth {self.last_search_depth}.")
+                break
 
-                if current_move_score > local_best_score_at_depth:
-                    local_best_score_at_depth = current_move_score
-                    local_best_move_at_depth = move
-                
-                alpha = max(alpha, current_move_score) # Update alpha for the next sibling move
-                if alpha >= beta:
-                    # Beta cutoff, update killer and history
-                    self.update_killer_move(move, iterative_depth)
-                    self.update_history_score(board, move, iterative_depth)
-                    break # Prune remaining moves at this depth
-            
-            # After each full depth iteration, update the overall best move
-            if local_best_move_at_depth != chess.Move.null():
+            # After each completed depth iteration, update the overall best move
+            if local_best_move_at_depth != chess.Move.null() and local_best_score_at_depth > alpha:
                 best_move_root = local_best_move_at_depth
                 best_score_root = local_best_score_at_depth
+                self.previous_pv = list(self.pv_table[0]) or [best_move_root]
+                self.last_search_score = best_score_root
+                self.last_search_depth = iterative_depth
                 # Store the best move found at this depth in transposition table
-                self.update_transposition_table(board, iterative_depth, best_move_root, best_score_root)
+                self.update_transposition_table(board, iterative_depth, best_move_root, best_score_root, self._transposition_bound(best_score_root, alpha, beta))
+                if iteration_callback:
+                    iteration_callback(iterative_depth, best_move_root, best_score_root)
 
             # If checkmate is found, stop early
-            if abs(best_score_root) > self.ai_config.get('evaluation', {}).get('checkmate_bonus', 1000000.0) / 2: # Checkmate score is very high
+            if abs(best_score_root) > checkmate_threshold: # Checkmate score is very high
                 if self.logging_enabled and self.logger:
                     self.logger.info(f"Deepsearch found a potential checkmate at depth {iterative_depth}. Stopping early.")
                 break
 
             if self.show_thoughts and self.logger:
-                self.logger.debug(f"Deepsearch finished depth {iterative_depth}: Best move {best_move_root} with score {best_score_root:.2f}")
+                self.logger.debug(f"Deepsearch finished depth {iterative_depth}: Best move {best_move_root} with score {best_score_root:.2f} | PV: {' '.join(m.uci() for m in self.previous_pv)}")
 
         return best_move_root if best_move_root != chess.Move.null() else self._simple_search(board) # Fallback if no move found
 
+    def _report_iteration(self, depth: int, move: chess.Move, score: float):
+        self._report_info('depth', depth, move, score)
+
+    def _lazy_smp_search(self, board: chess.Board, depth: int, time_control: dict, stop_callback: Optional[Callable[[], bool]] = None,
+                         iteration_callback: Optional[Callable[[int, chess.Move, float], None]] = None) -> chess.Move:
+        """
+        Lazy SMP deepsearch: thread_limit - 1 helper processes search the same root at staggered depths
+        through a shared transposition table while this process runs the main search.
+        The move from the deepest completed iteration of any searcher is played, the main search wins ties.
+        """
+        if self._lazy_smp is None:
+            # Move to a shared memory table the first time a parallel search runs, helpers attach to it by name
+            self.transposition_table = SharedTranspositionTable(size_mb=self.hash_size)
+            self._lazy_smp = LazySMP(self.threads - 1, self.transposition_table)
+        self._lazy_smp.start_search(board, self.current_player, self.ai_config, depth)
+
+        main_results = []
+        def record_main_iteration(completed_depth, move, score):
+            main_results.append((0, completed_depth, move, score))
+            if iteration_callback:
+                iteration_callback(completed_depth, move, score)
+        main_move = self._deep_search(board, depth, time_control, stop_callback=stop_callback, iteration_callback=record_main_iteration)
+        helper_results, helper_nodes = self._lazy_smp.stop_search()
+        self.nodes_searched += helper_nodes
+
+        best_move = main_move
+        best_depth = 0
+        for worker_id, completed_depth, move, score in main_results + helper_results:
+            if completed_depth > best_depth and board.is_legal(move):
+                best_depth = completed_depth
+                best_move = move
+                if self.show_thoughts and self.logger:
+                    self.logger.debug(f"Lazy SMP: searcher {worker_id} completed depth {completed_depth} with {move} (score {score:.2f})")
+        return best_move
+
+    def close(self):
+        """Stop a running asynchronous search and the Lazy SMP helper processes, and release the shared transposition table."""
+        self._ponder = None
+        if self._active_search is not None:
+            self._active_search.stop()
+            self._active_search.exception() # Wait for the worker thread to finish
+            self._active_search = None
+        if self._lazy_smp is not None:
+            self._lazy_smp.close()
+            self._lazy_smp = None
+            self.transposition_table.close()
+            self.transposition_table = TranspositionTable(size_mb=self.hash_size)
+
+    def _deep_search_root(self, board: chess.Board, ordered_moves: list, depth: int, alpha: float, beta: float, stop_callback: Optional[Callable[[], bool]] = None) -> Tuple[chess.Move, float]:
+        """Search the root moves of one iterative deepening pass within (alpha, beta), returning the best move and its fail-soft score."""
+        best_move = chess.Move.null()
+        best_score = -float('inf')
+        self._clear_pv(0)
+
+        for move in ordered_moves:
+            if stop_callback and stop_callback():
+                break # Stop if time is up mid-iteration
+
+            self._push_move(board, move)
+            score = -self._negamax_search(board, depth - 1, -beta, -max(alpha, best_score), stop_callback)
+            self._pop_move(board)
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    self._update_pv(0, move)
+                    if not (stop_callback and stop_callback()):
+                        self._report_info('bestmove', depth, move, score)
+
+            if best_score >= beta:
+                # Beta cutoff, update killer and history
+                self.update_killer_move(move, depth)
+                self.update_history_score(board, move, depth)
+                break # Prune remaining moves at this depth
+
+        return best_move, best_score
+
     
     # ================================
     # ======= DEBUG AND TESTING =======
@@ -1250,9 +1830,10 @@ if __name__ == "__main__":
         print("\n--- Test 4: Transposition Table Usage ---")
         best_move_tt = engine_tt.search(board.copy(), chess.WHITE) 
         score_from_tt_entry = None
-        if board.fen() in engine_tt.transposition_table:
-            tt_entry = engine_tt.transposition_table[board.fen()]
-            score_from_tt_entry = tt_entry.get('score')
+        root_key = engine_tt.zobrist.hash_board(board)
+        tt_entry = engine_tt.transposition_table.probe(root_key)
+        if tt_entry is not None:
+            score_from_tt_entry = tt_entry[2]
 
         print(f"Initial search (via engine.search) for {board.fen()}: Move={best_move_tt}, TT Score={score_from_tt_entry}")
         
@@ -1261,11 +1842,11 @@ if __name__ == "__main__":
 
         print(f"Second search (should hit TT) for {board.fen()}: Move={found_move_via_tt}, TT Score={score_from_tt_entry}")
 
-        assert board.fen() in engine_tt.transposition_table, "Position not stored in transposition table"
-        tt_entry = engine_tt.transposition_table[board.fen()]
+        tt_entry = engine_tt.transposition_table.probe(root_key)
+        assert tt_entry is not None, "Position not stored in transposition table"
         print(f"TT Entry: {tt_entry}")
-        assert tt_entry['best_move'] == best_move_tt, "TT best move mismatch after second search"
-        assert tt_entry['score'] is not None, "TT score should not be None"
+        assert tt_entry[0] == best_move_tt, "TT best move mismatch after second search"
+        assert tt_entry[2] is not None, "TT score should not be None"
         
         print("Test 4: Transposition Table Usage - PASSED")
 
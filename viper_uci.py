@@ -0,0 +1,274 @@
+# viper_uci.py
+
+""" UCI Front End for the Viper Evaluation Engine
+Speaks the Universal Chess Interface over stdin/stdout so ViperEvaluationEngine can run under standard
+tournament managers and GUIs (cutechess-cli, Arena, ...) without the pygame game loop.
+Supported commands: uci, isready, ucinewgame, setoption (Hash, Threads, Ponder, OwnBook), position,
+go (wtime, btime, winc, binc, movestogo, movetime, depth, nodes, infinite, ponder), stop, ponderhit, quit.
+The search runs through ViperEvaluationEngine.search_async() so 'stop' and 'ponderhit' are handled while it thinks,
+and every completed deepsearch iteration is reported as an info line with depth, score, nodes, nps, time and pv.
+"""
+
+import os
+import sys
+import threading
+import chess
+from typing import Any, Dict, List, Optional, TextIO
+
+ENGINE_NAME = "Viper"
+ENGINE_AUTHOR = "pssnyder"
+MAX_UCI_DEPTH = 32 # Depth cap for 'go infinite' and time-based searches, the killer and PV tables hold 50 plies
+GO_INT_PARAMS = ('wtime', 'btime', 'winc', 'binc', 'movestogo', 'movetime', 'depth', 'nodes', 'mate')
+
+class ViperUCI:
+    """UCI protocol loop around one ViperEvaluationEngine."""
+
+    def __init__(self, input_stream: TextIO = sys.stdin, output_stream: TextIO = sys.stdout):
+        from viper import ViperEvaluationEngine # Deferred so 'python viper_uci.py' can set the working directory first
+
+        self.input_stream = input_stream
+        self.output_stream = output_stream
+        self.output_lock = threading.Lock()
+        self.board = chess.Board()
+        self.engine = ViperEvaluationEngine(self.board.copy(), chess.WHITE)
+        self.options = {
+            'Hash': self.engine.hash_size,
+            'Threads': max(1, self.engine.threads or 1) if self.engine.parallel_evaluation else 1,
+            'Ponder': False,
+            'OwnBook': False,
+        }
+        self._apply_threads(self.options['Threads'])
+
+        self.search_future = None               # SearchFuture of the running search
+        self.search_done = threading.Event()    # Set once the running search's bestmove is sent or held back
+        self.search_done.set()
+        self.state_lock = threading.Lock()      # Guards pondering/infinite/pending_bestmove between the two threads
+        self.pondering = False
+        self.infinite = False
+        self.pending_bestmove = None            # bestmove line of a search that finished in infinite or ponder mode
+        self.pending_time_limit = float('inf')  # Seconds, applied on 'ponderhit'
+
+    # =================================
+    # ===== PROTOCOL I/O ==============
+
+    def send(self, line: str):
+        with self.output_lock:
+            self.output_stream.write(line + "\n")
+            self.output_stream.flush()
+
+    def run(self):
+        """Read commands until 'quit' or end of input."""
+        for line in self.input_stream:
+            if not self.handle_command(line.strip()):
+                break
+        self._stop_search()
+        self.engine.close()
+
+    def handle_command(self, line: str) -> bool:
+        """Handle one command line, returns False on 'quit'."""
+        if not line:
+            return True
+        tokens = line.split()
+        command, args = tokens[0], tokens[1:]
+        if command == 'uci':
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send(f"option name Hash type spin default {self.options['Hash']} min 1 max 4096")
+            self.send(f"option name Threads type spin default {self.options['Threads']} min 1 max 64")
+            self.send("option name Ponder type check default false")
+            self.send("option name OwnBook type check default false")
+            self.send("uciok")
+        elif command == 'isready':
+            self.send("readyok")
+        elif command == 'ucinewgame':
+            self._wait_for_search()
+            self.board = chess.Board()
+            self.engine.reset(self.board)
+        elif command == 'setoption':
+            self._wait_for_search()
+            self.set_option(args)
+        elif command == 'position':
+            self._wait_for_search()
+            self.set_position(args)
+        elif command == 'go':
+            self._wait_for_search()
+            self.go(self.parse_go(args))
+        elif command == 'stop':
+            self._stop_search()
+        elif command == 'ponderhit':
+            self.ponderhit()
+        elif command == 'quit':
+            return False
+        return True
+
+    # =================================
+    # ===== COMMANDS ==================
+
+    def set_option(self, args: List[str]):
+        """setoption name <id> [value <x>]"""
+        if 'name' not in args:
+            return
+        value_index = args.index('value') if 'value' in args else len(args)
+        name = " ".join(args[args.index('name') + 1:value_index])
+        value = " ".join(args[value_index + 1:])
+        if name == 'Hash':
+            self.options['Hash'] = max(1, int(value))
+            self.engine.close() # A shared Lazy SMP table is replaced too
+            self.engine.hash_size = self.options['Hash']
+            self.engine.transposition_table = type(self.engine.transposition_table)(size_mb=self.options['Hash'])
+        elif name == 'Threads':
+            self._apply_threads(max(1, int(value)))
+        elif name in ('Ponder', 'OwnBook'):
+            self.options[name] = value.lower() == 'true'
+
+    def _apply_threads(self, threads: int):
+        """Threads > 1 switches deepsearch to Lazy SMP with threads - 1 helper processes."""
+        self.options['Threads'] = threads
+        self.engine.close()
+        self.engine.threads = threads
+        self.engine.parallel_evaluation = threads > 1
+
+    def set_position(self, args: List[str]):
+        """position [startpos | fen <fen>] [moves <move1> ... <movei>]"""
+        moves_index = args.index('moves') if 'moves' in args else len(args)
+        if args and args[0] == 'fen':
+            board = chess.Board(" ".join(args[1:moves_index]))
+        else:
+            board = chess.Board()
+        for uci in args[moves_index + 1:]:
+            board.push_uci(uci)
+        self.board = board
+
+    def parse_go(self, args: List[str]) -> Dict[str, Any]:
+        params: Dict[str, Any] = {}
+        index = 0
+        while index < len(args):
+            token = args[index]
+            if token in GO_INT_PARAMS and index + 1 < len(args):
+                params[token] = int(args[index + 1])
+                index += 2
+            elif token in ('infinite', 'ponder'):
+                params[token] = True
+                index += 1
+            elif token == 'searchmoves': # Restricting the root moves is not supported, the rest of the line is skipped
+                break
+            else:
+                index += 1
+        return params
+
+    def time_limit(self, params: Dict[str, Any]) -> float:
+        """Seconds to search for the go parameters, inf when only depth, nodes or nothing limits the search."""
+        if params.get('movetime'):
+            return params['movetime'] / 1000.0
+        if 'wtime' in params or 'btime' in params:
+            time_control = {key: params[key] for key in ('wtime', 'btime', 'winc', 'binc', 'movestogo') if key in params}
+            return self.engine.time_manager.allocate_time(time_control, self.board)
+        return float('inf')
+
+    def go(self, params: Dict[str, Any]):
+        """Start an asynchronous search, bestmove is sent when it finishes (or on 'stop' / 'ponderhit' if infinite/pondering)."""
+        self.pondering = bool(params.get('ponder'))
+        self.infinite = bool(params.get('infinite'))
+        self.pending_bestmove = None
+        time_limit = float('inf') if self.infinite else self.time_limit(params)
+        self.pending_time_limit = time_limit
+        depth = min(params.get('depth', MAX_UCI_DEPTH), MAX_UCI_DEPTH)
+        search_config = {
+            'depth': depth,
+            'max_depth': depth,
+            # move_time_limit is in ms, a pondering search runs without a limit until 'ponderhit'
+            'move_time_limit': float('inf') if self.pondering else time_limit * 1000.0,
+            'use_opening_book': self.options['OwnBook'] and not self.pondering,
+        }
+        self.engine.time_manager.set_node_limit(params.get('nodes'), lambda: self.engine.nodes_searched)
+        board = self.board.copy()
+        self.search_done.clear()
+        self.search_future = self.engine.search_async(board, board.turn, search_config, info_callback=self._send_info)
+        self.search_future.add_done_callback(lambda future: self._on_search_done(board, future))
+
+    def ponderhit(self):
+        """The expected move was played: keep searching, now on the real clock starting from here."""
+        # The search thread must not restart its timer with the pondering limit after the hit's start_timer
+        # (outside state_lock, the done callback of a search that just finished needs it)
+        self.engine._search_timer_started.wait(1.0)
+        with self.state_lock:
+            if not self.pondering:
+                return
+            self.pondering = False
+            self.engine.time_manager.start_timer(self.pending_time_limit)
+            self._flush_bestmove()
+
+    # =================================
+    # ===== SEARCH RESULTS ============
+
+    def _on_search_done(self, board: chess.Board, future):
+        """Done callback of the search future, runs in the search thread."""
+        best_move = None
+        if future.exception() is not None:
+            self.send(f"info string search error: {future.exception()}")
+        else:
+            best_move = future.result()
+        if best_move is None or best_move == chess.Move.null() or not board.is_legal(best_move):
+            legal_moves = list(board.legal_moves)
+            best_move = legal_moves[0] if legal_moves else None
+        if best_move is None:
+            line = "bestmove 0000"
+        else:
+            ponder_move = self.ponder_move(board, best_move)
+            line = f"bestmove {best_move.uci()}" + (f" ponder {ponder_move.uci()}" if ponder_move else "")
+        with self.state_lock:
+            # UCI: in infinite and ponder mode bestmove is only sent after 'stop' (or 'ponderhit')
+            self.pending_bestmove = line
+            if not (self.infinite or self.pondering):
+                self._flush_bestmove()
+        self.search_done.set()
+
+    def _flush_bestmove(self):
+        """Send a held back bestmove line, called with state_lock held."""
+        if self.pending_bestmove is not None:
+            self.send(self.pending_bestmove)
+            self.pending_bestmove = None
+
+    def ponder_move(self, board: chess.Board, best_move: chess.Move) -> Optional[chess.Move]:
+        """The expected reply from the last principal variation, if it starts with best_move."""
+        pv = self.engine.previous_pv
+        if len(pv) < 2 or pv[0] != best_move:
+            return None
+        board = board.copy()
+        board.push(best_move)
+        return pv[1] if board.is_legal(pv[1]) else None
+
+    def _send_info(self, info: Dict[str, Any]):
+        if info['type'] != 'depth':
+            return
+        elapsed = max(info['time'], 1e-6)
+        pv = info['pv'] or [info['move']]
+        self.send(f"info depth {info['depth']} score {self.format_score(info['score'], pv)} nodes {info['nodes']} "
+                  f"nps {int(info['nodes'] / elapsed)} time {int(elapsed * 1000)} pv {' '.join(m.uci() for m in pv)}")
+
+    def format_score(self, score: float, pv: List[chess.Move]) -> str:
+        """UCI score from the side to move's view: engine scores are in pawns, mate scores are beyond half the checkmate bonus."""
+        checkmate_threshold = self.engine.ai_config.get('evaluation', {}).get('checkmate_bonus', 1000000.0) / 2
+        if abs(score) > checkmate_threshold:
+            mate_in = (len(pv) + 1) // 2
+            return f"mate {mate_in if score > 0 else -mate_in}"
+        return f"cp {int(round(score * 100))}"
+
+    def _stop_search(self):
+        """Stop a running search and wait for its bestmove."""
+        with self.state_lock:
+            self.pondering = False
+            self.infinite = False
+            self._flush_bestmove()
+        if self.search_future is not None:
+            self.search_future.stop()
+        self._wait_for_search()
+
+    def _wait_for_search(self):
+        self.search_done.wait()
+        self.search_future = None
+
+if __name__ == "__main__":
+    # viper.yaml and chess_game.yaml are read from the working directory, GUIs may start the engine elsewhere
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    ViperUCI().run()